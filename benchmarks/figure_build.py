@@ -0,0 +1,69 @@
+"""
+Times building figures from precomputed traces with and without Plotly's validation.
+
+    python benchmarks/figure_build.py [--repeat N] [--rows N]
+"""
+import argparse
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots.aggregation import box_statistics, histogram_bins, rasterize
+from my_interactive_plots.config import Config
+from my_interactive_plots.plots import (
+    create_binned_histogram,
+    create_combined_plot,
+    create_raster_plot,
+    create_summary_box_plot
+)
+
+def synthetic_data(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'sepal_width': rng.normal(3, 0.5, rows),
+        'sepal_length': rng.normal(6, 0.8, rows),
+        'species': rng.choice(['setosa', 'versicolor', 'virginica'], rows)
+    })
+
+def builders(data: pd.DataFrame) -> dict:
+    """
+    Inputs are computed once, so only the figure builds are timed.
+    """
+    bins = histogram_bins(data, 'sepal_width', bins=50, group_column='species')
+    stats = box_statistics(data, 'sepal_length', ['species'])
+    raster = rasterize(data, 'sepal_width', 'sepal_length', 300, 200, category_column='species')
+    return {
+        'combined': lambda config: create_combined_plot(data, config),
+        'binned_histogram': lambda config: create_binned_histogram(bins, config),
+        'summary_box': lambda config: create_summary_box_plot(stats, config),
+        'raster': lambda config: create_raster_plot(raster, config),
+    }
+
+def time_build(build, config: Config, repeat: int) -> float:
+    build(config)  # warm the template cache
+    start = time.perf_counter()
+    for _ in range(repeat):
+        build(config)
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50, help='Builds timed per figure.')
+    parser.add_argument('--rows', type=int, default=1000, help='Rows of synthetic data.')
+    args = parser.parse_args()
+
+    validated = Config()
+    unvalidated = copy.copy(validated)
+    unvalidated.validate_figures = False
+
+    print(f"{'figure':<18}{'validated':>12}{'unvalidated':>14}{'speedup':>10}")
+    for name, build in builders(synthetic_data(args.rows)).items():
+        with_validation = time_build(build, validated, args.repeat)
+        without_validation = time_build(build, unvalidated, args.repeat)
+        print(f"{name:<18}{with_validation * 1000:>10.2f}ms{without_validation * 1000:>12.2f}ms"
+              f"{with_validation / without_validation:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
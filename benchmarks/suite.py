@@ -0,0 +1,282 @@
+"""
+Benchmarks loading, building, serializing and reporting on synthetic data.
+
+Datasets shaped like data/iris.csv and data/geo_data.csv are generated at
+each requested size, and every stage is timed on them: load_data, the
+builder of every plot type, to_json/to_html of each figure, and
+generate_report. The peak memory allocated by each stage is traced in a
+separate run so tracing does not distort the timings. Results are written
+as JSON; comparing them with the results of an earlier commit reports the
+stages that got slower.
+
+    python -m benchmarks.suite --sizes 1k,100k --output results.json
+    python -m benchmarks.suite --sizes 1k,100k --compare baseline.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots.config import Config
+from my_interactive_plots.data_loader import load_data
+from my_interactive_plots.plots import create_plot
+from my_interactive_plots.report_generator import generate_report
+
+DEFAULT_SIZES = '1k,100k,1M,10M'
+PLOT_TYPES = ['scatter', 'line', 'histogram', 'box', '3d_scatter', 'geo_map', 'combined', 'animated_scatter']
+# generate_report builds plots without extra arguments and from one frame
+REPORT_PLOT_TYPES = ['scatter', 'line', 'histogram', 'box', '3d_scatter', 'combined']
+
+# Per-species means and standard deviations of sepal_length, sepal_width,
+# petal_length and petal_width in the iris data set
+_IRIS_SPECIES = {
+    'setosa': ([5.01, 3.43, 1.46, 0.25], [0.35, 0.38, 0.17, 0.11]),
+    'versicolor': ([5.94, 2.77, 4.26, 1.33], [0.52, 0.31, 0.47, 0.20]),
+    'virginica': ([6.59, 2.97, 5.55, 2.03], [0.64, 0.32, 0.55, 0.27]),
+}
+_IRIS_COLUMNS = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width']
+
+def parse_size(size: str) -> int:
+    """
+    Parses a row count such as '1000', '100k' or '1M'.
+    """
+    size = size.strip()
+    multiplier = {'k': 10 ** 3, 'm': 10 ** 6}.get(size[-1:].lower(), 1)
+    return int(float(size[:-1] if multiplier > 1 else size) * multiplier)
+
+def iris_like(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Returns rows drawn around the per-species statistics of the iris data set.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(_IRIS_SPECIES)
+    codes = rng.integers(0, len(names), rows)
+    means = np.array([_IRIS_SPECIES[name][0] for name in names])[codes]
+    stds = np.array([_IRIS_SPECIES[name][1] for name in names])[codes]
+    values = np.round(np.abs(rng.normal(means, stds)), 1)
+    data = pd.DataFrame(values, columns=_IRIS_COLUMNS)
+    data['species'] = np.array(names)[codes]
+    return data
+
+def geo_like(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Returns points scattered over the inhabited latitudes, with a species each.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'latitude': np.round(rng.uniform(-55, 70, rows), 2),
+        'longitude': np.round(rng.uniform(-180, 180, rows), 2),
+        'species': rng.choice(['Setosa', 'Versicolor', 'Virginica'], rows)
+    })
+
+def dataset_files(rows: int, data_dir: str) -> Dict[str, str]:
+    """
+    Writes the synthetic CSV files of a size, reusing files written by earlier runs.
+    """
+    files = {}
+    for name, generate in (('iris', iris_like), ('geo', geo_like)):
+        path = os.path.join(data_dir, f'{name}_{rows}.csv')
+        if not os.path.exists(path):
+            partial = path + '.partial'
+            generate(rows).to_csv(partial, index=False)
+            os.replace(partial, path)
+        files[name] = path
+    return files
+
+def measure(fn: Callable[[], Any], repeat: int, max_seconds: float,
+            trace_memory: bool) -> Tuple[Any, List[float], Optional[int]]:
+    """
+    Times up to `repeat` calls of fn, stopping early once `max_seconds` have
+    been spent, then traces the peak memory allocated by one more call.
+
+    Returns:
+        The last result, the seconds of each timed call and the traced peak in bytes.
+    """
+    seconds = []
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        seconds.append(time.perf_counter() - start)
+        if sum(seconds) >= max_seconds:
+            break
+
+    peak = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+def _record(dataset: str, rows: int, stage: str, plot_type: Optional[str] = None, **fields) -> Dict[str, Any]:
+    record = {'dataset': dataset, 'rows': rows, 'stage': stage, 'plot_type': plot_type}
+    seconds = fields.pop('seconds', None)
+    if seconds:
+        record.update(runs=len(seconds), seconds=seconds,
+                      min_seconds=min(seconds), median_seconds=statistics.median(seconds))
+    record.update(fields)
+    return record
+
+def run_size(rows: int, data_dir: str, plot_types: List[str], repeat: int,
+             max_seconds: float, trace_memory: bool) -> List[Dict[str, Any]]:
+    """
+    Runs every stage on the datasets of one size.
+    """
+    files = dataset_files(rows, data_dir)
+    config = Config()
+    records = []
+    frames = {}
+
+    def run(dataset, stage, fn, plot_type=None, size_of=None):
+        try:
+            result, seconds, peak = measure(fn, repeat, max_seconds, trace_memory)
+        except Exception as e:
+            records.append(_record(dataset, rows, stage, plot_type, error=f'{type(e).__name__}: {e}'))
+            return None
+        fields = {'seconds': seconds, 'peak_memory_bytes': peak}
+        if size_of is not None:
+            fields['output_bytes'] = size_of(result)
+        records.append(_record(dataset, rows, stage, plot_type, **fields))
+        print(f"{dataset:<5}{rows:>10,} {stage:<16}{plot_type or '':<18}"
+              f"{statistics.median(seconds):>10.3f}s", file=sys.stderr)
+        return result
+
+    for dataset, path in files.items():
+        frames[dataset] = run(dataset, 'load_data', lambda: load_data(path, use_cache=False))
+    if frames['iris'] is None:
+        return records
+
+    for plot_type in plot_types:
+        dataset = 'geo' if plot_type == 'geo_map' else 'iris'
+        data = frames[dataset]
+        if data is None:
+            continue
+        kwargs = {'animation_frame': 'species'} if plot_type == 'animated_scatter' else {}
+        fig = run(dataset, 'create_plot', lambda: create_plot(data, plot_type, config=config, **kwargs), plot_type)
+        if fig is None:
+            continue
+        run(dataset, 'to_json', fig.to_json, plot_type, size_of=lambda text: len(text.encode()))
+        run(dataset, 'to_html', lambda: fig.to_html(include_plotlyjs='cdn'), plot_type,
+            size_of=lambda text: len(text.encode()))
+
+    report_types = [plot_type for plot_type in plot_types if plot_type in REPORT_PLOT_TYPES]
+    if report_types:
+        report_file = os.path.join(data_dir, f'report_{rows}.html')
+        run('iris', 'generate_report',
+            lambda: generate_report(frames['iris'], report_types, report_file, workers=1,
+                                    config=config, plotlyjs='cdn'),
+            size_of=lambda _: os.path.getsize(report_file))
+    return records
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> Dict[str, Any]:
+    """
+    Describes the code and machine the results were measured on.
+    """
+    import plotly
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plotly': plotly.__version__,
+    }
+
+def _key(record: Dict[str, Any]) -> tuple:
+    return record['dataset'], record['rows'], record['stage'], record['plot_type']
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Lists the stages whose median time grew by more than `tolerance` (0.2 for 20%)
+    over the baseline, and stages that failed although they passed in the baseline.
+    """
+    previous = {_key(record): record for record in baseline['results']}
+    regressions = []
+    for record in results['results']:
+        before = previous.get(_key(record))
+        if before is None or 'median_seconds' not in before:
+            continue
+        if 'median_seconds' not in record:
+            regressions.append({**record, 'baseline_seconds': before['median_seconds']})
+        elif record['median_seconds'] > before['median_seconds'] * (1 + tolerance):
+            regressions.append({**record, 'baseline_seconds': before['median_seconds'],
+                                'ratio': record['median_seconds'] / before['median_seconds']})
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Comma-separated row counts, e.g. 1k,100k,1M.')
+    parser.add_argument('--plot-types', default=','.join(PLOT_TYPES), help='Comma-separated plot types.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage.')
+    parser.add_argument('--max-seconds', type=float, default=10.0,
+                        help='Stop repeating a stage once this much time was spent on it.')
+    parser.add_argument('--no-memory', action='store_true', help='Skip tracing peak memory.')
+    parser.add_argument('--data-dir', help='Directory keeping the generated data between runs; temporary by default.')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file receiving the results.')
+    parser.add_argument('--compare', help='JSON results of an earlier run to check for regressions.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Relative slowdown reported as a regression.')
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    plot_types = [plot_type.strip() for plot_type in args.plot_types.split(',')]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = args.data_dir or temp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        records = []
+        for rows in sizes:
+            records.extend(run_size(rows, data_dir, plot_types, args.repeat, args.max_seconds,
+                                    not args.no_memory))
+
+    results = {
+        'environment': environment(),
+        'settings': {'sizes': sizes, 'plot_types': plot_types, 'repeat': args.repeat,
+                     'max_seconds': args.max_seconds},
+        # ru_maxrss is in kilobytes on Linux
+        'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'results': records,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for record in regressions:
+            change = f"{record['ratio']:.2f}x slower" if 'ratio' in record else f"failed: {record.get('error')}"
+            print(f"REGRESSION {record['dataset']} {record['rows']:,} {record['stage']} "
+                  f"{record['plot_type'] or ''}: {change}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
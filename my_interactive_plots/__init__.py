@@ -1,17 +1,55 @@
-from .plots import (
-    create_plot,
-    create_scatter_plot,
-    create_line_plot,
-    create_histogram,
-    create_box_plot,
-    create_3d_scatter_plot,
-    create_geographical_map,
-    create_combined_plot,
-    create_animated_scatter_plot
-)
-from .data_loader import load_data, load_data_from_db
-from .config import Config
-from .utils import setup_logging
-from .cli import cli
-from .report_generator import generate_report
-from .web_app import app
+import importlib
+import sys
+import types
+
+# Public names and the submodules defining them. Submodules are imported on
+# first attribute access, so `import my_interactive_plots` stays cheap and
+# heavy dependencies (plotly, sqlalchemy, dash, weasyprint) load only when used.
+_LAZY_ATTRIBUTES = {
+    'create_plot': 'plots',
+    'create_scatter_plot': 'plots',
+    'create_line_plot': 'plots',
+    'create_histogram': 'plots',
+    'create_box_plot': 'plots',
+    'create_3d_scatter_plot': 'plots',
+    'create_geographical_map': 'plots',
+    'create_combined_plot': 'plots',
+    'create_animated_scatter_plot': 'plots',
+    'load_data': 'data_loader',
+    'load_data_from_db': 'data_loader',
+    'Config': 'config',
+    'setup_logging': 'utils',
+    'cli': 'cli',
+    'generate_report': 'report_generator',
+    'app': 'web_app',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+# Public names shared with the submodule defining them, such as the cli command
+_SHADOWED = {name for name, module_name in _LAZY_ATTRIBUTES.items() if name == module_name}
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it on the package, which would hide the
+        # public attribute of the same name; bind the attribute instead
+        if name in _SHADOWED and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,446 @@
+# my_interactive_plots/aggregation.py
+
+import logging
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def _group_codes(data: pd.DataFrame, group_columns: Sequence[str]) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Numbers the groups formed by the given columns in sorted key order.
+
+    Returns:
+        Tuple[np.ndarray, pd.DataFrame]: Group code of every row (-1 where a
+        key is missing) and the key values of each group, indexed by code.
+    """
+    if not group_columns:
+        return np.zeros(len(data), dtype='int64'), pd.DataFrame(index=pd.RangeIndex(1))
+    grouper = data.groupby(list(group_columns), observed=True, sort=True, dropna=True)
+    codes = grouper.ngroup().to_numpy(dtype='float64', na_value=np.nan)
+    codes = np.where(np.isnan(codes), -1, codes).astype('int64')
+    keys = grouper.size().index.to_frame(index=False)
+    return codes, keys
+
+
+def histogram_bins(data: pd.DataFrame, column: str, bins: int = 50,
+                   group_column: Optional[str] = None,
+                   value_range: Optional[Tuple[float, float]] = None) -> pd.DataFrame:
+    """
+    Counts the values of a numeric column in equal-width bins, per group.
+
+    Args:
+        data (pd.DataFrame): Data to bin.
+        column (str): Numeric column to bin.
+        bins (int): Number of bins.
+        group_column (str, optional): Column splitting the counts, e.g. the color column.
+        value_range (Tuple[float, float], optional): Range covered by the bins;
+            defaults to the range of the column.
+
+    Returns:
+        pd.DataFrame: Columns [group_column,] 'bin_start', 'bin_end' and 'count',
+        with every bin of every group, as accepted by create_binned_histogram.
+    """
+    values = pd.to_numeric(data[column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    codes, keys = _group_codes(data, [group_column] if group_column else [])
+    valid = np.isfinite(values) & (codes >= 0)
+    values, codes = values[valid], codes[valid]
+
+    if value_range is not None:
+        low, high = value_range
+        inside = (values >= low) & (values <= high)
+        values, codes = values[inside], codes[inside]
+    elif len(values):
+        low, high = values.min(), values.max()
+    else:
+        low, high = 0.0, 1.0
+    if high <= low:
+        low, high = low - 0.5, low + 0.5
+
+    edges = np.linspace(low, high, bins + 1)
+    positions = np.clip(((values - low) / (high - low) * bins).astype('int64'), 0, bins - 1)
+    counts = np.bincount(codes * bins + positions, minlength=len(keys) * bins)
+
+    result = pd.DataFrame({
+        'bin_start': np.tile(edges[:-1], len(keys)),
+        'bin_end': np.tile(edges[1:], len(keys)),
+        'count': counts,
+    })
+    if group_column:
+        result.insert(0, group_column, np.repeat(keys[group_column].to_numpy(), bins))
+    return result
+
+
+def category_counts(data: pd.DataFrame, column: str, group_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Counts the rows of every value of a categorical column, per group.
+
+    Args:
+        data (pd.DataFrame): Data to count.
+        column (str): Categorical column.
+        group_column (str, optional): Column splitting the counts.
+
+    Returns:
+        pd.DataFrame: Columns [group_column,] column and 'count'.
+    """
+    keys = [group_column, column] if group_column else [column]
+    return data.groupby(keys, observed=True, sort=True).size().reset_index(name='count')
+
+
+def box_statistics(data: pd.DataFrame, value_column: str, group_columns: Sequence[str] = (),
+                   whisker_width: float = 1.5, max_outliers: int = 1000) -> pd.DataFrame:
+    """
+    Computes the statistics drawn by a box plot, per group.
+
+    Whiskers follow Plotly's convention: they end at the most extreme values
+    within whisker_width interquartile ranges of the quartiles. Values beyond
+    the whiskers are outliers; only the most extreme max_outliers of each
+    group are kept.
+
+    Args:
+        data (pd.DataFrame): Data to summarize.
+        value_column (str): Numeric column summarized by the boxes.
+        group_columns (Sequence[str]): Columns defining one box per group.
+        whisker_width (float): Whisker reach in interquartile ranges.
+        max_outliers (int): Maximum outliers kept per group.
+
+    Returns:
+        pd.DataFrame: The group columns and 'q1', 'median', 'q3', 'lowerfence',
+        'upperfence', 'mean', 'count' and 'outliers' (a list per group).
+    """
+    values = pd.to_numeric(data[value_column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    codes, keys = _group_codes(data, list(group_columns))
+    valid = np.isfinite(values) & (codes >= 0)
+    values, codes = values[valid], codes[valid]
+
+    by_group = pd.Series(values).groupby(codes)
+    quartiles = by_group.quantile([0.25, 0.5, 0.75]).unstack()
+    stats = pd.DataFrame({
+        'q1': quartiles[0.25],
+        'median': quartiles[0.5],
+        'q3': quartiles[0.75],
+        'mean': by_group.mean(),
+        'count': by_group.size(),
+    })
+
+    iqr = stats['q3'] - stats['q1']
+    low_limit = (stats['q1'] - whisker_width * iqr).reindex(range(len(keys))).to_numpy()
+    high_limit = (stats['q3'] + whisker_width * iqr).reindex(range(len(keys))).to_numpy()
+    inside = (values >= low_limit[codes]) & (values <= high_limit[codes])
+    within = pd.Series(values[inside]).groupby(codes[inside])
+    stats['lowerfence'] = within.min()
+    stats['upperfence'] = within.max()
+
+    outliers = pd.DataFrame({'code': codes[~inside], 'value': values[~inside]})
+    outliers['distance'] = (outliers['value'] - stats['median'].reindex(outliers['code']).to_numpy()).abs()
+    outliers = outliers.sort_values(['code', 'distance'], ascending=[True, False], kind='stable')
+    outliers = outliers[outliers.groupby('code').cumcount() < max_outliers]
+    stats['outliers'] = outliers.groupby('code')['value'].agg(list)
+    stats['outliers'] = stats['outliers'].apply(lambda kept: kept if isinstance(kept, list) else [])
+
+    stats = stats.reindex(range(len(keys)))
+    stats = stats[stats['count'].notna()]
+    stats['count'] = stats['count'].astype('int64')
+    columns: List[str] = ['q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'count', 'outliers']
+    result = pd.concat([keys.loc[stats.index].reset_index(drop=True), stats[columns].reset_index(drop=True)], axis=1)
+    logger.debug(f"Computed box statistics of {len(values)} values in {len(result)} groups")
+    return result
+
+
+# Statistics computed by rolling_statistics, and the columns they add per y column
+ROLLING_STATISTICS = ('mean', 'median', 'quantile', 'ewm')
+
+
+def _sorted_by_x(data: pd.DataFrame, x: str, columns: List[str],
+                 group_column: Optional[str]) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Returns the given columns sorted by group and then by x, with the group code
+    of every row; rows without a group are left out.
+    """
+    codes, keys = _group_codes(data, [group_column] if group_column else [])
+    order = None if data[x].is_monotonic_increasing else np.argsort(data[x].to_numpy(), kind='stable')
+    if group_column:
+        order = np.arange(len(data)) if order is None else order
+        # A stable sort by group keeps the x order within groups; small codes sort in linear time
+        group_codes = codes[order].astype('int16' if len(keys) < 2 ** 15 else 'int64')
+        order = order[np.argsort(group_codes, kind='stable')]
+        order = order[codes[order] >= 0]
+    frame = data[columns] if order is None else data[columns].iloc[order]
+    return frame.reset_index(drop=True), codes if order is None else codes[order]
+
+
+def rolling_statistics(data: pd.DataFrame, x: str, y_columns: Sequence[str],
+                       statistics: Sequence[str] = ('mean',), window: Union[int, str] = 5,
+                       quantiles: Sequence[float] = (0.1, 0.9), ewm_span: float = 20.0,
+                       group_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Computes rolling statistics of several columns along x, per group.
+
+    The rows are sorted by group and x once, then every statistic is
+    computed for all y columns and groups in a single vectorized pass;
+    windows spanning two groups are left empty, as windows with too few
+    rows are.
+
+    Args:
+        data (pd.DataFrame): Data to summarize.
+        x (str): Column the windows roll along.
+        y_columns (Sequence[str]): Numeric columns summarized.
+        statistics (Sequence[str]): Any of 'mean', 'median', 'quantile'
+            (one column per quantile) and 'ewm' (exponentially weighted mean).
+        window (int or str): Rows per window, or a time offset such as '1h'
+            when x holds timestamps.
+        quantiles (Sequence[float]): Quantiles computed by 'quantile'.
+        ewm_span (float): Span of the exponentially weighted mean.
+        group_column (str, optional): Column splitting the rows into groups,
+            e.g. the color column.
+
+    Returns:
+        pd.DataFrame: [group_column,] x and the y columns sorted by group and
+        x, and a column named '<y> <statistic>' per y column and statistic,
+        quantiles being named 'q<quantile>', e.g. 'price q0.9'.
+    """
+    y_columns = list(y_columns)
+    columns = list(dict.fromkeys(([group_column] if group_column else []) + [x] + y_columns))
+    frame, codes = _sorted_by_x(data, x, columns, group_column)
+    values = frame[y_columns]
+    by_group = values.groupby(codes, sort=True) if group_column else None
+    if isinstance(window, str):
+        # Offset windows are measured on x
+        values = values.set_axis(pd.DatetimeIndex(frame[x]))
+        by_group = values.groupby(codes, sort=True) if group_column else None
+        rolling = by_group.rolling(window) if by_group is not None else values.rolling(window)
+    else:
+        # Windows of rows roll over all groups at once; those reaching into
+        # the previous group are blanked below, as if rolled per group
+        rolling = values.rolling(window)
+
+    results = {}
+    for statistic in statistics:
+        if statistic == 'mean':
+            results['mean'] = rolling.mean()
+        elif statistic == 'median':
+            results['median'] = rolling.median()
+        elif statistic == 'quantile':
+            for quantile in quantiles:
+                results[f'q{quantile:g}'] = rolling.quantile(quantile)
+        elif statistic == 'ewm':
+            results['ewm'] = (by_group if by_group is not None else values).ewm(span=ewm_span).mean()
+        else:
+            raise ValueError(f"Unsupported rolling statistic: {statistic}")
+
+    straddling = None
+    if group_column and not isinstance(window, str) and len(frame):
+        starts = np.flatnonzero(np.diff(codes, prepend=codes[0] - 1))
+        within = np.arange(len(frame)) - np.repeat(starts, np.diff(np.append(starts, len(frame))))
+        straddling = within < window - 1
+    for name, result in results.items():
+        # Grouped results come in group order, which is the order of the sorted rows
+        result = result.to_numpy()
+        if straddling is not None and name != 'ewm':
+            result = np.where(straddling[:, None], np.nan, result)
+        for column, series in zip(y_columns, result.T):
+            frame[f'{column} {name}'] = series
+    logger.debug(f"Computed {', '.join(results)} of {len(y_columns)} columns over {len(frame)} rows")
+    return frame
+
+
+def resampled_means(data: pd.DataFrame, x: str, y_columns: Sequence[str], bins: int = 50,
+                    rule: Union[str, float, None] = None,
+                    group_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Averages several columns over intervals of x, per group.
+
+    Args:
+        data (pd.DataFrame): Data to summarize.
+        x (str): Numeric or timestamp column cut into intervals.
+        y_columns (Sequence[str]): Numeric columns averaged.
+        bins (int): Number of equal intervals over the range of x, when no rule is given.
+        rule (str or float, optional): Interval width: a fixed offset such as
+            '1D' for timestamps, a number otherwise; intervals then start at
+            multiples of the width.
+        group_column (str, optional): Column splitting the rows into groups.
+
+    Returns:
+        pd.DataFrame: [group_column,] the middle of every non-empty interval
+        as x, the mean of every y column and the 'count' of rows, sorted by
+        group and x.
+    """
+    y_columns = list(y_columns)
+    is_datetime = pd.api.types.is_datetime64_any_dtype(data[x].dtype)
+    if is_datetime:
+        positions = pd.DatetimeIndex(data[x]).tz_localize(None).as_unit('ns').asi8.astype('float64')
+        positions[data[x].isna().to_numpy()] = np.nan
+    else:
+        positions = pd.to_numeric(data[x], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    codes, keys = _group_codes(data, [group_column] if group_column else [])
+    valid = np.isfinite(positions) & (codes >= 0)
+
+    if rule is not None:
+        width = float(pd.Timedelta(rule).value) if is_datetime else float(rule)
+        origin = 0.0
+        intervals = np.floor(positions[valid] / width)
+    else:
+        origin = positions[valid].min() if valid.any() else 0.0
+        width = ((positions[valid].max() - origin) / bins if valid.any() else 0.0) or 1.0
+        intervals = np.minimum(np.floor((positions[valid] - origin) / width), bins - 1)
+
+    grouped = data.loc[valid, y_columns].groupby([codes[valid], intervals], sort=True)
+    means = grouped.mean()
+    middles = origin + (means.index.get_level_values(1).to_numpy() + 0.5) * width
+    result = pd.DataFrame({x: pd.to_datetime(middles.astype('int64')) if is_datetime else middles})
+    if group_column:
+        result.insert(0, group_column, keys[group_column].to_numpy()[means.index.get_level_values(0)])
+    for column in y_columns:
+        result[column] = means[column].to_numpy()
+    result['count'] = grouped.size().to_numpy()
+    return result
+
+
+class Raster:
+    """
+    Point data aggregated onto a pixel grid.
+
+    Attributes:
+        values (np.ndarray): Aggregate per pixel, shaped (height, width), or
+            (categories, height, width) when split by category; rows go up in y.
+        counts (np.ndarray): Points per pixel, shaped like values.
+        x_edges (np.ndarray): Pixel edges along x (width + 1 values).
+        y_edges (np.ndarray): Pixel edges along y (height + 1 values).
+        categories (list, optional): Category of each layer of values.
+        how (str): Aggregate of the pixels, 'count' or 'mean'.
+    """
+
+    def __init__(self, values: np.ndarray, counts: np.ndarray, x_edges: np.ndarray, y_edges: np.ndarray,
+                 categories: Optional[list] = None, how: str = 'count'):
+        self.values = values
+        self.counts = counts
+        self.x_edges = x_edges
+        self.y_edges = y_edges
+        self.categories = categories
+        self.how = how
+
+    @property
+    def x_centers(self) -> np.ndarray:
+        return (self.x_edges[:-1] + self.x_edges[1:]) / 2
+
+    @property
+    def y_centers(self) -> np.ndarray:
+        return (self.y_edges[:-1] + self.y_edges[1:]) / 2
+
+    @property
+    def points(self) -> int:
+        return int(self.counts.sum())
+
+
+def _extent(values: np.ndarray, value_range: Optional[Tuple[float, float]]) -> Tuple[float, float]:
+    if value_range is not None:
+        low, high = float(value_range[0]), float(value_range[1])
+    elif len(values):
+        low, high = float(values.min()), float(values.max())
+    else:
+        low, high = 0.0, 1.0
+    if high <= low:
+        low, high = low - 0.5, low + 0.5
+    return low, high
+
+
+def rasterize(data: pd.DataFrame, x: str, y: str, width: int = 600, height: int = 400,
+              x_range: Optional[Tuple[float, float]] = None, y_range: Optional[Tuple[float, float]] = None,
+              how: str = 'count', value_column: Optional[str] = None,
+              category_column: Optional[str] = None) -> Raster:
+    """
+    Bins points into a pixel grid, counting them or averaging a value column per pixel.
+
+    Args:
+        data (pd.DataFrame): Points to rasterize.
+        x (str): Column of the horizontal coordinate.
+        y (str): Column of the vertical coordinate.
+        width (int): Pixels along x.
+        height (int): Pixels along y.
+        x_range (Tuple[float, float], optional): Extent along x; points outside
+            are left out. Defaults to the extent of the data.
+        y_range (Tuple[float, float], optional): Extent along y, likewise.
+        how (str): 'count' for points per pixel, or 'mean' of value_column.
+        value_column (str, optional): Column averaged when how is 'mean'.
+        category_column (str, optional): Column splitting the grid into one layer per category.
+
+    Returns:
+        Raster: The aggregated grid.
+    """
+    if how not in ('count', 'mean'):
+        raise ValueError(f"Unsupported raster aggregate: {how}")
+    if how == 'mean' and value_column is None:
+        raise ValueError("A value column is required to rasterize the mean")
+    x_values = pd.to_numeric(data[x], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    y_values = pd.to_numeric(data[y], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    valid = np.isfinite(x_values) & np.isfinite(y_values)
+    x_low, x_high = _extent(x_values[valid], x_range)
+    y_low, y_high = _extent(y_values[valid], y_range)
+    valid &= (x_values >= x_low) & (x_values <= x_high) & (y_values >= y_low) & (y_values <= y_high)
+
+    if category_column:
+        codes, categories = pd.factorize(data[category_column], sort=True)
+        valid &= codes >= 0
+        categories = list(categories)
+    else:
+        codes, categories = np.zeros(len(data), dtype='int64'), None
+    layers = len(categories) if categories is not None else 1
+
+    columns = np.clip(((x_values[valid] - x_low) / (x_high - x_low) * width).astype('int64'), 0, width - 1)
+    rows = np.clip(((y_values[valid] - y_low) / (y_high - y_low) * height).astype('int64'), 0, height - 1)
+    flat = (codes[valid] * height + rows) * width + columns
+    shape = (layers, height, width)
+    counts = np.bincount(flat, minlength=layers * height * width).reshape(shape)
+    if how == 'mean':
+        values = pd.to_numeric(data[value_column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)[valid]
+        present = np.isfinite(values)
+        counts = np.bincount(flat[present], minlength=layers * height * width).reshape(shape)
+        sums = np.bincount(flat[present], weights=values[present], minlength=layers * height * width).reshape(shape)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    else:
+        result = counts
+    if categories is None:
+        result, counts = result[0], counts[0]
+    return Raster(
+        result,
+        counts,
+        np.linspace(x_low, x_high, width + 1),
+        np.linspace(y_low, y_high, height + 1),
+        categories,
+        how
+    )
+
+
+def shade(raster: Raster, colors: Sequence[Tuple[int, int, int]], min_alpha: int = 40) -> np.ndarray:
+    """
+    Blends the per-category counts of a raster into an RGBA image.
+
+    Each pixel takes the count-weighted mix of its categories' colors, with an
+    opacity growing with the logarithm of its count, so that both dense
+    regions and isolated outliers stay visible.
+
+    Args:
+        raster (Raster): Raster split by category.
+        colors (Sequence[Tuple[int, int, int]]): RGB color of each category, cycled.
+        min_alpha (int): Opacity (0-255) of pixels holding a single point.
+
+    Returns:
+        np.ndarray: uint8 array shaped (height, width, 4).
+    """
+    counts = raster.counts if raster.counts.ndim == 3 else raster.counts[np.newaxis]
+    palette = np.array([colors[i % len(colors)] for i in range(counts.shape[0])], dtype='float64')
+    total = counts.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rgb = np.einsum('chw,ck->hwk', counts, palette) / total[..., np.newaxis]
+    rgb = np.nan_to_num(rgb)
+    log_total = np.log1p(total)
+    scale = log_total.max() or 1.0
+    alpha = np.where(total > 0, min_alpha + (255 - min_alpha) * log_total / scale, 0)
+    return np.concatenate((rgb, alpha[..., np.newaxis]), axis=2).round().astype('uint8')
@@ -0,0 +1,191 @@
+# my_interactive_plots/animation.py
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class AnimationFrames:
+    """
+    Points of an animated scatter plot, split into frames and traces.
+
+    The points are stored once, sorted by frame and then by trace, so a
+    frame's points for a trace are a slice of x and y.
+
+    Attributes:
+        labels (list): Name of each frame, in playing order.
+        traces (list): Name of each trace, i.e. each color, or [None] without colors.
+        x (np.ndarray): x of the kept points.
+        y (np.ndarray): y of the kept points.
+        offsets (np.ndarray): Start of the points of every (frame, trace)
+            pair in x and y, frame-major, followed by the number of points.
+        dropped (int): Points left out to respect the per-frame budget.
+    """
+
+    def __init__(self, labels: list, traces: list, x: np.ndarray, y: np.ndarray,
+                 offsets: np.ndarray, dropped: int = 0):
+        self.labels = labels
+        self.traces = traces
+        self.x = x
+        self.y = y
+        self.offsets = offsets
+        self.dropped = dropped
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def nbytes(self) -> int:
+        return self.x.nbytes + self.y.nbytes + self.offsets.nbytes
+
+    @property
+    def max_frame_points(self) -> int:
+        """
+        Points of the largest frame.
+        """
+        ends = self.offsets[::len(self.traces)]
+        return int(np.diff(ends).max()) if len(self.labels) else 0
+
+    def points(self, frame: int) -> List[Dict[str, np.ndarray]]:
+        """
+        Returns a frame's points as the x and y of every trace.
+
+        Args:
+            frame (int): Position of the frame in labels.
+
+        Returns:
+            List[Dict[str, np.ndarray]]: One {'x', 'y'} dictionary per trace.
+        """
+        start = frame * len(self.traces)
+        return [
+            {'x': self.x[self.offsets[cell]:self.offsets[cell + 1]],
+             'y': self.y[self.offsets[cell]:self.offsets[cell + 1]]}
+            for cell in range(start, start + len(self.traces))
+        ]
+
+
+def _format_edge(value: float, is_datetime: bool) -> str:
+    if is_datetime:
+        return str(pd.Timestamp(int(value)))
+    return f"{value:g}"
+
+
+def bin_frames(values: pd.Series, max_frames: int) -> Tuple[np.ndarray, list]:
+    """
+    Assigns rows to animation frames, merging frame values beyond max_frames.
+
+    Every distinct value is a frame when there are few enough of them.
+    Otherwise numbers and timestamps are cut into max_frames intervals of
+    equal width (fewer for integers, whose bounds are kept whole), named
+    after their start, and other values are merged into runs of
+    consecutive values. Numbers, timestamps and ordered categories
+    play in sorted order, other values in order of appearance, as in
+    Plotly Express. Rows without a value are in no frame.
+
+    Args:
+        values (pd.Series): Frame value of every row.
+        max_frames (int): Maximum number of frames.
+
+    Returns:
+        Tuple[np.ndarray, list]: The frame of every row (-1 for none) and the
+        name of every frame.
+    """
+    is_datetime = pd.api.types.is_datetime64_any_dtype(values.dtype)
+    is_numeric = is_datetime or (pd.api.types.is_numeric_dtype(values.dtype)
+                                 and not pd.api.types.is_bool_dtype(values.dtype))
+    ordered = isinstance(values.dtype, pd.CategoricalDtype) and values.dtype.ordered
+    codes, uniques = pd.factorize(values, sort=is_numeric or ordered)
+    if len(uniques) <= max_frames:
+        return codes, [str(value) for value in uniques]
+
+    if is_numeric:
+        if is_datetime:
+            stamps = values.dt.tz_localize(None) if values.dt.tz is not None else values
+            numbers = stamps.to_numpy(dtype='datetime64[ns]').view('int64').astype('float64')
+        else:
+            numbers = values.to_numpy(dtype='float64', na_value=np.nan)
+        valid = codes >= 0
+        edges = np.linspace(numbers[valid].min(), numbers[valid].max(), max_frames + 1)
+        if values.dtype.kind in 'iu':
+            # Whole-number bounds, e.g. for years
+            edges = np.unique(np.ceil(edges))
+        binned = np.clip(np.searchsorted(edges, numbers, side='right') - 1, 0, len(edges) - 2)
+        labels = [_format_edge(edge, is_datetime) for edge in edges[:-1]]
+        return np.where(valid, binned, -1), labels
+
+    groups = np.arange(len(uniques)) * max_frames // len(uniques)
+    starts = np.flatnonzero(np.diff(groups, prepend=-1))
+    ends = np.append(starts[1:], len(uniques)) - 1
+    labels = [str(uniques[start]) if start == end else f"{uniques[start]} - {uniques[end]}"
+              for start, end in zip(starts, ends)]
+    return np.where(codes >= 0, groups[codes], -1), labels
+
+
+def split_frames(data: pd.DataFrame, x: str, y: str, frame_column: str,
+                 color_column: Optional[str] = None, max_frames: int = 200,
+                 max_points: Optional[int] = None, seed: int = 0) -> AnimationFrames:
+    """
+    Splits points into animation frames and traces, sampling crowded frames.
+
+    Frames holding more than max_points points keep a random sample of them,
+    which preserves the density of the frame and the share of every color.
+    The sample only depends on the data and the seed, so splitting the same
+    data again gives the same frames.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data.
+        x (str): Column used for the horizontal axis.
+        y (str): Column used for the vertical axis.
+        frame_column (str): Column defining the frames (see bin_frames).
+        color_column (str, optional): Column splitting each frame into traces.
+        max_frames (int): Maximum number of frames.
+        max_points (int, optional): Points kept per frame; None or 0 keeps all.
+        seed (int): Seed for the random sampling.
+
+    Returns:
+        AnimationFrames: The frames.
+    """
+    frames, labels = bin_frames(data[frame_column], max_frames)
+    if color_column is not None and color_column in data.columns:
+        traces, names = pd.factorize(data[color_column], use_na_sentinel=False)
+        names = [str(name) for name in names]
+    else:
+        traces, names = np.zeros(len(data), dtype='int64'), [None]
+
+    in_frame = frames >= 0
+    keep = in_frame
+    if max_points:
+        # Rank the rows of every frame in a random order and keep the first max_points
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(data))
+        order = order[np.argsort(frames[order], kind='stable')]
+        sizes = np.bincount(frames[in_frame], minlength=len(labels))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        skipped = len(data) - in_frame.sum()
+        ranks = np.empty(len(data), dtype='int64')
+        ranks[order] = np.arange(len(data)) - np.concatenate((np.zeros(skipped, dtype='int64'),
+                                                               starts[frames[order[skipped:]]]))
+        keep = in_frame & (ranks < max_points)
+
+    positions = np.flatnonzero(keep)
+    cells = frames[positions] * len(names) + traces[positions]
+    positions = positions[np.argsort(cells, kind='stable')]
+    counts = np.bincount(cells, minlength=len(labels) * len(names))
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    dropped = int(in_frame.sum()) - len(positions)
+    if dropped:
+        logger.info(f"Kept {len(positions)} of {len(positions) + dropped} points "
+                    f"in {len(labels)} frames ({dropped} points dropped)")
+    return AnimationFrames(
+        labels, names,
+        data[x].to_numpy()[positions],
+        data[y].to_numpy()[positions],
+        offsets, dropped
+    )
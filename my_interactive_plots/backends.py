@@ -0,0 +1,334 @@
+# my_interactive_plots/backends.py
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregation import histogram_bins
+from .config import Config
+from .filters import Predicate
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Aggregates every backend computes per group, as accepted by aggregate_from_db
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+
+
+def _check_aggregates(aggregates: Sequence[str]):
+    unknown = [name for name in aggregates if name not in AGGREGATES]
+    if unknown:
+        raise ValueError(f"Unsupported aggregates: {', '.join(unknown)}")
+
+
+def _histogram_frame(counts: pd.DataFrame, low: Optional[float], high: Optional[float], bins: int,
+                     group_column: Optional[str]) -> pd.DataFrame:
+    """
+    Expands counts of the non-empty bins, in columns [group_column,] 'bin' and
+    'count', to every bin of every group, as returned by histogram_bins.
+    """
+    if low is None:
+        low, high = 0.0, 1.0
+    edges = np.linspace(low, high, bins + 1)
+    if group_column:
+        groups = np.sort(counts[group_column].dropna().unique())
+        index = pd.MultiIndex.from_product([groups, range(bins)], names=[group_column, 'bin'])
+        full = counts.set_index([group_column, 'bin'])['count'].reindex(index, fill_value=0)
+    else:
+        groups = [None]
+        full = counts.set_index('bin')['count'].reindex(range(bins), fill_value=0)
+    result = pd.DataFrame({
+        'bin_start': np.tile(edges[:-1], len(groups)),
+        'bin_end': np.tile(edges[1:], len(groups)),
+        'count': full.to_numpy(dtype='int64'),
+    })
+    if group_column:
+        result.insert(0, group_column, np.repeat(groups, bins))
+    return result
+
+
+def _bounds(low: Optional[float], high: Optional[float]):
+    """
+    Range covered by histogram bins, widened around a single value as histogram_bins does.
+    """
+    if low is not None and high <= low:
+        low, high = low - 0.5, low + 0.5
+    return low, high
+
+
+class Backend:
+    """
+    Engine running the column work behind plots: loading, filtering,
+    projection and aggregation.
+
+    Tables are the engine's own objects. They are turned into pandas
+    DataFrames by to_pandas only where the data is handed over to Plotly or
+    to code written for pandas; aggregates come back as small DataFrames.
+    """
+
+    name = 'base'
+
+    def read_csv(self, file_path: str, columns: Optional[List[str]] = None) -> Any:
+        """
+        Reads the given columns of a CSV file (all columns when None) into a table.
+        """
+        raise NotImplementedError
+
+    def filter(self, table: Any, predicate: Predicate) -> Any:
+        """
+        Keeps the rows matching a compiled filter, see filters.parse_filter.
+        """
+        raise NotImplementedError
+
+    def select(self, table: Any, columns: List[str]) -> Any:
+        raise NotImplementedError
+
+    def num_rows(self, table: Any) -> int:
+        raise NotImplementedError
+
+    def column_names(self, table: Any) -> List[str]:
+        raise NotImplementedError
+
+    def is_numeric(self, table: Any, column: str) -> bool:
+        raise NotImplementedError
+
+    def histogram(self, table: Any, column: str, bins: int = 50,
+                  group_column: Optional[str] = None) -> pd.DataFrame:
+        """
+        Counts the values of a numeric column in equal-width bins, per group.
+
+        Returns:
+            pd.DataFrame: As aggregation.histogram_bins.
+        """
+        raise NotImplementedError
+
+    def aggregate(self, table: Any, group_columns: List[str], value_column: str,
+                  aggregates: Sequence[str] = ('count', 'mean', 'min', 'max')) -> pd.DataFrame:
+        """
+        Computes per-group aggregates of a column.
+
+        Returns:
+            pd.DataFrame: One row per group, sorted by the group columns, with
+            one column per aggregate, as data_loader.aggregate_from_db.
+        """
+        raise NotImplementedError
+
+    def to_pandas(self, table: Any) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class PandasBackend(Backend):
+    """
+    Runs everything in pandas, in the calling thread.
+    """
+
+    name = 'pandas'
+
+    def read_csv(self, file_path, columns=None):
+        return pd.read_csv(file_path, usecols=columns)
+
+    def filter(self, table, predicate):
+        return predicate.apply(table)
+
+    def select(self, table, columns):
+        return table[columns]
+
+    def num_rows(self, table):
+        return len(table)
+
+    def column_names(self, table):
+        return list(table.columns)
+
+    def is_numeric(self, table, column):
+        return pd.api.types.is_numeric_dtype(table[column])
+
+    def histogram(self, table, column, bins=50, group_column=None):
+        return histogram_bins(table, column, bins=bins, group_column=group_column)
+
+    def aggregate(self, table, group_columns, value_column, aggregates=('count', 'mean', 'min', 'max')):
+        _check_aggregates(aggregates)
+        grouped = table.groupby(list(group_columns), sort=True, dropna=False, observed=True)[value_column]
+        return grouped.agg(list(aggregates)).reset_index()
+
+    def to_pandas(self, table):
+        return table
+
+
+class ArrowBackend(Backend):
+    """
+    Runs on pyarrow: multithreaded CSV parsing and pyarrow.compute kernels.
+    """
+
+    name = 'pyarrow'
+
+    def read_csv(self, file_path, columns=None):
+        from pyarrow import csv
+
+        convert_options = csv.ConvertOptions(include_columns=columns) if columns is not None else None
+        return csv.read_csv(file_path, read_options=csv.ReadOptions(use_threads=True),
+                            convert_options=convert_options)
+
+    def filter(self, table, predicate):
+        return table.filter(predicate.to_arrow(table.schema))
+
+    def select(self, table, columns):
+        return table.select(columns)
+
+    def num_rows(self, table):
+        return table.num_rows
+
+    def column_names(self, table):
+        return list(table.column_names)
+
+    def is_numeric(self, table, column):
+        import pyarrow as pa
+
+        kind = table.schema.field(column).type
+        return pa.types.is_integer(kind) or pa.types.is_floating(kind)
+
+    def histogram(self, table, column, bins=50, group_column=None):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        values = pc.cast(table[column], pa.float64())
+        extremes = pc.min_max(values).as_py()
+        low, high = _bounds(extremes['min'], extremes['max'])
+        if low is None:
+            counts = pd.DataFrame(columns=([group_column] if group_column else []) + ['bin', 'count'])
+            return _histogram_frame(counts, low, high, bins, group_column)
+        scaled = pc.multiply(pc.divide(pc.subtract(values, low), high - low), float(bins))
+        positions = pc.min_element_wise(pc.cast(pc.floor(scaled), pa.int64()), bins - 1)
+        columns = {'bin': positions}
+        if group_column:
+            columns[group_column] = table[group_column]
+        binned = pa.table(columns).drop_null()
+        keys = [group_column, 'bin'] if group_column else ['bin']
+        counts = binned.group_by(keys).aggregate([('bin', 'count')]).to_pandas()
+        counts = counts.rename(columns={'bin_count': 'count'})
+        return _histogram_frame(counts, low, high, bins, group_column)
+
+    def aggregate(self, table, group_columns, value_column, aggregates=('count', 'mean', 'min', 'max')):
+        _check_aggregates(aggregates)
+        result = table.group_by(list(group_columns)).aggregate(
+            [(value_column, name) for name in aggregates]
+        ).to_pandas()
+        result = result.rename(columns={f'{value_column}_{name}': name for name in aggregates})
+        result = result[list(group_columns) + list(aggregates)]
+        return result.sort_values(list(group_columns), kind='stable').reset_index(drop=True)
+
+    def to_pandas(self, table):
+        return table.to_pandas()
+
+
+class PolarsBackend(Backend):
+    """
+    Runs on Polars lazy frames, so that projections and filters are pushed
+    into the multithreaded CSV scan and nothing runs before results are
+    collected.
+    """
+
+    name = 'polars'
+
+    def read_csv(self, file_path, columns=None):
+        import polars as pl
+
+        frame = pl.scan_csv(file_path)
+        return frame if columns is None else frame.select(columns)
+
+    def filter(self, table, predicate):
+        return table.filter(predicate.to_polars(table.collect_schema()))
+
+    def select(self, table, columns):
+        return table.select(columns)
+
+    def num_rows(self, table):
+        import polars as pl
+
+        return int(table.select(pl.len()).collect().item())
+
+    def column_names(self, table):
+        return list(table.collect_schema().names())
+
+    def is_numeric(self, table, column):
+        return table.collect_schema()[column].is_numeric()
+
+    def histogram(self, table, column, bins=50, group_column=None):
+        import polars as pl
+
+        values = pl.col(column).cast(pl.Float64)
+        low, high = _bounds(*table.select(values.min().alias('low'), values.max().alias('high')).collect().row(0))
+        if low is None:
+            counts = pd.DataFrame(columns=([group_column] if group_column else []) + ['bin', 'count'])
+            return _histogram_frame(counts, low, high, bins, group_column)
+        position = ((values - low) / (high - low) * bins).floor().cast(pl.Int64).clip(0, bins - 1).alias('bin')
+        keys = [group_column, 'bin'] if group_column else ['bin']
+        counts = (
+            table.select(*([pl.col(group_column)] if group_column else []), position)
+            .drop_nulls()
+            .group_by(keys)
+            .len(name='count')
+            .collect()
+            .to_pandas()
+        )
+        return _histogram_frame(counts, low, high, bins, group_column)
+
+    def aggregate(self, table, group_columns, value_column, aggregates=('count', 'mean', 'min', 'max')):
+        import polars as pl
+
+        _check_aggregates(aggregates)
+        value = pl.col(value_column)
+        expressions = {
+            'count': value.count(),
+            'sum': value.sum(),
+            'mean': value.mean(),
+            'min': value.min(),
+            'max': value.max(),
+        }
+        return (
+            table.group_by(list(group_columns))
+            .agg([expressions[name].alias(name) for name in aggregates])
+            .sort(list(group_columns))
+            .collect()
+            .to_pandas()
+        )
+
+    def to_pandas(self, table):
+        return table.collect().to_pandas()
+
+
+_BACKENDS: Dict[str, Backend] = {}
+
+
+def register_backend(backend: Backend):
+    """
+    Registers an execution backend under its name.
+
+    Args:
+        backend (Backend): The backend; its name selects it in Config.backend.
+    """
+    _BACKENDS[backend.name] = backend
+
+
+def get_backend(name: Optional[str] = None) -> Backend:
+    """
+    Returns the backend registered under the given name.
+
+    Args:
+        name (str, optional): Name of the backend; defaults to Config.backend.
+
+    Returns:
+        Backend: The registered backend.
+    """
+    name = name or Config().backend
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown execution backend: {name}") from None
+
+
+register_backend(PandasBackend())
+register_backend(ArrowBackend())
+register_backend(PolarsBackend())
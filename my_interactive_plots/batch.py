@@ -0,0 +1,290 @@
+# my_interactive_plots/batch.py
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+import pandas as pd
+
+from .config import Config
+from .data_loader import load_data
+from .filters import Predicate, build_filter
+from .html_export import figure_json, write_figure_html
+from .image_export import ImageExportService
+from .plots import create_plot, required_columns
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('html', 'png', 'pdf', 'svg')
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """
+    Reads a batch manifest from a JSON or YAML file.
+
+    A manifest lists jobs, each with a `source`, a `plot_type` and an
+    `output`, and optionally `where` (a filter expression, see
+    filters.parse_filter), `filter_column`/`filter_value`, `theme`,
+    `export_format`, `animation_frame` and `config` (Config attributes to
+    override). Keys under `defaults` apply to every job, `workers` sets
+    the size of the worker pool and `export_workers` the number of image
+    renderers.
+
+    Args:
+        manifest_path (str): Path to the manifest (.json, .yaml or .yml).
+
+    Returns:
+        Dict[str, Any]: The manifest, with defaults merged into every job.
+    """
+    with open(manifest_path, 'r') as f:
+        if manifest_path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ValueError("PyYAML is required to read YAML manifests") from e
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    defaults = manifest.get('defaults', {})
+    jobs = []
+    for index, job in enumerate(manifest.get('jobs', [])):
+        job = {**defaults, **job}
+        for key in ('source', 'plot_type', 'output'):
+            if key not in job:
+                raise ValueError(f"Job {index} is missing '{key}'")
+        job.setdefault('name', f"{index}:{job['plot_type']}:{os.path.basename(job['source'])}")
+        jobs.append(job)
+    manifest['jobs'] = jobs
+    return manifest
+
+
+def job_config(job: Dict[str, Any]) -> Config:
+    """
+    Builds the Config of a job from its theme and config overrides.
+
+    Args:
+        job (Dict[str, Any]): Job from the manifest.
+
+    Returns:
+        Config: Plot settings for the job.
+    """
+    config = Config()
+    if 'theme' in job:
+        config.theme = job['theme']
+    for name, value in job.get('config', {}).items():
+        if not hasattr(Config, name):
+            raise ValueError(f"Unknown config setting: {name}")
+        setattr(config, name, value)
+    return config
+
+
+def _export(fig, job: Dict[str, Any], config: Config, defer_images: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Writes a job's figure in the format given by the job or its output extension.
+    With defer_images, images are not written but returned as an export
+    request (figure JSON, output and format) for an ImageExportService.
+    """
+    output = job['output']
+    export_format = job.get('export_format') or os.path.splitext(output)[1].lstrip('.').lower() or 'html'
+    if export_format == 'gz':
+        export_format = 'html'
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    output_dir = os.path.dirname(output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    if export_format == 'html':
+        write_figure_html(fig, output, plotlyjs=job.get('plotlyjs', config.plotlyjs_mode))
+    elif defer_images:
+        return {'figure': figure_json(fig), 'output': output, 'format': export_format}
+    else:
+        fig.write_image(output, format=export_format)
+    return None
+
+
+def _job_filter(job: Dict[str, Any]) -> Optional[Predicate]:
+    return build_filter(job.get('where'), job.get('filter_column'), job.get('filter_value'))
+
+
+def _load_source(source: str, jobs: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, Optional[Predicate]]:
+    """
+    Loads a source once with the union of the columns its jobs need.
+
+    A filter shared by every job is applied while loading and returned;
+    otherwise each job filters the loaded data.
+    """
+    columns = []
+    predicates = []
+    for job in jobs:
+        try:
+            columns += required_columns(job['plot_type'], job_config(job), animation_frame=job.get('animation_frame'))
+            predicate = _job_filter(job)
+        except ValueError:
+            # Reported when the job itself runs
+            continue
+        predicates.append(predicate)
+        if predicate is not None:
+            columns += predicate.columns()
+    shared = predicates[0] if predicates and all(p == predicates[0] for p in predicates) else None
+    return load_data(source, columns=list(dict.fromkeys(columns)), where=shared), shared
+
+
+def run_source_jobs(source: str, jobs: List[Dict[str, Any]], defer_images: bool = False) -> List[Dict[str, Any]]:
+    """
+    Runs every job reading the same source, loading the source only once.
+
+    Args:
+        source (str): Path to the data file.
+        jobs (List[Dict[str, Any]]): Jobs reading this source.
+        defer_images (bool): Leave png/pdf/svg exports to the caller; such
+            results carry the export request under 'image'.
+
+    Returns:
+        List[Dict[str, Any]]: One result per job with its name, output,
+        status ('ok' or 'failed'), error message and elapsed seconds.
+    """
+    results = []
+    start = time.perf_counter()
+    try:
+        data, shared = _load_source(source, jobs)
+    except Exception as e:
+        logger.error(f"Failed to load {source}: {e}")
+        return [
+            {'name': job['name'], 'output': job['output'], 'status': 'failed',
+             'error': f"Failed to load {source}: {e}", 'seconds': 0.0}
+            for job in jobs
+        ]
+    logger.info(f"Loaded {source} in {time.perf_counter() - start:.3f}s for {len(jobs)} jobs")
+
+    for job in jobs:
+        start = time.perf_counter()
+        result = {'name': job['name'], 'output': job['output'], 'status': 'ok', 'error': None}
+        try:
+            config = job_config(job)
+            job_data = data
+            predicate = _job_filter(job)
+            if predicate is not None and predicate != shared:
+                job_data = predicate.apply(data)
+            kwargs = {'animation_frame': job['animation_frame']} if job.get('animation_frame') else {}
+            fig = create_plot(job_data, job['plot_type'], config=config, **kwargs)
+            image = _export(fig, job, config, defer_images=defer_images)
+            if image is not None:
+                result['image'] = image
+        except Exception as e:
+            logger.error(f"Job {job['name']} failed: {e}")
+            root = e
+            while root.__cause__ is not None:
+                root = root.__cause__
+            result.update(status='failed', error=f"{e}: {root}" if root is not e else str(e))
+        result['seconds'] = time.perf_counter() - start
+        results.append(result)
+    return results
+
+
+def _finish_images(exports: List[Tuple[Dict[str, Any], Future]]):
+    """
+    Waits for deferred image exports and records their outcome on the job results.
+    The export service fails exports exceeding its timeout.
+    """
+    for result, future in exports:
+        try:
+            result['seconds'] += future.result()
+        except Exception as e:
+            result.update(status='failed', error=str(e))
+        if result['status'] != 'ok':
+            logger.error(f"Job {result['name']} failed: {result['error']}")
+
+
+def run_batch(jobs: List[Dict[str, Any]], workers: int = 1,
+              export_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Runs batch jobs, grouping them by source and spreading the groups over a process pool.
+
+    Figures exported as images are handed to an ImageExportService as soon
+    as their source group finishes, so rendering overlaps with building.
+
+    Args:
+        jobs (List[Dict[str, Any]]): Jobs from load_manifest.
+        workers (int): Number of worker processes; 1 runs everything in-process.
+        export_workers (int, optional): Processes rendering images; defaults to Config.export_workers.
+
+    Returns:
+        List[Dict[str, Any]]: Job results in manifest order, see run_source_jobs.
+    """
+    by_source: Dict[str, List[int]] = {}
+    for position, job in enumerate(jobs):
+        by_source.setdefault(job['source'], []).append(position)
+    sources = list(by_source)
+    source_jobs = [[jobs[position] for position in by_source[source]] for source in sources]
+
+    config = Config()
+    exporter = ImageExportService(
+        workers=config.export_workers if export_workers is None else export_workers,
+        timeout=config.export_timeout
+    )
+    exports: List[Tuple[Dict[str, Any], Future]] = []
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    executor = None
+    try:
+        if workers <= 1 or len(sources) <= 1:
+            grouped = (run_source_jobs(source, group, True) for source, group in zip(sources, source_jobs))
+        else:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(sources)))
+            grouped = executor.map(run_source_jobs, sources, source_jobs, [True] * len(sources))
+
+        for source, group in zip(sources, grouped):
+            for position, result in zip(by_source[source], group):
+                image = result.pop('image', None)
+                if image is not None:
+                    future = exporter.submit(image['figure'], image['output'], image['format'])
+                    exports.append((result, future))
+                results[position] = result
+        _finish_images(exports)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        exporter.close(wait=False)
+    return results
+
+
+@click.command()
+@click.argument('manifest')
+@click.option('--workers', type=int, default=None, help='Worker processes (defaults to the manifest or CPU count)')
+@click.option('--export-workers', type=int, default=None, help='Processes rendering png/pdf/svg images')
+def batch(manifest, workers, export_workers):
+    """
+    Runs many plots over many data sources in one process (`myplot batch`).
+
+    MANIFEST: Path to a JSON or YAML job manifest.
+    """
+    try:
+        spec = load_manifest(manifest)
+    except (OSError, ValueError) as e:
+        click.echo(f"Error: {e}")
+        raise click.exceptions.Exit(1)
+
+    workers = workers or spec.get('workers') or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = run_batch(spec['jobs'], workers=workers, export_workers=export_workers or spec.get('export_workers'))
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if result['status'] != 'ok']
+    for result in results:
+        line = f"{result['status'].upper():6} {result['seconds']:8.3f}s  {result['name']} -> {result['output']}"
+        if result['error']:
+            line += f"  ({result['error']})"
+        click.echo(line)
+    click.echo(f"{len(results) - len(failed)} succeeded, {len(failed)} failed in {elapsed:.3f}s")
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
+if __name__ == '__main__':
+    batch()
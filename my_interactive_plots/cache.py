@@ -0,0 +1,367 @@
+# my_interactive_plots/cache.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from .config import Config
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Directory of content-addressed files with a size cap and LRU eviction.
+
+    Entries are written atomically (temporary file + rename), and a hit
+    refreshes the entry's modification time, which serves as the LRU clock.
+    Several processes can share the same directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key: str, suffix: str) -> str:
+        """
+        Returns the path of the entry for the given key.
+
+        Args:
+            key (str): Hex digest identifying the entry.
+            suffix (str): File extension of the entry.
+
+        Returns:
+            str: Path inside the cache directory.
+        """
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def lookup(self, key: str, suffix: str) -> Optional[str]:
+        """
+        Returns the path of a cached entry and marks it as recently used.
+
+        Args:
+            key (str): Hex digest identifying the entry.
+            suffix (str): File extension of the entry.
+
+        Returns:
+            Optional[str]: Path of the entry, or None on a miss.
+        """
+        path = self.path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def write(self, key: str, suffix: str, writer) -> str:
+        """
+        Stores a new entry and evicts old ones if the cache is over its size cap.
+
+        Args:
+            key (str): Hex digest identifying the entry.
+            suffix (str): File extension of the entry.
+            writer (Callable[[str], None]): Function writing the entry to the given path.
+
+        Returns:
+            str: Path of the stored entry.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            path = self.path(key, suffix)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+        return path
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.endswith('.tmp'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def size(self) -> int:
+        """
+        Returns the total size of the cached entries in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits its size cap.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                logger.info(f"Evicted {name} from cache")
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Removes every entry from the cache.
+        """
+        for _, _, name in self._entries():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+
+class MemoryCache:
+    """
+    In-process LRU cache bounded by the total size of its values.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._sizes = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the cached value and marks it as recently used, or None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, value: Any):
+        """
+        Stores a value, evicting the least recently used values beyond the size cap.
+        Values larger than the cap are not stored.
+        """
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._total -= self._sizes.pop(key)
+                del self._entries[key]
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._total += size
+            while self._total > self.max_bytes:
+                oldest, _ = self._entries.popitem(last=False)
+                self._total -= self._sizes.pop(oldest)
+
+    def clear(self):
+        """
+        Removes every value from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total = 0
+
+
+def get_data_cache(config: Optional[Config] = None) -> DiskCache:
+    """
+    Returns the cache used for loaded data, as configured on Config.
+
+    Args:
+        config (Config, optional): Settings providing cache_dir and cache_max_bytes.
+
+    Returns:
+        DiskCache: The data cache.
+    """
+    config = config or Config()
+    return DiskCache(os.path.join(config.cache_dir, 'data'), config.cache_max_bytes)
+
+
+def get_figure_cache(config: Optional[Config] = None) -> DiskCache:
+    """
+    Returns the cache used for serialized figures, as configured on Config.
+
+    Args:
+        config (Config, optional): Settings providing cache_dir and cache_max_bytes.
+
+    Returns:
+        DiskCache: The figure cache.
+    """
+    config = config or Config()
+    return DiskCache(os.path.join(config.cache_dir, 'figures'), config.cache_max_bytes)
+
+
+def clear_cache(config: Optional[Config] = None):
+    """
+    Removes every cached data file and figure.
+
+    Args:
+        config (Config, optional): Settings providing the cache location.
+    """
+    get_data_cache(config).clear()
+    get_figure_cache(config).clear()
+    logger.info("Data and figure caches cleared")
+
+
+# Settings of caches, worker processes, exports, the daemon and tracing, which
+# never change what is loaded or built
+_RUNTIME_PREFIXES = ('cache_', 'export_', 'daemon_', 'trace_', 'build_')
+_RUNTIME_SETTINGS = {
+    'chunk_size', 'plotlyjs_mode', 'report_workers', 'memory_cache_bytes', 'statistics_cache_bytes',
+    'refresh_interval_ms', 'animation_frame_ms',
+}
+
+
+def config_fingerprint(config: Config) -> dict:
+    """
+    Returns the settings of a Config that can affect loaded data or a figure.
+
+    Args:
+        config (Config): Plot settings.
+
+    Returns:
+        dict: Setting names and values, excluding runtime settings such as
+        cache sizes, worker counts, export timeouts and tracing.
+    """
+    return {
+        name: getattr(config, name)
+        for name in dir(config)
+        if not name.startswith('_') and not name.startswith(_RUNTIME_PREFIXES)
+        and name not in _RUNTIME_SETTINGS and not callable(getattr(config, name))
+    }
+
+
+def read_text(cache: DiskCache, key: str, suffix: str) -> Optional[str]:
+    """
+    Reads a cached text entry, such as a figure's JSON.
+
+    Args:
+        cache (DiskCache): Cache holding the entry.
+        key (str): Hex digest identifying the entry.
+        suffix (str): File extension of the entry.
+
+    Returns:
+        Optional[str]: The cached text, or None on a miss.
+    """
+    path = cache.lookup(key, suffix)
+    if path is None:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_text(cache: DiskCache, key: str, suffix: str, text: str):
+    """
+    Stores a text entry.
+
+    Args:
+        cache (DiskCache): Cache receiving the entry.
+        key (str): Hex digest identifying the entry.
+        suffix (str): File extension of the entry.
+        text (str): Text to store.
+    """
+    def writer(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    cache.write(key, suffix, writer)
+
+
+def source_key(file_path: str, **params: Any) -> str:
+    """
+    Builds a cache key from a file's identity and the parameters used to load it.
+
+    Args:
+        file_path (str): Path to the data file.
+        **params: Loading parameters (columns, filters, sampling) affecting the result.
+
+    Returns:
+        str: Hex digest identifying the loaded data.
+    """
+    stat = os.stat(file_path)
+    identity = {
+        'path': os.path.abspath(file_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'params': params,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def read_frame(cache: DiskCache, key: str) -> Optional[pd.DataFrame]:
+    """
+    Reads a cached DataFrame by memory-mapping its Feather file.
+
+    Numeric and boolean columns without missing values are zero-copy,
+    read-only views of the mapped file, so their memory is the shared page
+    cache, loaded as it is read. Other columns (text, or with missing values)
+    are converted, one column at a time.
+
+    Args:
+        cache (DiskCache): Cache holding the entry.
+        key (str): Key returned by source_key.
+
+    Returns:
+        Optional[pd.DataFrame]: The cached data, or None on a miss.
+    """
+    from pyarrow import feather
+
+    path = cache.lookup(key, '.feather')
+    if path is None:
+        return None
+    try:
+        # One block per column lets pandas wrap the mapped buffers instead of
+        # copying them into a consolidated 2D block
+        return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True, self_destruct=True)
+    except FileNotFoundError:
+        # Evicted by another process between lookup and read
+        return None
+
+
+def write_frame(cache: DiskCache, key: str, data: pd.DataFrame):
+    """
+    Stores a DataFrame as an uncompressed Feather file of one record batch,
+    which read_frame can map without copying.
+
+    Args:
+        cache (DiskCache): Cache receiving the entry.
+        key (str): Key returned by source_key.
+        data (pd.DataFrame): Data to store.
+    """
+    import pyarrow as pa
+    from pyarrow import feather
+
+    table = pa.Table.from_pandas(data)
+    # Columns split over several batches would be concatenated, i.e. copied, when read
+    cache.write(key, '.feather', lambda path: feather.write_feather(
+        table, path, compression='uncompressed', chunksize=max(table.num_rows, 1)
+    ))
@@ -1,9 +1,14 @@
 import click
 import pandas as pd
-from .plots import create_plot, PlotCreationError
-from .data_loader import load_data
+from .plots import create_plot, create_binned_histogram, required_columns, PlotCreationError
+from .data_loader import load_data, load_data_from_db, histogram_from_db, histogram_from_file
+from .cache import clear_cache
+from .html_export import write_figure_html
+from .image_export import export_figures
+from .streaming import STREAMING_PLOT_TYPES, plot_file
 from .config import Config
 from .report_generator import generate_report, generate_profile_report
+from .tracing import configure_tracing, remove_sink
 
 @click.command()
 @click.argument('data_source')
@@ -14,33 +19,134 @@ from .report_generator import generate_report, generate_profile_report
 @click.option('--export-format', type=click.Choice(['html', 'png', 'pdf', 'svg']), default='html', help='Format to export the plot')
 @click.option('--filter-column', default=None, help='Name of the column to filter data')
 @click.option('--filter-value', default=None, help='Value to filter data')
+@click.option('--where', default=None,
+              help="Filter expression, e.g. \"price between 10 and 20 and (species in ('a', 'b') or ts within 7d)\"")
 @click.option('--save-report', is_flag=True, help='Save report as an HTML file')
 @click.option('--theme', default='plotly', type=click.Choice(
     ['plotly', 'plotly_white', 'plotly_dark', 'ggplot2', 'seaborn', 'simple_white']),
     help='Theme for the plots')
 @click.option('--generate-profile', is_flag=True, help='Generate a descriptive data report')
-def cli(data_source, plot_type, output, export_format, filter_column, filter_value, save_report, theme, generate_profile):
+@click.option('--sample-rows', type=int, default=None, help='Load at most this many rows, sampled uniformly')
+@click.option('--chunk-size', type=int, default=None, help='Rows per chunk when streaming the data file')
+@click.option('--no-cache', is_flag=True, help='Parse the data file without using the data cache')
+@click.option('--clear-cache', 'clear_data_cache', is_flag=True, help='Remove all cached data files before loading')
+@click.option('--db-table', default=None, help='Read this table, treating DATA_SOURCE as a database connection string')
+@click.option('--plotlyjs', default='inline', type=click.Choice(['inline', 'cdn', 'directory']),
+              help='How HTML output includes plotly.js: embedded, from the CDN, or as a shared plotly.min.js file')
+@click.option('--streaming', is_flag=True,
+              help='Aggregate the file in one chunked pass (scatter, histogram and box plots of files larger than memory)')
+@click.option('--image-dir', default=None, help='With --save-report, also export each report plot as an image here')
+@click.option('--export-timeout', type=float, default=None, help='Seconds allowed for exporting an image (the export then runs in a worker process)')
+@click.option('--optimize-dtypes', is_flag=True,
+              help='Store the loaded data in compact types (float32, categories) to save memory')
+@click.option('--backend', default='pandas', type=click.Choice(['pandas', 'pyarrow', 'polars']),
+              help='Engine loading, filtering and aggregating data files (pyarrow and polars use all cores)')
+@click.option('--trace', default=None,
+              help="Record timing spans: 'log', or the path of a JSON lines file receiving them")
+@click.option('--daemon', default=None, type=click.Choice(['auto', 'always', 'never']),
+              help='Run jobs writing files in the worker daemon (myplot-daemon): when one is running (auto), '
+                   'always or never; defaults to Config.daemon_mode')
+def cli(data_source, plot_type, output, export_format, filter_column, filter_value, where, save_report, theme, generate_profile,
+        sample_rows, chunk_size, no_cache, clear_data_cache, db_table, plotlyjs, streaming, image_dir, export_timeout,
+        optimize_dtypes, backend, trace, daemon):
     """
     Command-line interface for creating interactive plots and reports.
 
-    DATA_SOURCE: Path to the data file (CSV, Excel, JSON).
+    DATA_SOURCE: Path to the data file (CSV, Parquet), or a database
+    connection string when --db-table is given.
+
+    --daemon is handled by the `myplot` entry point (client.main) before
+    this command runs.
     """
+    trace_sink = None
     try:
-        data = load_data(data_source)
         config = Config()
         config.theme = theme
-        if filter_column and filter_value:
-            if filter_column not in data.columns:
-                raise ValueError(f"Filter column '{filter_column}' does not exist in the data.")
-            data = data[data[filter_column] == filter_value]
-        
-        if plot_type == 'animated_scatter':
-            animation_frame = 'animation_frame' 
+        config.backend = backend
+        if trace:
+            config.trace_sink = trace
+        trace_sink = configure_tracing(config)
+        if export_timeout:
+            config.export_timeout = export_timeout
+        if clear_data_cache:
+            clear_cache(config)
+        animation_frame = config.animation_column
+        # The profile report describes every column; plots only parse what they use
+        columns = None if generate_profile else required_columns(plot_type, config, animation_frame=animation_frame)
+        if streaming:
+            if db_table or save_report or generate_profile or plot_type not in STREAMING_PLOT_TYPES:
+                raise ValueError(
+                    f"--streaming only creates plots of types {', '.join(STREAMING_PLOT_TYPES)} from files"
+                )
+            data = None
+            fig = plot_file(
+                data_source, [plot_type], config,
+                chunksize=chunk_size,
+                filter_column=filter_column,
+                filter_value=filter_value or None,
+                where=where
+            )[plot_type]
+        elif db_table and plot_type == 'histogram' and not (save_report or generate_profile):
+            # Bin inside the database; only the counts are transferred
+            data = None
+            bins = histogram_from_db(
+                data_source, db_table, config.x_column,
+                bins=config.histogram_bins,
+                group_column=config.color_column,
+                filter_column=filter_column,
+                filter_value=filter_value or None,
+                where=where
+            )
+            fig = create_binned_histogram(bins, config=config)
+        elif (backend != 'pandas' and not db_table and plot_type == 'histogram'
+              and not data_source.lower().endswith(('.parquet', '.pq'))
+              and not (save_report or generate_profile or sample_rows or chunk_size)):
+            # Filter and bin inside the backend; only the counts are converted to pandas
+            data = None
+            bins = histogram_from_file(
+                data_source, config.x_column,
+                bins=config.histogram_bins,
+                group_column=config.color_column,
+                filter_column=filter_column,
+                filter_value=filter_value or None,
+                where=where,
+                backend=backend
+            )
+            fig = create_binned_histogram(bins, config=config)
+        elif db_table:
+            data = load_data_from_db(
+                data_source,
+                table=db_table,
+                columns=columns,
+                filter_column=filter_column,
+                filter_value=filter_value or None,
+                where=where,
+                chunksize=chunk_size or config.chunk_size,
+                optimize=optimize_dtypes or None
+            )
+        else:
+            data = load_data(
+                data_source,
+                columns=columns,
+                chunksize=chunk_size,
+                filter_column=filter_column,
+                filter_value=filter_value or None,
+                where=where,
+                sample_rows=sample_rows,
+                use_cache=False if no_cache else None,
+                optimize=optimize_dtypes or None,
+                backend=backend
+            )
+
+        if data is None:
+            # Already drawn from aggregates
+            pass
+        elif plot_type == 'animated_scatter':
             if animation_frame not in data.columns:
                 raise ValueError(f"Animation frame column '{animation_frame}' does not exist in the data.")
-            fig = create_plot(data, plot_type, animation_frame=animation_frame)
+            fig = create_plot(data, plot_type, animation_frame=animation_frame, config=config)
         else:
-            fig = create_plot(data, plot_type)
+            fig = create_plot(data, plot_type, config=config)
         
         if generate_profile:
             profile_file = output if output else 'profile_report.html'
@@ -49,14 +155,20 @@ def cli(data_source, plot_type, output, export_format, filter_column, filter_val
         
         if save_report:
             report_file = output if output else 'report.html'
-            generate_report(data, [plot_type], report_file)
+            report_kwargs = {'image_dir': image_dir, 'image_format': export_format} if image_dir else {}
+            generate_report(data, [plot_type], report_file, config=config, plotlyjs=plotlyjs, **report_kwargs)
             click.echo(f"Report saved to {report_file}")
         else:
             if output:
                 if export_format == 'html':
-                    fig.write_html(output)
+                    # A path ending with .gz is written gzip-compressed
+                    write_figure_html(fig, output, plotlyjs=plotlyjs)
                 elif export_format in ['png', 'pdf', 'svg']:
-                    fig.write_image(output)
+                    # A worker process is only worth its start-up cost when it enforces --export-timeout
+                    result, = export_figures([(fig, output)], workers=1 if export_timeout else 0,
+                                             timeout=config.export_timeout, warm=False, image_format=export_format)
+                    if result['status'] != 'ok':
+                        raise ValueError(f"Failed to export {output}: {result['error']}")
                 else:
                     raise ValueError("Unsupported export format.")
                 click.echo(f"Plot saved to {output}")
@@ -71,3 +183,6 @@ def cli(data_source, plot_type, output, export_format, filter_column, filter_val
         click.echo(f"Error: Data source not found - {e.filename}")
     except Exception as e:
         click.echo(f"Error: {e}")
+    finally:
+        if trace_sink is not None:
+            remove_sink(trace_sink)
@@ -0,0 +1,144 @@
+# my_interactive_plots/client.py
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional, TextIO
+
+from .config import Config
+
+# This module only imports the standard library, so that forwarding a job to
+# the worker daemon does not pay for importing pandas and plotly.
+
+# Jobs writing files; others open the figure in a browser, which only the calling process can do
+_FILE_OPTIONS = ('--output', '--save-report')
+
+
+def _given(argv: List[str], name: str) -> bool:
+    return any(arg == name or arg.startswith(name + '=') for arg in argv)
+
+
+def _option(argv: List[str], name: str) -> Optional[str]:
+    value = None
+    for index, arg in enumerate(argv):
+        if arg == name and index + 1 < len(argv):
+            value = argv[index + 1]
+        elif arg.startswith(name + '='):
+            value = arg[len(name) + 1:]
+    return value
+
+
+def send_request(request: Dict[str, Any], socket_path: Optional[str] = None,
+                 stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None) -> Optional[int]:
+    """
+    Sends a request to the worker daemon and writes the output it streams back.
+
+    Requests and replies are JSON objects, one per line. While a job runs the
+    daemon sends {'stream': 'stdout' or 'stderr', 'text': ...} messages,
+    then {'exit': code} when it is done.
+
+    Args:
+        request (Dict[str, Any]): The request, e.g. {'type': 'run', 'argv': [...], 'cwd': ...}.
+        socket_path (str, optional): Socket of the daemon; defaults to Config.daemon_socket.
+        stdout (TextIO, optional): Receives the job's output; defaults to sys.stdout.
+        stderr (TextIO, optional): Receives the job's errors; defaults to sys.stderr.
+
+    Returns:
+        Optional[int]: The exit code, or None when no daemon is listening.
+    """
+    socket_path = socket_path or Config.daemon_socket
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+    streams = {'stdout': stdout or sys.stdout, 'stderr': stderr or sys.stderr}
+    with client, client.makefile('rwb') as connection:
+        connection.write(json.dumps(request).encode('utf-8') + b'\n')
+        connection.flush()
+        for line in connection:
+            message = json.loads(line)
+            if 'exit' in message:
+                return message['exit']
+            stream = streams[message['stream']]
+            stream.write(message['text'])
+            stream.flush()
+    raise ConnectionError("The worker daemon closed the connection before the job finished")
+
+
+def run_job(argv: List[str], socket_path: Optional[str] = None, cwd: Optional[str] = None,
+            stdout: Optional[TextIO] = None, stderr: Optional[TextIO] = None) -> Optional[int]:
+    """
+    Runs a `myplot` command line in the worker daemon.
+
+    Args:
+        argv (List[str]): Arguments of `myplot`.
+        socket_path (str, optional): Socket of the daemon; defaults to Config.daemon_socket.
+        cwd (str, optional): Directory relative paths refer to; defaults to the current directory.
+        stdout (TextIO, optional): Receives the job's output; defaults to sys.stdout.
+        stderr (TextIO, optional): Receives the job's errors; defaults to sys.stderr.
+
+    Returns:
+        Optional[int]: The exit code, or None when no daemon is listening.
+    """
+    request = {'type': 'run', 'argv': list(argv), 'cwd': cwd or os.getcwd()}
+    return send_request(request, socket_path, stdout, stderr)
+
+
+def ping(socket_path: Optional[str] = None) -> bool:
+    """
+    Tells whether a worker daemon is listening on the socket.
+    """
+    try:
+        return send_request({'type': 'ping'}, socket_path) is not None
+    except (OSError, ValueError):
+        return False
+
+
+def stop_daemon(socket_path: Optional[str] = None) -> bool:
+    """
+    Asks the worker daemon to exit once the current job is done.
+
+    Returns:
+        bool: Whether a daemon was listening.
+    """
+    return send_request({'type': 'shutdown'}, socket_path) is not None
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Entry point of `myplot`.
+
+    `myplot batch MANIFEST` runs a job manifest (see batch.batch).
+    Jobs writing files are forwarded to the worker daemon (see server.daemon)
+    when one listens on Config.daemon_socket, and run in this process
+    otherwise. `--daemon always` fails without a daemon, `--daemon never`
+    always runs in this process.
+
+    Args:
+        argv (List[str], optional): Arguments; defaults to sys.argv[1:].
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ['batch']:
+        from .batch import batch
+
+        batch.main(args=argv[1:], prog_name='myplot batch')
+        return
+    mode = _option(argv, '--daemon') or Config.daemon_mode
+    if mode != 'never' and any(_given(argv, name) for name in _FILE_OPTIONS):
+        try:
+            code = run_job(argv)
+        except (ConnectionError, ValueError) as e:
+            sys.stderr.write(f"Error: {e}\n")
+            sys.exit(1)
+        if code is not None:
+            sys.exit(code)
+        if mode == 'always':
+            sys.stderr.write(f"Error: no worker daemon is listening on {Config.daemon_socket}\n")
+            sys.exit(1)
+
+    from .cli import cli
+
+    cli.main(args=argv, prog_name='myplot')
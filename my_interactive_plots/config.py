@@ -1,6 +1,7 @@
 # my_interactive_plots/config.py
 
 import json
+import os
 
 class Config:
     """
@@ -16,6 +17,62 @@ class Config:
     title: str = 'Sepal Width vs Sepal Length'
     theme: str = 'plotly_dark'            # Example theme
     marker_size: int = 10                 # Example customization
+    validate_figures: bool = True         # False skips Plotly's validation of figures built from precomputed traces
+    max_points: int = 50000               # Point budget for scatter/line plots (0 disables downsampling)
+    scatter_downsample_method: str = 'stratified'  # Per-color sampling that preserves density
+    line_downsample_method: str = 'lttb'  # 'lttb', or 'minmax' for spiky time series
+    render_mode: str = 'auto'             # 'auto', 'svg' or 'webgl' for 2D scatter-style traces
+    webgl_threshold: int = 20000          # Points above which 'auto' switches to WebGL
+    histogram_bins: int = 50              # Bins of histograms computed outside Plotly
+    aggregate_mode: str = 'auto'          # 'auto', 'always' or 'never': precompute histogram/box statistics
+    aggregate_threshold: int = 100000     # Rows above which 'auto' precomputes histogram/box statistics
+    box_max_outliers: int = 1000          # Outliers kept per box when statistics are precomputed
+    box_max_groups: int = 10000           # Boxes a streamed box plot may hold; more distinct groups fail the plot
+    raster_mode: str = 'auto'             # 'auto', 'always' or 'never': draw scatter plots and maps as pixel grids
+    raster_threshold: int = 1000000       # Rows above which 'auto' rasterizes
+    raster_width: int = 600               # Pixels along x of rasterized plots
+    raster_height: int = 400              # Pixels along y of rasterized plots
+    raster_aggregate: str = 'count'       # 'count' points per pixel, or 'mean' of raster_value_column
+    raster_value_column = None            # Column averaged per pixel when raster_aggregate is 'mean'
+    raster_x_range = None                 # Visible (min, max) x extent to rasterize; None for the data's extent
+    raster_y_range = None                 # Visible (min, max) y extent to rasterize
+    combined_y_columns = None             # Columns overlaid by combined plots; None for [y_column]
+    combined_statistics = ('mean',)       # Lines of combined plots: 'mean', 'median', 'quantile' (band), 'ewm', 'resample'
+    combined_by_color: bool = False       # Compute the lines of combined plots per color_column group
+    rolling_window = 5                    # Rows per rolling window, or an offset such as '1h' when x holds timestamps
+    rolling_quantiles = (0.1, 0.9)        # Lower and upper edges of the rolling 'quantile' band
+    ewm_span: float = 20.0                # Span of the exponentially weighted mean ('ewm')
+    resample_rule = None                  # Width of 'resample' intervals ('1D' or a number); None for histogram_bins intervals
+    statistics_cache_bytes: int = 256 * 1024 ** 2  # Per-process cache of combined plot statistics, reused when only styling changes
+    animation_mode: str = 'auto'          # 'auto', 'always' or 'never': compact animations holding only each frame's x/y
+    animation_threshold: int = 100000     # Rows above which 'auto' builds compact animations
+    animation_max_frames: int = 200       # Frames of compact animations; more frame values are binned together
+    animation_max_points: int = 5000      # Points kept per frame of compact animations (0 keeps all)
+    animation_column: str = 'animation_frame'  # Column animated over when create_plot is given none
+    chunk_size: int = 500000              # Rows per chunk when streaming CSV files
+    backend: str = 'pandas'               # Engine loading, filtering and aggregating files: 'pandas', 'pyarrow' or 'polars'
+    optimize_dtypes: bool = False         # Store loaded data in compact types (see dtypes.optimize_dtypes)
+    category_max_ratio: float = 0.5       # Text columns with at most this share of distinct values become categories
+    downcast_floats: bool = True          # Store floats as float32 when optimizing dtypes
+    arrow_strings: bool = False           # Store other text as Arrow-backed strings when optimizing dtypes (requires pyarrow)
+    cache_enabled: bool = True            # Cache parsed data files as Feather (requires pyarrow)
+    cache_dir: str = os.path.join(os.path.expanduser('~'), '.cache', 'my_interactive_plots')
+    cache_max_bytes: int = 4 * 1024 ** 3  # Size cap of the data cache, least recently used files go first
+    cache_min_bytes: int = 10 * 1024 ** 2 # Smaller files are parsed directly
+    plotlyjs_mode: str = 'inline'         # plotly.js in HTML output: 'inline', 'cdn' or 'directory'
+    report_workers: int = 1               # Processes building report plots in parallel
+    memory_cache_bytes: int = 512 * 1024 ** 2  # Per-process cache of frames and figures in the web app
+    refresh_interval_ms: int = 5000       # Period of the web app's live refresh of appended rows
+    animation_frame_ms: int = 500         # Period of the frames played by the web app
+    build_workers: int = 2                # Processes loading data and building figures for the web app (0 builds in the request)
+    build_poll_ms: int = 250              # Period of the web app's checks on figures being built
+    export_workers: int = 2               # Processes with warm renderers exporting png/pdf/svg images
+    export_timeout: float = 120.0         # Seconds allowed per image export
+    daemon_mode: str = 'auto'             # 'auto', 'always' or 'never': run CLI jobs writing files in the worker daemon
+    daemon_socket: str = os.path.join(cache_dir, 'daemon.sock')  # Unix socket the worker daemon listens on
+    daemon_frame_cache_bytes: int = 1024 ** 3  # Loaded data the daemon keeps in memory for later jobs (0 disables)
+    daemon_warm_kaleido: bool = True      # Start the daemon's image renderer before the first job
+    trace_sink = None                     # Timing spans: None (off), 'log', or the path of a JSON lines file
 
     def save_to_file(self, file_path: str):
         """
@@ -1,29 +1,698 @@
+import io
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
-import sqlalchemy
 from pandas.errors import DataError
+from . import cache
+from .backends import Backend, get_backend
+from .config import Config
+from .dtypes import optimize_dtypes, parse_dtypes
 from .exceptions import PlotCreationError
+from .filters import Predicate, build_filter
+from .tracing import frame_shape, traced
+from .utils import setup_logging
 
-def load_data(file_path: str) -> pd.DataFrame:
+setup_logging()
+logger = logging.getLogger(__name__)
+
+def is_parquet(file_path: str) -> bool:
+    """
+    Tells whether a path names a Parquet file (.parquet, .pq) rather than a CSV file.
+    """
+    return file_path.lower().endswith(('.parquet', '.pq'))
+
+def read_header(file_path: str) -> pd.Index:
+    """
+    Reads the column names of a CSV or Parquet file without parsing any rows.
+    """
+    try:
+        if is_parquet(file_path):
+            import pyarrow.parquet as pq
+
+            return pd.Index(pq.read_schema(file_path).names)
+        return pd.read_csv(file_path, nrows=0).columns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data source not found: {file_path}")
+    except Exception as e:
+        raise PlotCreationError(f"An error occurred while loading data: {e}") from e
+
+def project_columns(header: pd.Index, columns: Optional[List[str]],
+                    predicate: Optional[Predicate] = None) -> Optional[List[str]]:
+    """
+    Resolves the columns to parse, in file order, including the columns a
+    filter reads.
+
+    Requested columns missing from the file are skipped, so that the plot
+    builders can report them with a meaningful error.
+    """
+    if columns is None:
+        return None
+    wanted = set(columns)
+    if predicate is not None:
+        wanted.update(predicate.columns())
+    return [col for col in header if col in wanted]
+
+def compile_filter(header: pd.Index, where, filter_column: Optional[str],
+                   filter_value: Any) -> Optional[Predicate]:
+    """
+    Compiles the filter of a load and checks that the columns it reads exist.
+    """
+    predicate = build_filter(where, filter_column, filter_value)
+    if predicate is not None:
+        for col in predicate.columns():
+            if col not in header:
+                raise ValueError(f"Filter column '{col}' does not exist in the data.")
+    return predicate
+
+def _sample_chunks(chunks: Iterator[pd.DataFrame], sample_rows: int, seed: int) -> pd.DataFrame:
+    """
+    Keeps a uniform random sample of at most `sample_rows` rows across all chunks.
+
+    Every row gets a random key and the rows with the smallest keys are kept,
+    so only `sample_rows` rows plus one chunk are held in memory at a time.
+    """
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    keys = np.empty(0)
+    for chunk in chunks:
+        chunk_keys = rng.random(len(chunk))
+        reservoir = chunk if reservoir is None else pd.concat([reservoir, chunk])
+        keys = np.concatenate((keys, chunk_keys))
+        if len(reservoir) > sample_rows:
+            keep = np.argpartition(keys, sample_rows)[:sample_rows]
+            reservoir, keys = reservoir.iloc[keep], keys[keep]
+    if reservoir is None:
+        return pd.DataFrame()
+    return reservoir.sort_index()
+
+def _use_cache(file_path: str, use_cache: Optional[bool], config: Config) -> bool:
+    """
+    Decides whether a load goes through the data cache.
+    """
+    if use_cache is None:
+        use_cache = config.cache_enabled and os.path.getsize(file_path) >= config.cache_min_bytes
+    if not use_cache:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.debug("pyarrow is not installed, data cache disabled")
+        return False
+    return True
+
+# Rows read to choose compact column types before parsing a whole file
+_DTYPE_SAMPLE_ROWS = 10000
+
+def _dtype_settings(config: Config) -> tuple:
+    return config.category_max_ratio, config.downcast_floats, config.arrow_strings
+
+def _sniff_dtypes(file_path: str, usecols: Optional[List[str]], config: Config, chunked: bool) -> Dict[str, str]:
+    """
+    Chooses the types columns are parsed as from the first rows of a file.
+    """
+    dtype = parse_dtypes(pd.read_csv(file_path, usecols=usecols, nrows=_DTYPE_SAMPLE_ROWS), config)
+    if chunked:
+        # Each chunk would get categories of its own; they are found after concatenating
+        dtype = {name: kind for name, kind in dtype.items() if kind != 'category'}
+    return dtype
+
+def _read_csv(file_path: str, dtype: Optional[Dict[str, str]] = None,
+              predicate: Optional[Predicate] = None, **kwargs):
+    """
+    Reads a CSV file with the given column types, falling back to inferred
+    types when a row does not fit them, e.g. text after numeric first rows.
+    Chunks are filtered as soon as they are parsed.
+    """
+    if kwargs.get('chunksize'):
+        return _read_chunks(file_path, dtype, predicate, **kwargs)
+    if not dtype:
+        return pd.read_csv(file_path, **kwargs)
+    try:
+        return pd.read_csv(file_path, dtype=dtype, **kwargs)
+    except ValueError as e:
+        logger.info(f"Parsing {file_path} with inferred column types: {e}")
+        return pd.read_csv(file_path, **kwargs)
+
+def _read_chunks(file_path: str, dtype: Optional[Dict[str, str]], predicate: Optional[Predicate],
+                 **kwargs) -> Iterator[pd.DataFrame]:
+    chunks = pd.read_csv(file_path, **kwargs)
+    for chunk in chunks:
+        if predicate is not None:
+            # Filtered before conversion, so that only kept rows are converted
+            chunk = predicate.apply(chunk)
+        if not dtype:
+            yield chunk
+            continue
+        try:
+            yield chunk.astype(dtype)
+        except ValueError:
+            yield chunk
+
+def _scan_parquet(file_path: str, columns: Optional[List[str]], predicate: Optional[Predicate],
+                  batch_size: Optional[int] = None) -> 'pyarrow.dataset.Scanner':
+    """
+    Scans the given columns of a Parquet file, keeping the rows matching a
+    filter. Row groups whose statistics rule out any match are not read.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(file_path, format='parquet')
+    expression = predicate.to_arrow(dataset.schema) if predicate is not None else None
+    options = {'batch_size': batch_size} if batch_size else {}
+    return dataset.scanner(columns=columns, filter=expression, **options)
+
+def iter_parquet(file_path: str, columns: Optional[List[str]] = None, predicate: Optional[Predicate] = None,
+                 chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Reads the matching rows of a Parquet file chunk by chunk.
+
+    Args:
+        file_path (str): Path to the Parquet file.
+        columns (List[str], optional): Columns to read; all columns when None.
+        predicate (Predicate, optional): Filter pushed down into the scan.
+        chunksize (int, optional): Maximum rows per chunk.
+
+    Yields:
+        pd.DataFrame: The chunks.
+    """
+    for batch in _scan_parquet(file_path, columns, predicate, chunksize).to_batches():
+        yield batch.to_pandas()
+
+def iter_csv(file_path: str, columns: Optional[List[str]] = None, predicate: Optional[Predicate] = None,
+             chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Reads the matching rows of a CSV file chunk by chunk.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        columns (List[str], optional): Columns to read; all columns when None.
+        predicate (Predicate, optional): Filter applied to each chunk as it is parsed.
+        chunksize (int, optional): Rows parsed per chunk; defaults to Config.chunk_size.
+
+    Yields:
+        pd.DataFrame: The chunks.
+    """
+    yield from _read_csv(file_path, usecols=columns, predicate=predicate, chunksize=chunksize or Config().chunk_size)
+
+# Loaded frames kept in memory by long-lived processes, see enable_frame_cache
+_FRAMES: Optional[cache.MemoryCache] = None
+
+def enable_frame_cache(max_bytes: int):
+    """
+    Keeps the frames returned by load_data in memory, keyed like the data
+    cache by the file's identity and the loading parameters, so that loading
+    an unchanged file again returns the same frame without parsing. Callers
+    must not modify the frames they get. Used by the worker daemon.
+
+    Args:
+        max_bytes (int): Size cap of the cached frames; 0 disables the cache.
+    """
+    global _FRAMES
+    _FRAMES = cache.MemoryCache(max_bytes, sizeof=lambda frame: int(frame.memory_usage(deep=True).sum())) \
+        if max_bytes else None
+
+def _engine(backend) -> Backend:
+    return backend if isinstance(backend, Backend) else get_backend(backend)
+
+def load_table(file_path: str, columns: Optional[List[str]] = None, filter_column: Optional[str] = None,
+               filter_value: Any = None, backend=None, where=None) -> Any:
+    """
+    Loads the projected and filtered rows of a CSV file into a table of an
+    execution backend, without converting them to pandas.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        columns (List[str], optional): Columns to keep; all columns when None.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        backend (str or Backend, optional): Execution backend; defaults to Config.backend.
+        where (str or Predicate, optional): Filter expression, see filters.parse_filter.
+
+    Returns:
+        The backend's table.
+    """
+    engine = _engine(backend)
+    header = read_header(file_path)
+    predicate = compile_filter(header, where, filter_column, filter_value)
+    usecols = project_columns(header, columns, predicate)
+    try:
+        table = engine.read_csv(file_path, usecols)
+        if predicate is not None:
+            table = engine.filter(table, predicate)
+        return table
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data source not found: {file_path}")
+    except Exception as e:
+        raise PlotCreationError(f"An error occurred while loading data: {e}") from e
+
+@traced(result=frame_shape)
+def load_data(file_path: str, columns: Optional[List[str]] = None, chunksize: Optional[int] = None,
+              filter_column: Optional[str] = None, filter_value: Any = None,
+              sample_rows: Optional[int] = None, seed: int = 0,
+              use_cache: Optional[bool] = None, optimize: Optional[bool] = None,
+              backend=None, where=None) -> pd.DataFrame:
+    """
+    Loads data from a CSV or Parquet file.
+
+    When a filter or sampling is requested the file is streamed in chunks, and
+    each chunk is filtered and sampled before the next one is parsed, so peak
+    memory is bounded by the chunk size and the size of the result. Parquet
+    files are scanned with the filter pushed down, skipping the row groups
+    whose statistics rule out any match.
+
+    With an execution backend other than pandas (see Config.backend), the
+    file is parsed, filtered and projected by that engine and converted to
+    pandas at the end, unless rows are sampled or chunks are requested.
+
+    Parsed results of large files are stored in an on-disk Feather cache keyed
+    by the file's path, modification time and size and by the loading
+    parameters, and later loads memory-map the cached file instead of parsing.
+
+    Args:
+        file_path (str): Path to the CSV file, or a Parquet file (.parquet, .pq).
+        columns (List[str], optional): Columns to parse; all columns when None.
+        chunksize (int, optional): Rows per chunk; defaults to Config.chunk_size
+            when filtering or sampling.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        sample_rows (int, optional): Maximum number of rows to keep, sampled uniformly.
+        seed (int): Seed for the random sample.
+        use_cache (bool, optional): Whether to use the data cache; by default
+            files of at least Config.cache_min_bytes are cached when enabled.
+            False also bypasses the in-memory frame cache (see enable_frame_cache).
+        optimize (bool, optional): Store the data in compact types, see
+            dtypes.optimize_dtypes; defaults to Config.optimize_dtypes.
+        backend (str or Backend, optional): Execution backend; defaults to Config.backend.
+        where (str or Predicate, optional): Filter expression, see
+            filters.parse_filter; combined with the equality filter.
+
+    Returns:
+        pd.DataFrame: Loaded data.
+    """
+    header = read_header(file_path)
+    predicate = compile_filter(header, where, filter_column, filter_value)
+    usecols = project_columns(header, columns, predicate)
+    config = Config()
+    if optimize is None:
+        optimize = config.optimize_dtypes
+    engine = _engine(backend)
+    parquet = is_parquet(file_path)
+    use_engine = engine.name != 'pandas' and not chunksize and not sample_rows and not parquet
     try:
-        data = pd.read_csv(file_path)
+        data_cache = key = None
+        frames = _FRAMES if use_cache is not False else None
+        on_disk = _use_cache(file_path, use_cache, config)
+        if on_disk or frames is not None:
+            key = cache.source_key(
+                file_path,
+                columns=usecols,
+                filter=str(predicate) if predicate is not None else None,
+                sample_rows=sample_rows,
+                seed=seed if sample_rows else None,
+                **({'dtypes': _dtype_settings(config)} if optimize else {}),
+                # Engines infer column types of their own, e.g. timestamps
+                **({'backend': engine.name} if use_engine else {})
+            )
+        if frames is not None:
+            data = frames.get(key)
+            if data is not None:
+                logger.info(f"Loaded {len(data)} rows from memory for {file_path}")
+                return data
+        if on_disk:
+            data_cache = cache.get_data_cache(config)
+            data = cache.read_frame(data_cache, key)
+            if data is not None:
+                logger.info(f"Loaded {len(data)} rows from cache for {file_path}")
+                if frames is not None:
+                    frames.put(key, data)
+                return data
+
+        if chunksize is None and (predicate is not None or sample_rows) and not use_engine and not parquet:
+            chunksize = config.chunk_size
+        sniff = optimize and not use_engine and not parquet
+        dtype = _sniff_dtypes(file_path, usecols, config, chunked=bool(chunksize)) if sniff else None
+        if use_engine:
+            data = engine.to_pandas(load_table(file_path, columns, backend=engine, where=predicate))
+            logger.info(f"Loaded {len(data)} rows from {file_path} with the {engine.name} backend")
+        elif parquet and not sample_rows:
+            data = _scan_parquet(file_path, usecols, predicate, chunksize).to_table().to_pandas()
+            logger.info(f"Loaded {len(data)} rows from {file_path}")
+        elif not chunksize and not parquet:
+            data = _read_csv(file_path, usecols=usecols, dtype=dtype)
+        else:
+            if parquet:
+                chunks = iter_parquet(file_path, usecols, predicate, chunksize)
+            else:
+                chunks = _read_csv(file_path, usecols=usecols, dtype=dtype, predicate=predicate, chunksize=chunksize)
+            if sample_rows:
+                data = _sample_chunks(chunks, sample_rows, seed)
+            else:
+                data = pd.concat(list(chunks))
+            logger.info(f"Loaded {len(data)} rows from {file_path} in chunks of {chunksize or 'row groups'}")
+        if optimize:
+            data = optimize_dtypes(data, config)
+
+        if data_cache is not None:
+            try:
+                cache.write_frame(data_cache, key, data)
+            except OSError as e:
+                logger.warning(f"Failed to cache {file_path}: {e}")
+        if frames is not None:
+            frames.put(key, data)
         return data
     except FileNotFoundError:
         raise FileNotFoundError(f"Data source not found: {file_path}")
+    except PlotCreationError:
+        raise
     except DataError:
         raise PlotCreationError(f"Error parsing the data file: {file_path}")
     except Exception as e:
         raise PlotCreationError(f"An error occurred while loading data: {e}") from e
 
-def load_data_from_db(connection_string: str, query: str) -> pd.DataFrame:
+def load_data_tail(file_path: str, offset: int = 0,
+                   columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Parses the rows appended to a CSV file since a byte offset.
+
+    Only complete lines are parsed; a partially written last line is left
+    for the next call. Reading stops at the size of the file when the call
+    started, so the cost depends on the new data only.
+
+    Args:
+        file_path (str): Path to the CSV file, written append-only.
+        offset (int): Byte offset returned by the previous call, or 0 to
+            parse every row after the header.
+        columns (List[str], optional): Columns to parse; all columns when None.
+
+    Returns:
+        Tuple[pd.DataFrame, int]: The new rows and the offset to resume from.
+    """
+    header = read_header(file_path)
+    usecols = project_columns(header, columns)
+    try:
+        with open(file_path, 'rb') as f:
+            if offset == 0:
+                f.readline()
+                offset = f.tell()
+            size = os.fstat(f.fileno()).st_size
+            f.seek(offset)
+            tail = f.read(max(size - offset, 0))
+        end = tail.rfind(b'\n') + 1
+        if not end:
+            return pd.DataFrame(columns=usecols if usecols is not None else header), offset
+        data = pd.read_csv(io.BytesIO(tail[:end]), header=None, names=list(header), usecols=usecols)
+        logger.info(f"Loaded {len(data)} new rows from {file_path}")
+        return data, offset + end
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data source not found: {file_path}")
+    except Exception as e:
+        raise PlotCreationError(f"An error occurred while loading data: {e}") from e
+
+# sqlalchemy is imported by the functions that use it, keeping `import` of this module light
+_ENGINES: Dict[str, 'sqlalchemy.engine.Engine'] = {}
+_ENGINES_LOCK = threading.Lock()
+
+def get_engine(connection_string: str) -> 'sqlalchemy.engine.Engine':
+    """
+    Returns a pooled SQLAlchemy engine for the connection string.
+
+    Engines are created once per connection string and reused, so repeated
+    loads share the engine's connection pool.
+
+    Args:
+        connection_string (str): Database connection string.
+
+    Returns:
+        sqlalchemy.engine.Engine: The shared engine.
+    """
+    import sqlalchemy
+
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(connection_string)
+        if engine is None:
+            engine = sqlalchemy.create_engine(connection_string, pool_pre_ping=True)
+            _ENGINES[connection_string] = engine
+        return engine
+
+def dispose_engines():
+    """
+    Closes every pooled engine and its connections.
+    """
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+def _table(name: str, columns: Sequence[str]) -> 'sqlalchemy.TableClause':
+    """
+    Describes a table by name and columns without reflecting it from the database.
+    """
+    import sqlalchemy
+
+    return sqlalchemy.table(name, *[sqlalchemy.column(col) for col in dict.fromkeys(columns)])
+
+def _where(statement, table: 'sqlalchemy.TableClause', predicate: Optional[Predicate]):
+    """
+    Adds the filter to a statement as a WHERE clause when one is given.
+    """
+    if predicate is not None:
+        statement = statement.where(predicate.to_sql(table))
+    return statement
+
+def _filter_columns(predicate: Optional[Predicate]) -> List[str]:
+    return predicate.columns() if predicate is not None else []
+
+def _read_sql(statement, connection_string: str, chunksize: Optional[int]) -> pd.DataFrame:
+    """
+    Runs a statement and fetches the result, in chunks when a chunk size is given.
+    """
+    engine = get_engine(connection_string)
+    with engine.connect() as connection:
+        if not chunksize:
+            return pd.read_sql_query(statement, connection)
+        connection = connection.execution_options(stream_results=True)
+        chunks = list(pd.read_sql_query(statement, connection, chunksize=chunksize))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+@traced(result=frame_shape)
+def load_data_from_db(connection_string: str, query: Optional[str] = None, table: Optional[str] = None,
+                      columns: Optional[List[str]] = None, filter_column: Optional[str] = None,
+                      filter_value: Any = None, chunksize: Optional[int] = None,
+                      optimize: Optional[bool] = None, where=None) -> pd.DataFrame:
     """
     Loads data from a database using SQL query.
 
+    Instead of a query, a table can be given together with the columns the
+    plot needs and a filter; these are compiled into the SELECT statement so
+    that only matching rows and columns leave the database.
+
     Args:
         connection_string (str): Database connection string.
-        query (str): SQL query to execute.
+        query (str, optional): SQL query to execute.
+        table (str, optional): Table to select from when no query is given.
+        columns (List[str], optional): Columns to select from the table; all when None.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        chunksize (int, optional): Rows fetched per round trip.
+        optimize (bool, optional): Store the data in compact types, see
+            dtypes.optimize_dtypes; defaults to Config.optimize_dtypes.
+        where (str or Predicate, optional): Filter expression compiled into
+            the WHERE clause, see filters.parse_filter.
 
     Returns:
         pd.DataFrame: Loaded data.
     """
-    engine = sqlalchemy.create_engine(connection_string)
-    return pd.read_sql_query(query, engine)
+    import sqlalchemy
+
+    config = Config()
+    if optimize is None:
+        optimize = config.optimize_dtypes
+    if query is not None:
+        data = _read_sql(sqlalchemy.text(query), connection_string, chunksize)
+        return optimize_dtypes(data, config) if optimize else data
+    if table is None:
+        raise ValueError("Either a query or a table is required.")
+
+    predicate = build_filter(where, filter_column, filter_value)
+    if columns:
+        source = _table(table, list(columns) + _filter_columns(predicate))
+        statement = sqlalchemy.select(*[source.c[col] for col in dict.fromkeys(columns)])
+    else:
+        source = _table(table, _filter_columns(predicate))
+        statement = sqlalchemy.select(sqlalchemy.text('*')).select_from(source)
+    statement = _where(statement, source, predicate)
+    logger.info(f"Loading data from table {table}")
+    data = _read_sql(statement, connection_string, chunksize)
+    return optimize_dtypes(data, config) if optimize else data
+
+def _bin_index(value, low: float, width: float, bins: int, dialect: str):
+    """
+    SQL expression of the equal-width bin holding each value, labelled 'bin'.
+    """
+    import sqlalchemy
+
+    scaled = (value - sqlalchemy.literal(low)) / sqlalchemy.literal(width)
+    # CAST rounds to the nearest integer on most servers; SQLite truncates,
+    # which floors the non-negative offsets and works without math functions
+    if dialect != 'sqlite':
+        scaled = sqlalchemy.func.floor(scaled)
+    raw_bin = sqlalchemy.cast(scaled, sqlalchemy.Integer)
+    # The maximum lands exactly on the upper edge and belongs to the last bin
+    return sqlalchemy.case((raw_bin >= bins, bins - 1), else_=raw_bin).label('bin')
+
+@traced(result=frame_shape)
+def histogram_from_db(connection_string: str, table: str, column: str, bins: int = 50,
+                      group_column: Optional[str] = None, filter_column: Optional[str] = None,
+                      filter_value: Any = None, where=None) -> pd.DataFrame:
+    """
+    Computes histogram bin counts inside the database.
+
+    The column's range is queried first, then rows are assigned to equal-width
+    bins and counted with a GROUP BY, so only one row per bin (and group) is
+    transferred.
+
+    Args:
+        connection_string (str): Database connection string.
+        table (str): Table holding the data.
+        column (str): Numeric column to bin.
+        bins (int): Number of equal-width bins.
+        group_column (str, optional): Column whose values get separate counts.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        where (str or Predicate, optional): Filter expression, see filters.parse_filter.
+
+    Returns:
+        pd.DataFrame: Columns group_column (if given), 'bin_start', 'bin_end' and 'count'.
+    """
+    import sqlalchemy
+
+    predicate = build_filter(where, filter_column, filter_value)
+    source = _table(table, [c for c in (column, group_column) if c] + _filter_columns(predicate))
+    value = source.c[column]
+    bounds = _where(
+        sqlalchemy.select(sqlalchemy.func.min(value), sqlalchemy.func.max(value)).where(value.isnot(None)),
+        source, predicate
+    )
+    engine = get_engine(connection_string)
+    with engine.connect() as connection:
+        low, high = connection.execute(bounds).one()
+    group_names = [group_column] if group_column else []
+    if low is None:
+        return pd.DataFrame(columns=group_names + ['bin_start', 'bin_end', 'count'])
+
+    low, high = float(low), float(high)
+    width = (high - low) / bins if high > low else 1.0
+    bin_index = _bin_index(value, low, width, bins, engine.dialect.name)
+    keys = [source.c[group_column]] if group_column else []
+    statement = _where(
+        sqlalchemy.select(*keys, bin_index, sqlalchemy.func.count().label('count')).where(value.isnot(None)),
+        source, predicate
+    ).group_by(*keys, bin_index).order_by(*keys, bin_index)
+    counts = _read_sql(statement, connection_string, None)
+
+    counts['bin_start'] = low + counts.pop('bin') * width
+    counts['bin_end'] = counts['bin_start'] + width
+    logger.info(f"Computed {len(counts)} histogram bins for {table}.{column} in the database")
+    return counts[group_names + ['bin_start', 'bin_end', 'count']]
+
+@traced(result=frame_shape)
+def aggregate_from_db(connection_string: str, table: str, group_columns: List[str], value_column: str,
+                      aggregates: Sequence[str] = ('count', 'mean', 'min', 'max'),
+                      filter_column: Optional[str] = None, filter_value: Any = None,
+                      where=None) -> pd.DataFrame:
+    """
+    Computes per-group aggregates of a column inside the database.
+
+    Args:
+        connection_string (str): Database connection string.
+        table (str): Table holding the data.
+        group_columns (List[str]): Columns to group by.
+        value_column (str): Column to aggregate.
+        aggregates (Sequence[str]): Any of 'count', 'sum', 'mean', 'min' and 'max'.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        where (str or Predicate, optional): Filter expression, see filters.parse_filter.
+
+    Returns:
+        pd.DataFrame: One row per group with one column per aggregate.
+    """
+    import sqlalchemy
+
+    functions = {
+        'count': sqlalchemy.func.count,
+        'sum': sqlalchemy.func.sum,
+        'mean': sqlalchemy.func.avg,
+        'min': sqlalchemy.func.min,
+        'max': sqlalchemy.func.max,
+    }
+    unknown = [name for name in aggregates if name not in functions]
+    if unknown:
+        raise ValueError(f"Unsupported aggregates: {', '.join(unknown)}")
+
+    predicate = build_filter(where, filter_column, filter_value)
+    source = _table(table, list(group_columns) + [value_column] + _filter_columns(predicate))
+    keys = [source.c[col] for col in group_columns]
+    value = source.c[value_column]
+    statement = _where(
+        sqlalchemy.select(*keys, *[functions[name](value).label(name) for name in aggregates]),
+        source, predicate
+    ).group_by(*keys).order_by(*keys)
+    return _read_sql(statement, connection_string, None)
+
+@traced(result=frame_shape)
+def histogram_from_file(file_path: str, column: str, bins: int = 50, group_column: Optional[str] = None,
+                        filter_column: Optional[str] = None, filter_value: Any = None,
+                        backend=None, where=None) -> pd.DataFrame:
+    """
+    Computes histogram bin counts of a CSV file inside an execution backend,
+    so that only the counts are converted to pandas.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        column (str): Numeric column to bin.
+        bins (int): Number of equal-width bins.
+        group_column (str, optional): Column whose values get separate counts.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        backend (str or Backend, optional): Execution backend; defaults to Config.backend.
+        where (str or Predicate, optional): Filter expression, see filters.parse_filter.
+
+    Returns:
+        pd.DataFrame: Columns group_column (if given), 'bin_start', 'bin_end' and 'count'.
+    """
+    engine = _engine(backend)
+    columns = [col for col in (column, group_column) if col]
+    table = load_table(file_path, columns, filter_column, filter_value, engine, where)
+    if group_column and group_column not in engine.column_names(table):
+        group_column = None
+    return engine.histogram(table, column, bins=bins, group_column=group_column)
+
+@traced(result=frame_shape)
+def aggregate_from_file(file_path: str, group_columns: List[str], value_column: str,
+                        aggregates: Sequence[str] = ('count', 'mean', 'min', 'max'),
+                        filter_column: Optional[str] = None, filter_value: Any = None,
+                        backend=None, where=None) -> pd.DataFrame:
+    """
+    Computes per-group aggregates of a column of a CSV file inside an execution backend.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        group_columns (List[str]): Columns to group by.
+        value_column (str): Column to aggregate.
+        aggregates (Sequence[str]): Any of 'count', 'sum', 'mean', 'min' and 'max'.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        backend (str or Backend, optional): Execution backend; defaults to Config.backend.
+        where (str or Predicate, optional): Filter expression, see filters.parse_filter.
+
+    Returns:
+        pd.DataFrame: One row per group with one column per aggregate.
+    """
+    engine = _engine(backend)
+    table = load_table(file_path, list(group_columns) + [value_column], filter_column, filter_value, engine, where)
+    return engine.aggregate(table, list(group_columns), value_column, aggregates)
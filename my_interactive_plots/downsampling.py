@@ -0,0 +1,285 @@
+# my_interactive_plots/downsampling.py
+
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Signature shared by every downsampler: (data, x, y, max_points, group_column)
+# -> positional indices of the rows to keep, in plotting order.
+Downsampler = Callable[[pd.DataFrame, str, str, int, Optional[str]], np.ndarray]
+
+_DOWNSAMPLERS: Dict[str, Downsampler] = {}
+
+
+def register_downsampler(name: str, func: Downsampler):
+    """
+    Registers a downsampling method under the given name.
+
+    Args:
+        name (str): Name used to select the method from Config.
+        func (Downsampler): Function returning the positional indices to keep.
+    """
+    _DOWNSAMPLERS[name] = func
+
+
+def get_downsampler(name: str) -> Downsampler:
+    """
+    Returns the downsampler registered under the given name.
+
+    Args:
+        name (str): Name of the downsampling method.
+
+    Returns:
+        Downsampler: The registered function.
+    """
+    try:
+        return _DOWNSAMPLERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown downsampling method: {name}") from None
+
+
+def _numeric(values: pd.Series) -> np.ndarray:
+    """
+    Converts a column to float64, mapping datetimes to their integer timestamps.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype('int64').astype('float64')
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64')
+
+
+def _x_positions(values: pd.Series) -> Optional[np.ndarray]:
+    """
+    Converts an x column to float64 positions along the axis, or returns None
+    when it holds text or categories, which are drawn in row order.
+    """
+    numeric = _numeric(values)
+    if np.isnan(numeric[values.notna().to_numpy()]).any():
+        return None
+    return numeric
+
+
+def _split_budget(sizes: np.ndarray, max_points: int, minimum: int) -> np.ndarray:
+    """
+    Splits a point budget across groups proportionally to their sizes, while
+    guaranteeing every group at least `minimum` points (or all of its points).
+    """
+    total = sizes.sum()
+    minimum = min(minimum, max(max_points // max(len(sizes), 1), 1))
+    quotas = np.floor(sizes * (max_points / total)).astype('int64')
+    quotas = np.maximum(quotas, np.minimum(sizes, minimum))
+    return np.minimum(quotas, sizes)
+
+
+def _group_positions(data: pd.DataFrame, group_column: Optional[str]):
+    """
+    Yields the positional indices belonging to each group (or all rows).
+    """
+    if group_column is None or group_column not in data.columns:
+        yield np.arange(len(data))
+        return
+    codes, _ = pd.factorize(data[group_column], use_na_sentinel=False)
+    order = np.argsort(codes, kind='stable')
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+    for positions in np.split(order, boundaries):
+        yield positions
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets on x-sorted arrays.
+
+    Bucket boundaries and bucket averages are computed up front in NumPy; the
+    triangle areas inside a bucket are evaluated as one vectorized expression,
+    so the Python-level loop runs once per output point, not per input row.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(min(n, max(n_out, 0)))
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    starts, ends = edges[:-1], edges[1:]
+
+    # Average point of each bucket, used as the third triangle vertex.
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    next_starts = np.append(starts[1:], n - 1)
+    next_ends = np.append(ends[1:], n)
+    counts = next_ends - next_starts
+    avg_x = (cum_x[next_ends] - cum_x[next_starts]) / counts
+    avg_y = (cum_y[next_ends] - cum_y[next_starts]) / counts
+
+    selected = np.empty(n_out, dtype='int64')
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        bx = x[start:end]
+        by = y[start:end]
+        area = np.abs((x[a] - avg_x[i]) * (by - y[a]) - (x[a] - bx) * (avg_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Keeps the minimum and maximum of each of n_out // 2 equal-width buckets.
+    """
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_buckets * 2 >= n:
+        return np.arange(n)
+    bucket = (np.arange(n) * n_buckets) // n
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets), side='left')
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate((order[starts], order[ends])))
+
+
+def _sorted_by_x(data: pd.DataFrame, x: str, positions: np.ndarray) -> np.ndarray:
+    """
+    Returns the given positions ordered by the x column, or in row order
+    when x is not numeric.
+    """
+    values = _x_positions(data[x].iloc[positions])
+    if values is None:
+        return positions
+    return positions[np.argsort(values, kind='stable')]
+
+
+def lttb(data: pd.DataFrame, x: str, y: str, max_points: int,
+         group_column: Optional[str] = None) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling, applied per group.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data.
+        x (str): Column used for the horizontal axis.
+        y (str): Column used for the vertical axis.
+        max_points (int): Maximum number of points to keep.
+        group_column (str, optional): Column splitting the data into separate lines.
+
+    Returns:
+        np.ndarray: Positional indices of the rows to keep, x-sorted within
+        each group (in row order when x holds text or categories).
+    """
+    groups = [_sorted_by_x(data, x, positions) for positions in _group_positions(data, group_column)]
+    quotas = _split_budget(np.array([len(g) for g in groups]), max_points, 3)
+    kept = []
+    for positions, quota in zip(groups, quotas):
+        xs = _x_positions(data[x].iloc[positions])
+        if xs is None:
+            # Text and category axes are spaced by row
+            xs = np.arange(len(positions), dtype='float64')
+        ys = _numeric(data[y].iloc[positions])
+        valid = ~(np.isnan(xs) | np.isnan(ys))
+        positions, xs, ys = positions[valid], xs[valid], ys[valid]
+        kept.append(positions[_lttb_indices(xs, ys, int(quota))])
+    return np.concatenate(kept) if kept else np.arange(0)
+
+
+def minmax(data: pd.DataFrame, x: str, y: str, max_points: int,
+           group_column: Optional[str] = None) -> np.ndarray:
+    """
+    Min/max-per-bucket downsampling for time series, applied per group.
+
+    Every bucket of consecutive x values keeps its lowest and highest y, so
+    spikes survive the reduction.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data.
+        x (str): Column used for the horizontal axis.
+        y (str): Column used for the vertical axis.
+        max_points (int): Maximum number of points to keep.
+        group_column (str, optional): Column splitting the data into separate lines.
+
+    Returns:
+        np.ndarray: Positional indices of the rows to keep, x-sorted within each group.
+    """
+    groups = [_sorted_by_x(data, x, positions) for positions in _group_positions(data, group_column)]
+    quotas = _split_budget(np.array([len(g) for g in groups]), max_points, 2)
+    kept = []
+    for positions, quota in zip(groups, quotas):
+        ys = _numeric(data[y].iloc[positions])
+        positions, ys = positions[~np.isnan(ys)], ys[~np.isnan(ys)]
+        kept.append(positions[_minmax_indices(ys, int(quota))])
+    return np.concatenate(kept) if kept else np.arange(0)
+
+
+def stratified(data: pd.DataFrame, x: str, y: str, max_points: int,
+               group_column: Optional[str] = None, seed: int = 0) -> np.ndarray:
+    """
+    Density-preserving stratified random sampling for scatter plots.
+
+    Each group keeps a share of the budget proportional to its size, so the
+    relative density of the groups is preserved, and small groups always keep
+    a minimum number of points so that they do not disappear from the legend.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data.
+        x (str): Column used for the horizontal axis (unused).
+        y (str): Column used for the vertical axis (unused).
+        max_points (int): Maximum number of points to keep.
+        group_column (str, optional): Column defining the strata.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        np.ndarray: Sorted positional indices of the rows to keep.
+    """
+    n = len(data)
+    rng = np.random.default_rng(seed)
+    if group_column is None or group_column not in data.columns:
+        return np.sort(rng.choice(n, size=min(max_points, n), replace=False))
+
+    codes, uniques = pd.factorize(data[group_column], use_na_sentinel=False)
+    sizes = np.bincount(codes, minlength=len(uniques))
+    quotas = _split_budget(sizes, max_points, 10)
+
+    # Rank every row within its group in a random order, then keep the rows
+    # whose rank falls under the group's quota.
+    order = rng.permutation(n)
+    order = order[np.argsort(codes[order], kind='stable')]
+    group_starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    ranks = np.empty(n, dtype='int64')
+    ranks[order] = np.arange(n) - group_starts[codes[order]]
+    return np.flatnonzero(ranks < quotas[codes])
+
+
+register_downsampler('lttb', lttb)
+register_downsampler('minmax', minmax)
+register_downsampler('stratified', stratified)
+
+
+def downsample(data: pd.DataFrame, x: str, y: str, max_points: Optional[int],
+               method: str, group_column: Optional[str] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Reduces a DataFrame to roughly `max_points` rows with the given method.
+
+    Groups are guaranteed a small minimum share of the budget, so the result
+    can exceed `max_points` slightly when there are many tiny groups.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data.
+        x (str): Column used for the horizontal axis.
+        y (str): Column used for the vertical axis.
+        max_points (int, optional): Point budget; None or 0 disables downsampling.
+        method (str): Name of a registered downsampling method.
+        group_column (str, optional): Column splitting the data into groups.
+
+    Returns:
+        Tuple[pd.DataFrame, int]: The reduced DataFrame and the number of dropped rows.
+    """
+    if not max_points or len(data) <= max_points:
+        return data, 0
+    positions = get_downsampler(method)(data, x, y, max_points, group_column)
+    reduced = data.iloc[positions]
+    dropped = len(data) - len(reduced)
+    logger.info(f"Downsampled {len(data)} rows to {len(reduced)} with '{method}' ({dropped} points dropped)")
+    return reduced, dropped
@@ -0,0 +1,129 @@
+# my_interactive_plots/dtypes.py
+
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import Config
+from .tracing import span
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def memory_usage(data: pd.DataFrame) -> int:
+    """
+    Returns the bytes held by a DataFrame, including the contents of strings.
+    """
+    return int(data.memory_usage(deep=True).sum())
+
+
+def _format_bytes(size: int) -> str:
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+def _is_text(series: pd.Series) -> bool:
+    return not isinstance(series.dtype, pd.CategoricalDtype) and (
+        series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+    )
+
+
+def _low_cardinality(series: pd.Series, max_ratio: float) -> bool:
+    """
+    Tells whether a column repeats few enough distinct values to be stored as a category.
+    """
+    return len(series) > 0 and series.nunique(dropna=True) <= max(1, max_ratio * len(series))
+
+
+def _downcast(series: pd.Series, downcast_floats: bool) -> pd.Series:
+    """
+    Stores numbers in the narrowest type holding every value: integers in
+    the smallest integer type, floats as float32 when enabled.
+    """
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in 'iuf':
+        # Booleans, nullable extension types and others stay as they are
+        return series
+    if dtype.kind in 'iu':
+        if len(series) and series.min() >= 0:
+            return pd.to_numeric(series, downcast='unsigned')
+        return pd.to_numeric(series, downcast='integer')
+    if downcast_floats and dtype.itemsize > 4:
+        return series.astype(np.float32)
+    return series
+
+
+def _arrow_strings(series: pd.Series) -> pd.Series:
+    try:
+        return series.astype(pd.StringDtype('pyarrow'))
+    except ImportError:
+        logger.debug("pyarrow is not installed, strings kept as they are")
+        return series
+
+
+def optimize_dtypes(data: pd.DataFrame, config: Optional[Config] = None) -> pd.DataFrame:
+    """
+    Returns a copy of a DataFrame stored in compact types.
+
+    Integers are downcast to the smallest type holding their range, floats
+    to float32 (see Config.downcast_floats), and text columns with few
+    distinct values (see Config.category_max_ratio) become categoricals,
+    which also speeds up the grouping by color in the plot builders. Other
+    text columns become Arrow-backed strings when Config.arrow_strings is
+    set. The memory used before and after is logged.
+
+    Args:
+        data (pd.DataFrame): Data to optimize.
+        config (Config, optional): Settings; defaults to Config().
+
+    Returns:
+        pd.DataFrame: The optimized data.
+    """
+    config = config or Config()
+    with span('optimize_dtypes', rows=len(data), columns=len(data.columns)) as current:
+        before = memory_usage(data)
+        columns = {}
+        for name, series in data.items():
+            if _is_text(series):
+                if _low_cardinality(series, config.category_max_ratio):
+                    series = series.astype('category')
+                elif config.arrow_strings:
+                    series = _arrow_strings(series)
+            else:
+                series = _downcast(series, config.downcast_floats)
+            columns[name] = series
+        optimized = pd.DataFrame(columns, index=data.index)
+        optimized.attrs = dict(data.attrs)
+        after = memory_usage(optimized)
+        current.set(memory_before=before, memory_after=after)
+    logger.info(f"Optimized dtypes: {_format_bytes(before)} -> {_format_bytes(after)}"
+                + (f" ({before / after:.1f}x smaller)" if after else ""))
+    return optimized
+
+
+def parse_dtypes(sample: pd.DataFrame, config: Optional[Config] = None) -> Dict[str, str]:
+    """
+    Chooses compact types for parsing a file from a sample of its rows, so
+    that large files are not held at full width while being parsed.
+
+    Floats are parsed as float32 and repetitive text as categories.
+    Integers are downcast after parsing, once their range is known.
+
+    Args:
+        sample (pd.DataFrame): The first rows of the file.
+        config (Config, optional): Settings; defaults to Config().
+
+    Returns:
+        Dict[str, str]: Column types to pass to pandas.read_csv.
+    """
+    config = config or Config()
+    dtypes = {}
+    for name, series in sample.items():
+        if _is_text(series) and _low_cardinality(series, config.category_max_ratio):
+            dtypes[name] = 'category'
+        elif config.downcast_floats and series.dtype == np.float64:
+            dtypes[name] = 'float32'
+    return dtypes
@@ -0,0 +1,635 @@
+# my_interactive_plots/filters.py
+
+import logging
+import operator
+import re
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+_NEGATED = {'==': '!=', '!=': '==', '<': '>=', '<=': '>', '>': '<=', '>=': '<'}
+_DURATION_UNITS = {'ms': 'ms', 's': 's', 'min': 'min', 'm': 'min', 'h': 'h', 'd': 'D', 'w': 'W'}
+# `within` windows end at the current UTC time rounded down to this, so that
+# the same expression parsed twice in a minute is the same predicate (and
+# hits the same cache entries)
+WITHIN_RESOLUTION = '1min'
+
+
+def _kind(dtype) -> str:
+    """
+    Classifies a pandas dtype as 'bool', 'number', 'datetime' or 'text'.
+    """
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'number'
+    return 'text'
+
+
+def _arrow_kind(kind) -> str:
+    """
+    Classifies a pyarrow type as _kind does.
+    """
+    import pyarrow as pa
+
+    if pa.types.is_dictionary(kind):
+        kind = kind.value_type
+    if pa.types.is_boolean(kind):
+        return 'bool'
+    if pa.types.is_timestamp(kind) or pa.types.is_date(kind):
+        return 'datetime'
+    if pa.types.is_integer(kind) or pa.types.is_floating(kind) or pa.types.is_decimal(kind):
+        return 'number'
+    return 'text'
+
+
+def _coerce(kind: str, value: Any, tz=None) -> Any:
+    """
+    Converts a literal to the kind of a column, so that '5' compares with the
+    number 5 and '2024-01-01' with timestamps. Timestamps are expressed in
+    the column's time zone `tz`; columns without one are taken to hold UTC.
+    Raises ValueError for literals the column cannot hold.
+    """
+    if kind == 'number':
+        if isinstance(value, (bool, pd.Timestamp)):
+            raise ValueError(f"{value!r} is not a number")
+        if isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                return float(value)
+        return value
+    if kind == 'bool':
+        if isinstance(value, str):
+            if value.lower() not in ('true', 'false'):
+                raise ValueError(f"{value!r} is not a boolean")
+            return value.lower() == 'true'
+        if value not in (0, 1):
+            raise ValueError(f"{value!r} is not a boolean")
+        return bool(value)
+    if kind == 'datetime':
+        if not isinstance(value, (str, pd.Timestamp)):
+            raise ValueError(f"{value!r} is not a timestamp")
+        stamp = pd.Timestamp(value)
+        if tz is not None:
+            return stamp.tz_localize(tz) if stamp.tz is None else stamp.tz_convert(tz)
+        return stamp.tz_convert('UTC').tz_localize(None) if stamp.tz is not None else stamp
+    return value if isinstance(value, str) else str(value)
+
+
+def _typed(values: pd.Series, literals: list) -> Tuple[pd.Series, list]:
+    """
+    Converts literals to the type of a column; literals the column cannot
+    hold become None. Text columns compared with timestamps, such as CSV
+    columns of dates, are parsed as ISO 8601 timestamps.
+    """
+    kind = _kind(values.dtype)
+    if kind == 'text' and any(isinstance(value, pd.Timestamp) for value in literals):
+        values = pd.to_datetime(values, errors='coerce', format='ISO8601')
+        kind = 'datetime'
+    tz = values.dt.tz if kind == 'datetime' else None
+    typed = []
+    for value in literals:
+        try:
+            typed.append(_coerce(kind, value, tz))
+        except ValueError:
+            typed.append(None)
+    return values, typed
+
+
+def _evaluate(values: pd.Series, test: Callable[[pd.Series], pd.Series]) -> np.ndarray:
+    """
+    Evaluates an elementwise test as a boolean mask, missing results being
+    False. Categoricals are tested once per category.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        matches = _evaluate(pd.Series(values.cat.categories), test)
+        # Code -1, a missing value, picks the appended False
+        return np.append(matches, False)[values.cat.codes.to_numpy()]
+    return test(values).to_numpy(dtype=bool, na_value=False)
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, pd.Timestamp):
+        return f"'{value.isoformat()}'"
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return repr(value)
+
+
+def _name(column: str) -> str:
+    if re.fullmatch(r'[A-Za-z_][A-Za-z0-9_.]*', column) and column.lower() not in _KEYWORDS:
+        return column
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _sql_value(value: Any) -> Any:
+    return value.to_pydatetime() if isinstance(value, pd.Timestamp) else value
+
+
+class Predicate:
+    """
+    Compiled filter condition on the rows of a table.
+
+    The same condition evaluates as a vectorized mask on pandas DataFrames,
+    and translates to SQL, pyarrow and Polars expressions so that engines
+    filter rows while reading them. Literals are compared in the type of
+    their column. Rows where a compared column is missing never match,
+    except for `is null`, as in SQL.
+    """
+
+    def columns(self) -> List[str]:
+        """
+        Returns the columns the condition reads, without duplicates.
+        """
+        raise NotImplementedError
+
+    def mask(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Returns a boolean array telling which rows of a DataFrame match.
+        """
+        raise NotImplementedError
+
+    def apply(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the matching rows of a DataFrame.
+        """
+        return data[self.mask(data)]
+
+    def negated(self) -> 'Predicate':
+        """
+        Returns the opposite condition, also excluding rows with missing values.
+        """
+        raise NotImplementedError
+
+    def to_sql(self, table: 'sqlalchemy.TableClause') -> 'sqlalchemy.ColumnElement':
+        """
+        Translates the condition into a WHERE clause on a SQLAlchemy table.
+        """
+        raise NotImplementedError
+
+    def to_arrow(self, schema: 'pyarrow.Schema') -> 'pyarrow.compute.Expression':
+        """
+        Translates the condition into a pyarrow expression, as used to filter
+        tables and to skip Parquet row groups from their statistics.
+        """
+        raise NotImplementedError
+
+    def to_polars(self, schema) -> 'polars.Expr':
+        """
+        Translates the condition into a Polars expression.
+        """
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        return type(self) is type(other) and str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self)!r})"
+
+
+class Comparison(Predicate):
+    """
+    Compares a column with a literal using ==, !=, <, <=, > or >=.
+    """
+
+    def __init__(self, column: str, op: str, value: Any):
+        if op not in _OPERATORS:
+            raise ValueError(f"Unknown comparison operator: {op}")
+        self.column = column
+        self.op = op
+        self.value = value
+
+    def columns(self):
+        return [self.column]
+
+    def _unmatched(self):
+        if self.op not in ('==', '!='):
+            raise ValueError(f"Cannot compare column '{self.column}' with {self.value!r}")
+
+    def mask(self, data):
+        def test(values):
+            values, (value,) = _typed(values, [self.value])
+            if value is None:
+                self._unmatched()
+                # A value the column cannot hold equals no row
+                return values.notna() if self.op == '!=' else pd.Series(False, index=values.index)
+            result = _OPERATORS[self.op](values, value)
+            return result & values.notna() if self.op == '!=' else result
+
+        return _evaluate(data[self.column], test)
+
+    def negated(self):
+        return Comparison(self.column, _NEGATED[self.op], self.value)
+
+    def to_sql(self, table):
+        return _OPERATORS[self.op](table.c[self.column], _sql_value(self.value))
+
+    def to_arrow(self, schema):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        field = schema.field(self.column).type
+        kind = _arrow_kind(field)
+        try:
+            value = _coerce(kind, self.value, getattr(field, 'tz', None))
+        except ValueError:
+            self._unmatched()
+            return pc.field(self.column).is_valid() if self.op == '!=' else pc.scalar(False)
+        if isinstance(value, pd.Timestamp):
+            value = pa.scalar(value, type=field) if pa.types.is_timestamp(field) else value.date()
+        return _OPERATORS[self.op](pc.field(self.column), pc.scalar(value))
+
+    def to_polars(self, schema):
+        import polars as pl
+
+        dtype = schema[self.column]
+        kind = 'bool' if dtype == pl.Boolean else 'number' if dtype.is_numeric() \
+            else 'datetime' if dtype.is_temporal() else 'text'
+        try:
+            value = _coerce(kind, self.value, getattr(dtype, 'time_zone', None))
+        except ValueError:
+            self._unmatched()
+            return pl.col(self.column).is_not_null() if self.op == '!=' else pl.lit(False)
+        return _OPERATORS[self.op](pl.col(self.column), pl.lit(value))
+
+    def __str__(self):
+        return f"{_name(self.column)} {self.op} {_format(self.value)}"
+
+
+class InList(Predicate):
+    """
+    Tests whether a column's value is one of a list of literals.
+    """
+
+    def __init__(self, column: str, values: list, negate: bool = False):
+        self.column = column
+        self.values = list(values)
+        self.negate = negate
+
+    def columns(self):
+        return [self.column]
+
+    def mask(self, data):
+        def test(values):
+            values, typed = _typed(values, self.values)
+            result = values.isin([value for value in typed if value is not None])
+            return ~result & values.notna() if self.negate else result
+
+        return _evaluate(data[self.column], test)
+
+    def negated(self):
+        return InList(self.column, self.values, not self.negate)
+
+    def to_sql(self, table):
+        column = table.c[self.column]
+        values = [_sql_value(value) for value in self.values]
+        return column.not_in(values) if self.negate else column.in_(values)
+
+    def _parts(self) -> List[Predicate]:
+        return [Comparison(self.column, '==', value) for value in self.values]
+
+    def to_arrow(self, schema):
+        import pyarrow.compute as pc
+
+        matches = Or(self._parts()).to_arrow(schema) if self.values else pc.scalar(False)
+        return ~matches & pc.field(self.column).is_valid() if self.negate else matches
+
+    def to_polars(self, schema):
+        import polars as pl
+
+        matches = Or(self._parts()).to_polars(schema) if self.values else pl.lit(False)
+        return ~matches & pl.col(self.column).is_not_null() if self.negate else matches
+
+    def __str__(self):
+        values = ', '.join(_format(value) for value in self.values)
+        return f"{_name(self.column)} {'not in' if self.negate else 'in'} ({values})"
+
+
+class IsNull(Predicate):
+    """
+    Tests whether a column's value is missing (or present, when negated).
+    """
+
+    def __init__(self, column: str, negate: bool = False):
+        self.column = column
+        self.negate = negate
+
+    def columns(self):
+        return [self.column]
+
+    def mask(self, data):
+        values = data[self.column]
+        return (values.notna() if self.negate else values.isna()).to_numpy(dtype=bool)
+
+    def negated(self):
+        return IsNull(self.column, not self.negate)
+
+    def to_sql(self, table):
+        column = table.c[self.column]
+        return column.is_not(None) if self.negate else column.is_(None)
+
+    def to_arrow(self, schema):
+        import pyarrow.compute as pc
+
+        column = pc.field(self.column)
+        return column.is_valid() if self.negate else column.is_null()
+
+    def to_polars(self, schema):
+        import polars as pl
+
+        column = pl.col(self.column)
+        return column.is_not_null() if self.negate else column.is_null()
+
+    def __str__(self):
+        return f"{_name(self.column)} is {'not ' if self.negate else ''}null"
+
+
+class And(Predicate):
+    """
+    Matches rows matching every part.
+    """
+
+    def __init__(self, parts: List[Predicate]):
+        self.parts = list(parts)
+
+    def columns(self):
+        return list(dict.fromkeys(col for part in self.parts for col in part.columns()))
+
+    def mask(self, data):
+        result = np.ones(len(data), dtype=bool)
+        for part in self.parts:
+            result &= part.mask(data)
+        return result
+
+    def negated(self):
+        return Or([part.negated() for part in self.parts])
+
+    def to_sql(self, table):
+        import sqlalchemy
+
+        return sqlalchemy.and_(*[part.to_sql(table) for part in self.parts])
+
+    def to_arrow(self, schema):
+        expressions = [part.to_arrow(schema) for part in self.parts]
+        result = expressions[0]
+        for expression in expressions[1:]:
+            result = result & expression
+        return result
+
+    def to_polars(self, schema):
+        import polars as pl
+
+        return pl.all_horizontal([part.to_polars(schema) for part in self.parts])
+
+    def __str__(self):
+        return ' and '.join(f"({part})" if isinstance(part, Or) else str(part) for part in self.parts)
+
+
+class Or(Predicate):
+    """
+    Matches rows matching any part.
+    """
+
+    def __init__(self, parts: List[Predicate]):
+        self.parts = list(parts)
+
+    def columns(self):
+        return list(dict.fromkeys(col for part in self.parts for col in part.columns()))
+
+    def mask(self, data):
+        result = np.zeros(len(data), dtype=bool)
+        for part in self.parts:
+            result |= part.mask(data)
+        return result
+
+    def negated(self):
+        return And([part.negated() for part in self.parts])
+
+    def to_sql(self, table):
+        import sqlalchemy
+
+        return sqlalchemy.or_(*[part.to_sql(table) for part in self.parts])
+
+    def to_arrow(self, schema):
+        expressions = [part.to_arrow(schema) for part in self.parts]
+        result = expressions[0]
+        for expression in expressions[1:]:
+            result = result | expression
+        return result
+
+    def to_polars(self, schema):
+        import polars as pl
+
+        return pl.any_horizontal([part.to_polars(schema) for part in self.parts])
+
+    def __str__(self):
+        return ' or '.join(str(part) for part in self.parts)
+
+
+_KEYWORDS = {'and', 'or', 'not', 'in', 'is', 'null', 'between', 'within', 'true', 'false'}
+
+_TOKENS = re.compile(r"""\s*(?:
+    (?P<duration>\d+(?:\.\d+)?(?:ms|min|s|m|h|d|w)\b)
+    |(?P<number>[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<quoted>"(?:[^"]|"")*")
+    |(?P<op>==|!=|<>|<=|>=|=|<|>|\(|\)|,)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+)""", re.VERBOSE)
+
+
+def _tokenize(text: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKENS.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid filter at position {position}: {text[position:]!r}")
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == 'string':
+            tokens.append(('value', token[1:-1].replace("''", "'")))
+        elif kind == 'quoted':
+            tokens.append(('name', token[1:-1].replace('""', '"')))
+        elif kind == 'number':
+            tokens.append(('value', float(token) if any(c in token for c in '.eE') else int(token)))
+        elif kind == 'duration':
+            amount, unit = re.fullmatch(r'([\d.]+)(\w+)', token).groups()
+            tokens.append(('duration', pd.Timedelta(float(amount), unit=_DURATION_UNITS[unit])))
+        elif kind == 'op':
+            tokens.append(('op', {'=': '==', '<>': '!='}.get(token, token)))
+        elif token.lower() in ('true', 'false'):
+            tokens.append(('value', token.lower() == 'true'))
+        elif token.lower() in _KEYWORDS:
+            tokens.append(('keyword', token.lower()))
+        else:
+            tokens.append(('name', token))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent parser of filter expressions, see parse_filter.
+    """
+
+    def __init__(self, text: str, now: Optional[pd.Timestamp] = None):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.now = now
+
+    def _peek(self, kind: Optional[str] = None, value: Any = None) -> bool:
+        if self.position >= len(self.tokens):
+            return False
+        token_kind, token = self.tokens[self.position]
+        return (kind is None or token_kind == kind) and (value is None or token == value)
+
+    def _take(self, kind: str, value: Any = None, expected: Optional[str] = None) -> Any:
+        if not self._peek(kind, value):
+            found = repr(self.tokens[self.position][1]) if self.position < len(self.tokens) else 'end of filter'
+            raise ValueError(f"Invalid filter {self.text!r}: expected {expected or value or kind}, found {found}")
+        self.position += 1
+        return self.tokens[self.position - 1][1]
+
+    def _accept(self, kind: str, value: Any = None) -> bool:
+        if self._peek(kind, value):
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> Predicate:
+        predicate = self._or()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Invalid filter {self.text!r}: unexpected {self.tokens[self.position][1]!r}")
+        return predicate
+
+    def _or(self) -> Predicate:
+        parts = [self._and()]
+        while self._accept('keyword', 'or'):
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else Or(parts)
+
+    def _and(self) -> Predicate:
+        parts = [self._not()]
+        while self._accept('keyword', 'and'):
+            parts.append(self._not())
+        return parts[0] if len(parts) == 1 else And(parts)
+
+    def _not(self) -> Predicate:
+        if self._accept('keyword', 'not'):
+            return self._not().negated()
+        if self._accept('op', '('):
+            predicate = self._or()
+            self._take('op', ')')
+            return predicate
+        return self._condition()
+
+    def _condition(self) -> Predicate:
+        column = self._take('name', expected='a column name')
+        if self._accept('keyword', 'is'):
+            negate = self._accept('keyword', 'not')
+            self._take('keyword', 'null')
+            return IsNull(column, negate)
+        if self._accept('keyword', 'within'):
+            # Time window ending now, e.g. `timestamp within 7d`
+            now = self.now if self.now is not None else pd.Timestamp.now(tz='UTC').floor(WITHIN_RESOLUTION)
+            if now.tz is None:
+                now = now.tz_localize('UTC')
+            return Comparison(column, '>=', now - self._take('duration', expected='a duration such as 7d'))
+        negate = self._accept('keyword', 'not')
+        if self._accept('keyword', 'in'):
+            self._take('op', '(')
+            values = [self._take('value', expected='a literal')]
+            while self._accept('op', ','):
+                values.append(self._take('value', expected='a literal'))
+            self._take('op', ')')
+            return InList(column, values, negate)
+        if self._accept('keyword', 'between'):
+            low = self._take('value', expected='a literal')
+            self._take('keyword', 'and')
+            high = self._take('value', expected='a literal')
+            predicate = And([Comparison(column, '>=', low), Comparison(column, '<=', high)])
+            return predicate.negated() if negate else predicate
+        if negate:
+            raise ValueError(f"Invalid filter {self.text!r}: expected in or between after not")
+        op = self._take('op', expected='a comparison operator')
+        if op not in _OPERATORS:
+            raise ValueError(f"Invalid filter {self.text!r}: expected a comparison operator, found {op!r}")
+        return Comparison(column, op, self._take('value', expected='a literal'))
+
+
+def parse_filter(text: str, now: Optional[pd.Timestamp] = None) -> Predicate:
+    """
+    Compiles a filter expression.
+
+    Conditions compare a column with a literal and are combined with `and`,
+    `or`, `not` and parentheses:
+
+        price >= 10 and price < 20.5
+        species in ('setosa', 'virginica') or species is null
+        sepal_width not between 2 and 3
+        timestamp within 7d and status != 'ok'
+
+    Literals are numbers, 'quoted strings' (with '' for a quote) and true or
+    false; column names containing spaces or keywords are "double quoted".
+    Timestamps are written as strings and compared in the column's time
+    zone, UTC for columns without one. `within` keeps the rows at most a
+    duration (ms, s, min, h, d or w) before now.
+
+    Args:
+        text (str): The expression.
+        now (pd.Timestamp, optional): End of time windows, UTC when naive;
+            defaults to the current time rounded down to WITHIN_RESOLUTION.
+
+    Returns:
+        Predicate: The compiled condition.
+    """
+    return _Parser(text, now).parse()
+
+
+def build_filter(where: Union[str, Predicate, None] = None, filter_column: Optional[str] = None,
+                 filter_value: Any = None) -> Optional[Predicate]:
+    """
+    Combines a filter expression with the equality filter of a column.
+
+    Args:
+        where (str or Predicate, optional): Filter expression, see parse_filter.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal,
+            in the column's type; e.g. '5' matches the number 5.
+
+    Returns:
+        Optional[Predicate]: The condition, or None when nothing is filtered.
+    """
+    parts = []
+    if where is not None and not (isinstance(where, str) and not where.strip()):
+        parts.append(parse_filter(where) if isinstance(where, str) else where)
+    if filter_column is not None and filter_value is not None:
+        parts.append(Comparison(filter_column, '==', filter_value))
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else And(parts)
@@ -0,0 +1,183 @@
+# my_interactive_plots/html_export.py
+
+import base64
+import gzip
+import html
+import logging
+import os
+from typing import Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import plotly.graph_objs as go
+import plotly.io as pio
+import plotly.offline
+
+from .tracing import traced
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+PLOTLYJS_FILENAME = 'plotly.min.js'
+
+# Typed arrays understood by plotly.js, from the narrowest integer type up.
+_INTEGER_DTYPES = ('int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32')
+_TYPED_ARRAY_CODES = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8',
+}
+
+
+def _typed_array(values: np.ndarray) -> Any:
+    """
+    Encodes a numeric array as a plotly.js base64 typed array, narrowing
+    integers to the smallest type that holds them.
+    """
+    if values.dtype.kind in 'iu' and values.size:
+        low, high = values.min(), values.max()
+        for dtype in _INTEGER_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                values = values.astype(dtype)
+                break
+        else:
+            values = values.astype('float64')
+    elif values.dtype.kind == 'f' and values.dtype.name not in _TYPED_ARRAY_CODES:
+        values = values.astype('float64')
+    code = _TYPED_ARRAY_CODES.get(values.dtype.name)
+    if code is None:
+        return values
+    return {'dtype': code, 'bdata': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')}
+
+
+def _encode_arrays(obj: Any) -> Any:
+    """
+    Replaces numeric NumPy arrays in a figure dictionary with typed arrays.
+    """
+    if isinstance(obj, dict):
+        return {key: _encode_arrays(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode_arrays(value) for value in obj]
+    if isinstance(obj, np.ndarray) and obj.ndim == 1 and obj.dtype.kind in 'iuf':
+        return _typed_array(obj)
+    return obj
+
+
+@traced(name='to_json', result=lambda text: {'output_bytes': len(text)})
+def figure_json(fig: go.Figure) -> str:
+    """
+    Serializes a figure compactly, with numeric data as base64 typed arrays.
+
+    Args:
+        fig (go.Figure): Plotly figure object.
+
+    Returns:
+        str: The figure as Plotly JSON.
+    """
+    return pio.json.to_json_plotly(_encode_arrays(fig.to_plotly_json()))
+
+
+def plotlyjs_cdn_url() -> str:
+    """
+    Returns the CDN URL of the plotly.js version bundled with plotly.py.
+    """
+    return f"https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+
+
+def plotlyjs_tag(plotlyjs: str, output_dir: Optional[str] = None) -> str:
+    """
+    Returns the script tag loading plotly.js.
+
+    Args:
+        plotlyjs (str): 'inline' to embed the bundle, 'cdn' to reference the
+            CDN, 'directory' to reference plotly.min.js next to the output
+            (written there if missing), or 'none' to leave it out.
+        output_dir (str, optional): Directory of the output, for 'directory'.
+
+    Returns:
+        str: The script tag, or an empty string for 'none'.
+    """
+    if plotlyjs == 'inline':
+        return f'<script type="text/javascript">{plotly.offline.get_plotlyjs()}</script>'
+    if plotlyjs == 'cdn':
+        return f'<script type="text/javascript" src="{plotlyjs_cdn_url()}" charset="utf-8"></script>'
+    if plotlyjs == 'directory':
+        bundle_path = os.path.join(output_dir or '.', PLOTLYJS_FILENAME)
+        if not os.path.exists(bundle_path):
+            with open(bundle_path, 'w', encoding='utf-8') as f:
+                f.write(plotly.offline.get_plotlyjs())
+        return f'<script type="text/javascript" src="{PLOTLYJS_FILENAME}" charset="utf-8"></script>'
+    if plotlyjs == 'none':
+        return ''
+    raise ValueError(f"Unsupported plotly.js mode: {plotlyjs}")
+
+
+def figure_div(fig: Union[go.Figure, str], div_id: str) -> str:
+    """
+    Returns an HTML fragment drawing the figure, without plotly.js itself.
+
+    Args:
+        fig (go.Figure or str): Plotly figure object, or its JSON from figure_json.
+        div_id (str): Id of the div holding the figure.
+
+    Returns:
+        str: The div and the script calling Plotly.newPlot with the figure's data, layout and frames.
+    """
+    fig_json = fig if isinstance(fig, str) else figure_json(fig)
+    return (
+        f'<div id="{div_id}" class="plotly-graph-div"></div>'
+        f'<script type="text/javascript">'
+        f'(function() {{ var figure = {fig_json}; '
+        # The object form also adds the animation frames
+        f'Plotly.newPlot("{div_id}", {{"data": figure.data, "layout": figure.layout, "frames": figure.frames, '
+        f'"config": {{"responsive": true}}}}); }})();'
+        f'</script>'
+    )
+
+
+def _open_output(path: str, compress: bool):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+@traced(output='path')
+def write_html_document(sections: Iterable[Tuple[str, str]], path: str, title: str = 'Data Report',
+                        plotlyjs: str = 'inline', compress: Optional[bool] = None):
+    """
+    Writes an HTML document with plotly.js included once, section by section.
+
+    Args:
+        sections (Iterable[Tuple[str, str]]): Heading and HTML fragment of each
+            section, e.g. from figure_div; an empty heading is left out.
+        path (str): Path of the document to write.
+        title (str): Title of the document.
+        plotlyjs (str): How plotly.js is included, see plotlyjs_tag.
+        compress (bool, optional): Gzip the document; by default when the path ends with '.gz'.
+    """
+    if compress is None:
+        compress = path.endswith('.gz')
+    tag = plotlyjs_tag(plotlyjs, os.path.dirname(os.path.abspath(path)))
+    with _open_output(path, compress) as f:
+        f.write(f'<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>{tag}</head><body>')
+        for heading, fragment in sections:
+            if heading:
+                f.write(f'<h2>{html.escape(heading)}</h2>')
+            f.write(fragment)
+        f.write('</body></html>')
+    logger.info(f"HTML document saved to {path}")
+
+
+@traced(output='path')
+def write_figure_html(fig: go.Figure, path: str, plotlyjs: str = 'inline', compress: Optional[bool] = None):
+    """
+    Writes a single figure as a standalone HTML document.
+
+    Args:
+        fig (go.Figure): Plotly figure object.
+        path (str): Path of the document to write.
+        plotlyjs (str): How plotly.js is included, see plotlyjs_tag.
+        compress (bool, optional): Gzip the document; by default when the path ends with '.gz'.
+    """
+    title = fig.layout.title.text or 'Plot'
+    write_html_document([('', figure_div(fig, 'plot-0'))], path, title=title, plotlyjs=plotlyjs, compress=compress)
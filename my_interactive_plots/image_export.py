@@ -0,0 +1,412 @@
+# my_interactive_plots/image_export.py
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from concurrent.futures import wait as futures_wait
+from multiprocessing.connection import wait as connection_wait
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+import plotly.graph_objs as go
+import plotly.io as pio
+
+from .config import Config
+from .html_export import figure_json
+from .tracing import traced
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+IMAGE_FORMATS = ('png', 'jpeg', 'webp', 'svg', 'pdf')
+
+Figure = Union[go.Figure, str]
+
+
+def _browser_available() -> bool:
+    """
+    Tells whether Kaleido >= 1.0 finds a browser; without one, exports wait
+    forever on a persistent server, which would fail to start.
+    """
+    try:
+        from choreographer.browsers.chromium import Chromium
+
+        return Chromium.find_browser(skip_local=False) is not None
+    except Exception:
+        return False
+
+
+def _warm_renderer():
+    """
+    Starts the image renderer of a worker process by exporting a tiny figure,
+    so the renderer's start-up cost is paid once per worker, not per export.
+    """
+    try:
+        import kaleido
+        if hasattr(kaleido, 'start_sync_server') and _browser_available():
+            # Kaleido >= 1.0 keeps one browser alive for every later export
+            kaleido.start_sync_server(silence_warnings=True)
+    except Exception as e:
+        logger.debug(f"Persistent Kaleido server not started: {e}")
+    try:
+        pio.to_image(go.Figure(), format='png', width=10, height=10)
+    except Exception as e:
+        logger.warning(f"Failed to warm up the image renderer: {e}")
+
+
+@traced(name='write_image', output='path')
+def _export_image(fig_json: str, path: str, image_format: str, width: Optional[int],
+                  height: Optional[int], scale: Optional[float]) -> float:
+    """
+    Writes one serialized figure as an image and returns the seconds taken.
+    """
+    start = time.perf_counter()
+    fig = pio.from_json(fig_json, skip_invalid=True)
+    pio.write_image(fig, path, format=image_format, width=width, height=height, scale=scale)
+    return time.perf_counter() - start
+
+
+def _image_format(path: str, image_format: Optional[str]) -> str:
+    image_format = (image_format or os.path.splitext(path)[1].lstrip('.') or 'png').lower()
+    if image_format == 'jpg':
+        image_format = 'jpeg'
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    return image_format
+
+
+def _serve_exports(connection, warm: bool):
+    """
+    Main loop of a worker process: reports 'ready' once its renderer is warm,
+    then answers each (export id, arguments) request until it receives None.
+    """
+    if warm:
+        _warm_renderer()
+    connection.send(('ready', None, None))
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        export_id, args = request
+        try:
+            reply = ('done', export_id, _export_image(*args))
+        except Exception as e:
+            reply = ('error', export_id, e)
+        try:
+            connection.send(reply)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            connection.send(('error', export_id, RuntimeError(str(reply[2]))))
+
+
+class _Export:
+    """
+    One queued export and the future handed to the caller.
+    """
+
+    def __init__(self, args: tuple):
+        self.args = args
+        self.future: Future = Future()
+        self.deadline: Optional[float] = None
+
+
+class _Worker:
+    """
+    Worker process exporting one image at a time, and its end of the pipe
+    carrying requests and replies.
+    """
+
+    def __init__(self, warm: bool):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve_exports, args=(child, warm),
+                                               name='image-export-worker', daemon=True)
+        self.process.start()
+        child.close()
+        self.ready = False
+        self.export: Optional[_Export] = None
+
+    def send(self, export: _Export):
+        self.connection.send((id(export), export.args))
+        self.export = export
+
+    def stop(self):
+        """
+        Lets the worker finish and exit.
+        """
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join()
+        self.connection.close()
+
+    def kill(self):
+        """
+        Terminates the worker, even when it is stuck in an export.
+        """
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+class ImageExportService:
+    """
+    Pool of worker processes with warm image renderers exporting figures concurrently.
+
+    The service can be used as a context manager. With zero workers exports
+    run in the calling process, which keeps its own renderer warm but cannot
+    enforce the timeout.
+
+    Each worker is a process taking one export at a time over its own pipe.
+    An export's timeout runs from the moment a warmed-up worker takes it. A
+    monitor thread fails exports past their deadline and replaces their
+    stuck workers, leaving the other workers' exports running.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None, warm: bool = True):
+        config = Config()
+        self.workers = config.export_workers if workers is None else workers
+        self.timeout = config.export_timeout if timeout is None else timeout
+        self.warm = warm
+        self._workers: List[Optional[_Worker]] = [None] * max(self.workers, 0)
+        self._queued: Deque[_Export] = deque()
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'ImageExportService':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def start(self):
+        """
+        Starts the worker processes, warming their renderers.
+        """
+        with self._lock:
+            if self.workers > 0 and None in self._workers:
+                self._start_workers()
+                logger.info(f"Started image export service with {self.workers} workers")
+
+    def _start_workers(self):
+        # Called with the lock held
+        for index, worker in enumerate(self._workers):
+            if worker is None:
+                self._workers[index] = _Worker(self.warm)
+
+    def _watch_soon(self):
+        # Called with the lock held
+        if self._monitor is None:
+            self._monitor = threading.Thread(target=self._watch, name='image-export-monitor', daemon=True)
+            self._monitor.start()
+
+    def _pending(self) -> List[_Export]:
+        running = [worker.export for worker in self._workers if worker is not None and worker.export is not None]
+        return [*self._queued, *running]
+
+    def close(self, wait: bool = True):
+        """
+        Stops the worker processes.
+
+        Args:
+            wait (bool): Wait for queued exports to finish (or time out);
+                otherwise they fail and running exports are interrupted.
+        """
+        if wait:
+            with self._lock:
+                futures = [export.future for export in self._pending()]
+            futures_wait(futures)
+        with self._lock:
+            for export in self._pending():
+                if not export.future.cancel() and not export.future.done():
+                    export.future.set_exception(CancelledError("The image export service was closed"))
+            self._queued.clear()
+            workers, self._workers = self._workers, [None] * len(self._workers)
+        for worker in workers:
+            if worker is None:
+                continue
+            if wait:
+                worker.stop()
+            else:
+                worker.kill()
+
+    def _dispatch(self):
+        """
+        Hands queued exports to idle workers; called with the lock held.
+        """
+        for worker in self._workers:
+            if not self._queued:
+                break
+            if worker is None or not worker.ready or worker.export is not None:
+                continue
+            while self._queued:
+                export = self._queued.popleft()
+                if export.future.set_running_or_notify_cancel():
+                    export.deadline = time.monotonic() + self.timeout if self.timeout else None
+                    worker.send(export)
+                    break
+        if self._queued:
+            # Replaces the workers that were stopped, so the queue drains
+            self._start_workers()
+        if self._queued or any(worker is not None and worker.export is not None for worker in self._workers):
+            self._watch_soon()
+
+    def _finish(self, worker: _Worker, index: int, message: Optional[tuple]):
+        """
+        Applies a worker's message, or its death when message is None; called with the lock held.
+        """
+        if message is None:
+            logger.warning(f"Image export worker {index} exited with code {worker.process.exitcode}")
+            if worker.export is not None:
+                worker.export.future.set_exception(RuntimeError("The image export worker exited unexpectedly"))
+            worker.kill()
+            self._workers[index] = None
+            return
+        kind, export_id, value = message
+        if kind == 'ready':
+            worker.ready = True
+            return
+        export, worker.export = worker.export, None
+        if export is None or export_id != id(export):
+            return
+        if kind == 'done':
+            export.future.set_result(value)
+        else:
+            export.future.set_exception(value)
+
+    def _watch(self):
+        """
+        Receives the workers' replies, completes the callers' futures and
+        enforces the export deadlines.
+        """
+        while True:
+            with self._lock:
+                if not self._queued and not any(worker is not None and worker.export is not None
+                                                for worker in self._workers):
+                    self._monitor = None
+                    return
+                workers = {worker.connection: (index, worker)
+                           for index, worker in enumerate(self._workers) if worker is not None}
+                deadlines = [worker.export.deadline for _, worker in workers.values()
+                             if worker.export is not None and worker.export.deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = connection_wait(list(workers), timeout=timeout)
+            with self._lock:
+                for connection in ready:
+                    index, worker = workers[connection]
+                    if self._workers[index] is not worker:
+                        # Stopped by close() while the lock was released
+                        continue
+                    try:
+                        message = connection.recv()
+                    except (EOFError, OSError):
+                        message = None
+                    self._finish(worker, index, message)
+                now = time.monotonic()
+                for index, worker in enumerate(self._workers):
+                    export = worker.export if worker is not None else None
+                    if export is not None and export.deadline is not None and export.deadline <= now:
+                        worker.kill()
+                        self._workers[index] = None
+                        export.future.set_exception(TimeoutError(f"Export timed out after {self.timeout}s"))
+                        logger.warning(f"Restarting image export worker {index} after a timeout")
+                self._dispatch()
+
+    def submit(self, fig: Figure, path: str, image_format: Optional[str] = None, width: Optional[int] = None,
+               height: Optional[int] = None, scale: Optional[float] = None) -> Future:
+        """
+        Queues one figure for export.
+
+        Args:
+            fig (go.Figure or str): Figure, or figure JSON, to export.
+            path (str): Path of the image to write.
+            image_format (str, optional): One of IMAGE_FORMATS; by default taken from the path.
+            width (int, optional): Image width in pixels.
+            height (int, optional): Image height in pixels.
+            scale (float, optional): Scale factor of the image.
+
+        Returns:
+            Future: Resolves to the seconds spent rendering the image, or
+            fails with TimeoutError when the export exceeds the timeout.
+        """
+        fig_json = fig if isinstance(fig, str) else figure_json(fig)
+        args = (fig_json, path, _image_format(path, image_format), width, height, scale)
+        if self.workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(_export_image(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        export = _Export(args)
+        with self._lock:
+            self._queued.append(export)
+            self._dispatch()
+        return export.future
+
+    def export_many(self, figures: Iterable[Tuple[Figure, str]], image_format: Optional[str] = None,
+                    **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Exports figures concurrently and waits for all of them.
+
+        Args:
+            figures (Iterable[Tuple[Figure, str]]): Figures (or figure JSON) and their output paths.
+            image_format (str, optional): Format for every image; by default taken from each path.
+            **kwargs: width, height and scale passed to every export.
+
+        Returns:
+            List[Dict[str, Any]]: One result per figure, in order, with its
+            output, status ('ok' or 'failed'), error message and seconds.
+        """
+        pending = []
+        for fig, path in figures:
+            try:
+                pending.append((path, self.submit(fig, path, image_format, **kwargs)))
+            except ValueError as e:
+                failed: Future = Future()
+                failed.set_exception(e)
+                pending.append((path, failed))
+
+        results = []
+        for path, future in pending:
+            result = {'output': path, 'status': 'ok', 'error': None, 'seconds': None}
+            try:
+                # The service fails exports past their deadline
+                result['seconds'] = future.result()
+            except Exception as e:
+                result.update(status='failed', error=str(e))
+            if result['status'] != 'ok':
+                logger.error(f"Failed to export {path}: {result['error']}")
+            results.append(result)
+        return results
+
+
+def export_figures(figures: Iterable[Tuple[Figure, str]], workers: Optional[int] = None,
+                   timeout: Optional[float] = None, warm: bool = True, **kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    Exports figures as images with a temporary ImageExportService.
+
+    Args:
+        figures (Iterable[Tuple[Figure, str]]): Figures (or figure JSON) and their output paths.
+        workers (int, optional): Worker processes; defaults to Config.export_workers.
+        timeout (float, optional): Seconds allowed per export, enforced when
+            workers > 0; defaults to Config.export_timeout.
+        warm (bool): Warm up each renderer before the first export.
+        **kwargs: image_format, width, height and scale, see ImageExportService.export_many.
+
+    Returns:
+        List[Dict[str, Any]]: One result per figure, see ImageExportService.export_many.
+    """
+    figures = list(figures)
+    if workers is None:
+        workers = min(Config().export_workers, len(figures))
+    with ImageExportService(workers=workers, timeout=timeout, warm=warm) as service:
+        return service.export_many(figures, **kwargs)
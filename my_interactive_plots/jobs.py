@@ -0,0 +1,134 @@
+# my_interactive_plots/jobs.py
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from .config import Config
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    def __init__(self, future: Future):
+        self.future = future
+        self.submitted = time.monotonic()
+        self.watchers = 1
+
+
+class JobQueue:
+    """
+    Runs long jobs, such as loading data and building figures, in worker
+    processes so the calling threads stay responsive.
+
+    Jobs are identified by a key: submitting a key that is already queued,
+    running or finished and not yet released joins that job instead of
+    starting another one. Every submit is matched by a release once the
+    result was collected or is no longer wanted; a job nobody waits for any
+    more is cancelled if it has not started, and its result is dropped.
+    With zero workers jobs run in the calling thread as they are submitted.
+
+    Args:
+        workers (int, optional): Worker processes; defaults to Config.build_workers.
+        keep_seconds (float): Finished jobs that are never released, e.g. for
+            closed browser sessions, are dropped after this many seconds.
+    """
+
+    def __init__(self, workers: Optional[int] = None, keep_seconds: float = 600.0):
+        self.workers = Config().build_workers if workers is None else workers
+        self.keep_seconds = keep_seconds
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def submit(self, key: str, fn: Callable, *args: Any) -> Future:
+        """
+        Queues fn(*args) under a key, or joins the job already holding the key.
+
+        Args:
+            key (str): Identifies the job's work, e.g. the figure it builds.
+            fn (Callable): Picklable function run in a worker process.
+            *args: Picklable arguments of fn.
+
+        Returns:
+            Future: Resolves to the job's result.
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and not job.future.cancelled():
+                job.watchers += 1
+                return job.future
+            if self.workers <= 0:
+                future: Future = Future()
+                future.set_running_or_notify_cancel()
+            else:
+                future = self._submit_to_pool(fn, args)
+            self._jobs[key] = _Job(future)
+        if self.workers <= 0:
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        return future
+
+    def _submit_to_pool(self, fn: Callable, args: tuple) -> Future:
+        if self._executor is not None:
+            try:
+                return self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died, e.g. out of memory; start over with a fresh pool
+                logger.warning("Job queue workers died; restarting them")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        logger.info(f"Started job queue with {self.workers} workers")
+        return self._executor.submit(fn, *args)
+
+    def get(self, key: str) -> Optional[Future]:
+        """
+        Returns the future of the job holding a key, if any.
+        """
+        job = self._jobs.get(key)
+        return job.future if job is not None else None
+
+    def release(self, key: str):
+        """
+        Stops waiting for a job: after its result was collected, or when the
+        request that submitted it was superseded.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return
+            job.watchers -= 1
+            if job.watchers <= 0:
+                del self._jobs[key]
+                if job.future.cancel():
+                    logger.info(f"Cancelled job {key}")
+
+    def _prune(self):
+        now = time.monotonic()
+        for key, job in list(self._jobs.items()):
+            if job.future.done() and now - job.submitted > self.keep_seconds:
+                del self._jobs[key]
+
+    def close(self, wait: bool = True):
+        """
+        Stops the worker processes, cancelling queued jobs.
+
+        Args:
+            wait (bool): Wait for running jobs to finish.
+        """
+        with self._lock:
+            self._jobs.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,104 @@
+# my_interactive_plots/layouts.py
+
+import copy
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import plotly.graph_objs as go
+import plotly.io as pio
+
+from .config import Config
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Layout settings every figure of a plot type starts from, before titles and data
+_PLOT_LAYOUTS: Dict[str, Dict[str, Any]] = {
+    'binned_histogram': {'barmode': 'relative', 'bargap': 0},
+    'category_histogram': {'barmode': 'relative'},
+    'summary_box': {'boxmode': 'group'},
+}
+
+
+@lru_cache(maxsize=None)
+def _template_json(theme: str) -> Dict[str, Any]:
+    names = theme.split('+')
+    template = pio.templates[names[0]] if len(names) == 1 else \
+        pio.templates.merge_templates(*(pio.templates[name] for name in names))
+    return template.to_plotly_json()
+
+
+def template_json(theme: str) -> Dict[str, Any]:
+    """
+    Returns a theme's template as a plain dictionary, resolved once per process.
+
+    Args:
+        theme (str): Template name, or names joined by '+'.
+
+    Returns:
+        Dict[str, Any]: The template; shared, so it must not be modified.
+    """
+    return _template_json(theme)
+
+
+@lru_cache(maxsize=None)
+def base_layout(theme: str, plot_type: str) -> Dict[str, Any]:
+    """
+    Returns the layout a plot type starts from under a theme, resolved once per process.
+
+    Args:
+        theme (str): Template name, or names joined by '+'.
+        plot_type (str): Kind of figure, e.g. 'combined' or 'summary_box'.
+
+    Returns:
+        Dict[str, Any]: The template and the plot type's settings; shared, so
+        it must not be modified.
+    """
+    return {'template': template_json(theme), **_PLOT_LAYOUTS.get(plot_type, {})}
+
+
+def clear_layout_cache():
+    """
+    Forgets the resolved templates and base layouts, e.g. after registering a template.
+    """
+    _template_json.cache_clear()
+    base_layout.cache_clear()
+
+
+def build_figure(plot_type: str, config: Config, traces: Iterable[Dict[str, Any]],
+                 frames: Optional[List[Dict[str, Any]]] = None, **layout: Any) -> go.Figure:
+    """
+    Builds a figure from trace dictionaries on top of the cached base layout.
+
+    With Config.validate_figures set, the figure is built through Plotly's
+    validating API as usual. Otherwise the traces and layout, which come
+    from this package's own builders, are taken as they are, skipping the
+    validation that dominates the cost of building small figures.
+
+    Args:
+        plot_type (str): Kind of figure, selecting the base layout.
+        config (Config): Plot settings providing the theme, title and validation switch.
+        traces (Iterable[Dict[str, Any]]): Traces, each with its 'type'.
+        frames (List[Dict[str, Any]], optional): Animation frames, as dictionaries.
+        **layout: Further layout settings, as nested dictionaries; None
+            values are left out.
+
+    Returns:
+        go.Figure: Plotly figure object.
+    """
+    layout = {key: value for key, value in layout.items() if value is not None}
+    if config.validate_figures:
+        fig = go.Figure()
+        for trace in traces:
+            fig.add_trace(trace)
+        fig.update_layout(title=config.title, template=config.theme, **_PLOT_LAYOUTS.get(plot_type, {}), **layout)
+        if frames is not None:
+            fig.frames = frames
+        return fig
+    # Shallow copy: the shared template is copied by Plotly when the figure takes it
+    full_layout = copy.copy(base_layout(config.theme, plot_type))
+    full_layout['title'] = {'text': config.title}
+    full_layout.update(layout)
+    return go.Figure(data=list(traces), layout=full_layout, frames=frames, _validate=False)
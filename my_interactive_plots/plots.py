@@ -1,80 +1,259 @@
+import copy
+import hashlib
 import logging
+from typing import List, Optional
+import numpy as np
 import pandas as pd
+import plotly.colors
 import plotly.express as px
 import plotly.graph_objs as go
-from .data_loader import load_data
+from .aggregation import (
+    Raster,
+    box_statistics,
+    category_counts,
+    histogram_bins,
+    rasterize,
+    resampled_means,
+    rolling_statistics,
+    shade
+)
+from .animation import AnimationFrames, split_frames
+from .backends import get_backend
+from .data_loader import load_data, load_table
+from .layouts import build_figure
+from .cache import MemoryCache
 from .config import Config
+from .downsampling import downsample
 from .exceptions import PlotCreationError
+from .tracing import figure_size, traced
 from .utils import setup_logging
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
-def create_scatter_plot(data: pd.DataFrame) -> go.Figure:
+# Resolved up front, as Plotly's validation would, for figures built without it
+_VIRIDIS = [list(step) for step in go.Heatmap(colorscale='Viridis').colorscale]
+
+def required_columns(plot_type: str, config: Optional[Config] = None, **kwargs) -> List[str]:
+    """
+    Returns the columns a plot type reads from the data.
+
+    Args:
+        plot_type (str): Type of plot, as accepted by create_plot.
+        config (Config, optional): Plot settings; defaults to Config().
+        **kwargs: Additional keyword arguments for specific plot types
+            (animation_frame, defaulting to Config.animation_column).
+
+    Returns:
+        List[str]: Column names, without duplicates.
+    """
+    config = config or Config()
+    if plot_type in ('scatter', 'line', 'box'):
+        columns = [config.x_column, config.y_column, config.color_column]
+    elif plot_type == 'histogram':
+        columns = [config.x_column, config.color_column]
+    elif plot_type == '3d_scatter':
+        columns = [config.x_column, config.y_column, config.z_column, config.color_column]
+    elif plot_type == 'geo_map':
+        columns = [config.latitude_column, config.longitude_column, config.hover_name, config.color_column]
+    elif plot_type == 'combined':
+        columns = [config.x_column, *_combined_y_columns(config),
+                   config.color_column if config.combined_by_color else None]
+    elif plot_type == 'animated_scatter':
+        columns = [config.x_column, config.y_column, config.color_column,
+                   kwargs.get('animation_frame') or config.animation_column]
+    else:
+        raise ValueError(f"Unsupported plot type: {plot_type}")
+    if plot_type in ('scatter', 'geo_map') and config.raster_aggregate == 'mean':
+        columns.append(config.raster_value_column)
+    return list(dict.fromkeys(col for col in columns if col))
+
+def _require_columns(data: pd.DataFrame, columns: List[str], plot_name: str):
+    """
+    Raises ValueError if any of the given columns is missing from the data.
+    """
+    for col in columns:
+        if col not in data.columns:
+            raise ValueError(f"Missing required column '{col}' for {plot_name}.")
+
+def _downsample(data: pd.DataFrame, config: Config, method: str):
+    """
+    Reduces the data to the configured point budget before the figure is built.
+    """
+    return downsample(
+        data,
+        x=config.x_column,
+        y=config.y_column,
+        max_points=config.max_points,
+        method=method,
+        group_column=config.color_column
+    )
+
+def _render_mode(config: Config, n_points: int) -> str:
+    """
+    Resolves Config.render_mode to 'svg' or 'webgl' for the given number of points.
+    """
+    if config.render_mode == 'auto':
+        return 'webgl' if n_points > config.webgl_threshold else 'svg'
+    if config.render_mode not in ('svg', 'webgl'):
+        raise ValueError(f"Unsupported render mode: {config.render_mode}")
+    return config.render_mode
+
+def _aggregate(config: Config, n_rows: int) -> bool:
+    """
+    Resolves Config.aggregate_mode to whether histogram/box statistics are computed server-side.
+    """
+    if config.aggregate_mode == 'auto':
+        return n_rows > config.aggregate_threshold
+    if config.aggregate_mode not in ('always', 'never'):
+        raise ValueError(f"Unsupported aggregate mode: {config.aggregate_mode}")
+    return config.aggregate_mode == 'always'
+
+def _rasterize(config: Config, n_rows: int) -> bool:
+    """
+    Resolves Config.raster_mode to whether points are drawn as a pixel grid.
+    """
+    if config.raster_mode == 'auto':
+        return n_rows > config.raster_threshold
+    if config.raster_mode not in ('always', 'never'):
+        raise ValueError(f"Unsupported raster mode: {config.raster_mode}")
+    return config.raster_mode == 'always'
+
+def _raster(data: pd.DataFrame, x: str, y: str, config: Config) -> Raster:
+    """
+    Rasterizes the points with the settings of Config, one layer per color when counting.
+    """
+    color = config.color_column if config.color_column in data.columns else None
+    return rasterize(
+        data, x, y,
+        width=config.raster_width,
+        height=config.raster_height,
+        x_range=config.raster_x_range,
+        y_range=config.raster_y_range,
+        how=config.raster_aggregate,
+        value_column=config.raster_value_column,
+        category_column=color if config.raster_aggregate == 'count' else None
+    )
+
+def _raster_label(raster: Raster, config: Config) -> str:
+    return 'log10(count)' if raster.how == 'count' else f"mean {config.raster_value_column}"
+
+def _raster_z(raster: Raster) -> np.ndarray:
+    """
+    Pixel values of a single-layer raster as drawn, empty pixels left transparent.
+    """
+    if raster.how == 'count':
+        with np.errstate(divide='ignore'):
+            z = np.where(raster.counts > 0, np.log10(np.maximum(raster.counts, 1)), np.nan)
+    else:
+        z = raster.values
+    return z.astype('float32')
+
+def _titled(title: Optional[str]) -> Optional[dict]:
+    """
+    Layout settings of an axis or legend with the given title, if any.
+    """
+    return None if title is None else {'title': {'text': title}}
+
+def _annotate_dropped(fig: go.Figure, shown: int, dropped: int):
+    """
+    Notes on the figure how many points were dropped by downsampling.
+    """
+    if dropped:
+        fig.add_annotation(
+            text=f"Showing {shown:,} of {shown + dropped:,} points",
+            xref='paper', yref='paper', x=1, y=1.05,
+            xanchor='right', yanchor='bottom',
+            showarrow=False
+        )
+
+@traced(frame='data', result=figure_size)
+def create_scatter_plot(data: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
     """
     Creates an interactive scatter plot using Plotly.
 
     Args:
         data (pd.DataFrame): DataFrame containing the data.
+        config (Config, optional): Plot settings; defaults to Config().
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating scatter plot")
-    config = Config()
+    config = config or Config()
     try:
+        _require_columns(data, required_columns('scatter', config), 'scatter plot')
+        if _rasterize(config, len(data)):
+            return create_raster_plot(_raster(data, config.x_column, config.y_column, config), config)
+        data, dropped = _downsample(data, config, config.scatter_downsample_method)
         fig = px.scatter(
             data, 
             x=config.x_column, 
             y=config.y_column, 
             color=config.color_column,
             title=config.title,
-            template=config.theme
+            template=config.theme,
+            render_mode=_render_mode(config, len(data))
         )
+        _annotate_dropped(fig, len(data), dropped)
         return fig
     except Exception as e:
         logger.error(f"Failed to create scatter plot: {e}")
         raise PlotCreationError("Failed to create scatter plot") from e
 
-def create_line_plot(data: pd.DataFrame) -> go.Figure:
+@traced(frame='data', result=figure_size)
+def create_line_plot(data: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
     """
     Creates an interactive line plot using Plotly.
 
     Args:
         data (pd.DataFrame): DataFrame containing the data.
+        config (Config, optional): Plot settings; defaults to Config().
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating line plot")
-    config = Config()
+    config = config or Config()
     try:
+        _require_columns(data, required_columns('line', config), 'line plot')
+        data, dropped = _downsample(data, config, config.line_downsample_method)
         fig = px.line(
             data,
             x=config.x_column,
             y=config.y_column,
             color=config.color_column,
             title=config.title,
-            template=config.theme
+            template=config.theme,
+            render_mode=_render_mode(config, len(data))
         )
+        _annotate_dropped(fig, len(data), dropped)
         return fig
     except Exception as e:
         logger.error(f"Failed to create line plot: {e}")
         raise PlotCreationError("Failed to create line plot") from e
 
-def create_histogram(data: pd.DataFrame) -> go.Figure:
+@traced(frame='data', result=figure_size)
+def create_histogram(data: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
     """
     Creates an interactive histogram using Plotly.
 
+    Large data (see Config.aggregate_mode) is binned server-side and drawn
+    from the bin counts, so the figure size does not grow with the rows.
+
     Args:
         data (pd.DataFrame): DataFrame containing the data.
+        config (Config, optional): Plot settings; defaults to Config().
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating histogram")
-    config = Config()
+    config = config or Config()
     try:
+        _require_columns(data, required_columns('histogram', config), 'histogram')
+        if _aggregate(config, len(data)):
+            return _aggregated_histogram(data, config)
         fig = px.histogram(
             data,
             x=config.x_column,
@@ -87,19 +266,92 @@ def create_histogram(data: pd.DataFrame) -> go.Figure:
         logger.error(f"Failed to create histogram: {e}")
         raise PlotCreationError("Failed to create histogram") from e
 
-def create_box_plot(data: pd.DataFrame) -> go.Figure:
+def _aggregated_histogram(data: pd.DataFrame, config: Config) -> go.Figure:
+    """
+    Draws a histogram from bin counts (numeric column) or value counts (categorical column).
+    """
+    color = config.color_column if config.color_column in data.columns else None
+    if pd.api.types.is_numeric_dtype(data[config.x_column]):
+        bins = histogram_bins(data, config.x_column, bins=config.histogram_bins, group_column=color)
+        return create_binned_histogram(bins, config)
+
+    counts = category_counts(data, config.x_column, group_column=color)
+    groups = counts.groupby(color, sort=False) if color else [(None, counts)]
+    traces = [{
+        'type': 'bar',
+        'x': group[config.x_column].to_numpy(),
+        'y': group['count'].to_numpy(),
+        'name': None if name is None else str(name),
+        'showlegend': name is not None
+    } for name, group in groups]
+    return build_figure(
+        'category_histogram', config, traces,
+        xaxis=_titled(config.x_column),
+        yaxis=_titled('count'),
+        legend=_titled(color)
+    )
+
+@traced(frame='bins', result=figure_size)
+def create_binned_histogram(bins: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
+    """
+    Creates a histogram from precomputed bin counts using Plotly.
+
+    Args:
+        bins (pd.DataFrame): Columns 'bin_start', 'bin_end' and 'count', plus
+            Config.color_column when counts are split by color.
+        config (Config, optional): Plot settings; defaults to Config().
+
+    Returns:
+        go.Figure: Plotly figure object.
+    """
+    logger.info("Creating histogram from bin counts")
+    config = config or Config()
+    try:
+        _require_columns(bins, ['bin_start', 'bin_end', 'count'], 'binned histogram')
+        if config.color_column in bins.columns:
+            groups = bins.groupby(config.color_column, sort=False)
+        else:
+            groups = [(None, bins)]
+
+        traces = [{
+            'type': 'bar',
+            'x': ((group['bin_start'] + group['bin_end']) / 2).to_numpy(),
+            'y': group['count'].to_numpy(),
+            'width': (group['bin_end'] - group['bin_start']).to_numpy(),
+            'name': None if name is None else str(name),
+            'showlegend': name is not None
+        } for name, group in groups]
+        return build_figure(
+            'binned_histogram', config, traces,
+            xaxis=_titled(config.x_column),
+            yaxis=_titled('count'),
+            legend=_titled(config.color_column)
+        )
+    except Exception as e:
+        logger.error(f"Failed to create binned histogram: {e}")
+        raise PlotCreationError("Failed to create binned histogram") from e
+
+@traced(frame='data', result=figure_size)
+def create_box_plot(data: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
     """
     Creates an interactive box plot using Plotly.
 
+    Large data (see Config.aggregate_mode) is summarized server-side into
+    quartiles, whiskers and at most Config.box_max_outliers outliers per box.
+
     Args:
         data (pd.DataFrame): DataFrame containing the data.
+        config (Config, optional): Plot settings; defaults to Config().
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating box plot")
-    config = Config()
+    config = config or Config()
     try:
+        _require_columns(data, required_columns('box', config), 'box plot')
+        if _aggregate(config, len(data)):
+            return _aggregated_box_plot(data, config)
         fig = px.box(
             data,
             x=config.x_column,
@@ -113,19 +365,114 @@ def create_box_plot(data: pd.DataFrame) -> go.Figure:
         logger.error(f"Failed to create box plot: {e}")
         raise PlotCreationError("Failed to create box plot") from e
 
-def create_3d_scatter_plot(data: pd.DataFrame) -> go.Figure:
+def _aggregated_box_plot(data: pd.DataFrame, config: Config) -> go.Figure:
+    """
+    Draws a box plot from statistics computed over the data, one box per x value and color.
+    """
+    color = config.color_column if config.color_column in data.columns else None
+    x = config.x_column if config.x_column in data.columns else None
+    stats = box_statistics(
+        data,
+        config.y_column,
+        [col for col in (color, x) if col],
+        max_outliers=config.box_max_outliers
+    )
+    return create_summary_box_plot(stats, config)
+
+@traced(frame='stats', result=figure_size)
+def create_summary_box_plot(stats: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
+    """
+    Creates a box plot from precomputed box statistics using Plotly.
+
+    Args:
+        stats (pd.DataFrame): Columns 'q1', 'median', 'q3', 'lowerfence',
+            'upperfence', 'mean' and 'outliers', plus Config.color_column and
+            Config.x_column when boxes are split by them, as returned by
+            aggregation.box_statistics.
+        config (Config, optional): Plot settings; defaults to Config().
+
+    Returns:
+        go.Figure: Plotly figure object.
+    """
+    logger.info("Creating box plot from statistics")
+    config = config or Config()
+    try:
+        _require_columns(stats, ['q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'outliers'], 'summary box plot')
+        color = config.color_column if config.color_column in stats.columns else None
+        x = config.x_column if config.x_column in stats.columns else None
+        groups = stats.groupby(color, sort=False) if color else [(None, stats)]
+        traces = [{
+            'type': 'box',
+            'x': group[x].to_numpy() if x else None,
+            'q1': group['q1'].to_numpy(),
+            'median': group['median'].to_numpy(),
+            'q3': group['q3'].to_numpy(),
+            'lowerfence': group['lowerfence'].to_numpy(),
+            'upperfence': group['upperfence'].to_numpy(),
+            'mean': group['mean'].to_numpy(),
+            'y': [list(outliers) for outliers in group['outliers']],
+            'boxpoints': 'outliers',
+            'name': None if name is None else str(name),
+            'showlegend': name is not None
+        } for name, group in groups]
+        return build_figure(
+            'summary_box', config, traces,
+            xaxis=_titled(x),
+            yaxis=_titled(config.y_column),
+            legend=_titled(color)
+        )
+    except Exception as e:
+        logger.error(f"Failed to create summary box plot: {e}")
+        raise PlotCreationError("Failed to create summary box plot") from e
+
+@traced(frame='density', result=figure_size)
+def create_density_heatmap(density: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
+    """
+    Creates a heatmap of binned point counts, standing in for a scatter plot of many points.
+
+    Args:
+        density (pd.DataFrame): Counts indexed by y bin center, with x bin centers as columns.
+        config (Config, optional): Plot settings; defaults to Config().
+
+    Returns:
+        go.Figure: Plotly figure object.
+    """
+    logger.info("Creating density heatmap")
+    config = config or Config()
+    try:
+        heatmap = {
+            'type': 'heatmap',
+            'x': density.columns.to_numpy(),
+            'y': density.index.to_numpy(),
+            'z': density.to_numpy(),
+            'colorscale': _VIRIDIS,
+            'colorbar': {'title': {'text': 'count'}}
+        }
+        return build_figure(
+            'density_heatmap', config, [heatmap],
+            xaxis=_titled(config.x_column),
+            yaxis=_titled(config.y_column)
+        )
+    except Exception as e:
+        logger.error(f"Failed to create density heatmap: {e}")
+        raise PlotCreationError("Failed to create density heatmap") from e
+
+@traced(frame='data', result=figure_size)
+def create_3d_scatter_plot(data: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
     """
     Creates an interactive 3D scatter plot using Plotly.
 
     Args:
         data (pd.DataFrame): DataFrame containing the data.
+        config (Config, optional): Plot settings; defaults to Config().
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating 3D scatter plot")
-    config = Config()
+    config = config or Config()
     try:
+        _require_columns(data, required_columns('3d_scatter', config), '3D scatter plot')
         fig = px.scatter_3d(
             data, 
             x=config.x_column, 
@@ -140,24 +487,25 @@ def create_3d_scatter_plot(data: pd.DataFrame) -> go.Figure:
         logger.error(f"Failed to create 3D scatter plot: {e}")
         raise PlotCreationError("Failed to create 3D scatter plot") from e
 
-def create_geographical_map(data: pd.DataFrame) -> go.Figure:
+@traced(frame='data', result=figure_size)
+def create_geographical_map(data: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
     """
     Creates an interactive geographical map using Plotly.
 
     Args:
         data (pd.DataFrame): DataFrame containing the data.
+        config (Config, optional): Plot settings; defaults to Config().
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating geographical map")
-    config = Config()
+    config = config or Config()
     try:
-        required_columns = [config.latitude_column, config.longitude_column]
-        for col in required_columns:
-            if col not in data.columns:
-                raise ValueError(f"Missing required column '{col}' for geographical map.")
-        
+        _require_columns(data, required_columns('geo_map', config), 'geographical map')
+        if _rasterize(config, len(data)):
+            return _rasterized_geo_map(data, config)
+
         fig = px.scatter_geo(
             data,
             lat=config.latitude_column,
@@ -172,43 +520,242 @@ def create_geographical_map(data: pd.DataFrame) -> go.Figure:
         logger.error(f"Failed to create geographical map: {e}")
         raise PlotCreationError("Failed to create geographical map") from e
 
-def create_combined_plot(data: pd.DataFrame) -> go.Figure:
+def _rasterized_geo_map(data: pd.DataFrame, config: Config) -> go.Figure:
+    """
+    Draws a map with one marker per non-empty pixel of the rasterized points,
+    colored by the pixel's majority color or by its value.
+    """
+    raster = _raster(data, config.longitude_column, config.latitude_column, config)
+    traces = []
+    if raster.categories is not None:
+        majority = raster.counts.argmax(axis=0)
+        filled = raster.counts.sum(axis=0) > 0
+        colors = plotly.colors.qualitative.Plotly
+        for index, category in enumerate(raster.categories):
+            rows, columns = np.nonzero(filled & (majority == index))
+            traces.append({
+                'type': 'scattergeo',
+                'lon': raster.x_centers[columns],
+                'lat': raster.y_centers[rows],
+                'mode': 'markers',
+                'marker': {'symbol': 'square', 'size': 4, 'color': colors[index % len(colors)]},
+                'name': str(category)
+            })
+    else:
+        z = _raster_z(raster)
+        rows, columns = np.nonzero(np.isfinite(z))
+        traces.append({
+            'type': 'scattergeo',
+            'lon': raster.x_centers[columns],
+            'lat': raster.y_centers[rows],
+            'mode': 'markers',
+            'marker': {
+                'symbol': 'square', 'size': 4, 'color': z[rows, columns],
+                'colorscale': _VIRIDIS, 'colorbar': {'title': {'text': _raster_label(raster, config)}}
+            },
+            'showlegend': False
+        })
+    return build_figure(
+        'raster_geo_map', config, traces,
+        legend=_titled(config.color_column),
+        annotations=[_rasterized_annotation(raster)]
+    )
+
+def _rasterized_annotation(raster: Raster) -> dict:
+    return {
+        'text': f"Rasterized {raster.points:,} points",
+        'xref': 'paper', 'yref': 'paper', 'x': 1, 'y': 1.05,
+        'xanchor': 'right', 'yanchor': 'bottom',
+        'showarrow': False
+    }
+
+@traced(result=figure_size)
+def create_raster_plot(raster: Raster, config: Optional[Config] = None) -> go.Figure:
+    """
+    Creates a plot of rasterized points: a heatmap of a single layer, or an
+    image blending the colors of the categories.
+
+    Args:
+        raster (Raster): Pixel grid from aggregation.rasterize.
+        config (Config, optional): Plot settings; defaults to Config().
+
+    Returns:
+        go.Figure: Plotly figure object.
+    """
+    logger.info("Creating raster plot")
+    config = config or Config()
+    try:
+        yaxis = _titled(config.y_column)
+        if raster.categories is not None:
+            colors = plotly.colors.qualitative.Plotly
+            rgb = [plotly.colors.hex_to_rgb(color) for color in colors]
+            traces = [{
+                'type': 'image',
+                'z': shade(raster, rgb),
+                'colormodel': 'rgba',
+                'x0': raster.x_centers[0], 'dx': raster.x_edges[1] - raster.x_edges[0],
+                'y0': raster.y_centers[0], 'dy': raster.y_edges[1] - raster.y_edges[0],
+                'hoverinfo': 'x+y'
+            }]
+            # Legend entries for the blended categories
+            traces.extend({
+                'type': 'scatter',
+                'x': [None], 'y': [None], 'mode': 'markers',
+                'marker': {'color': colors[index % len(colors)], 'symbol': 'square'},
+                'name': str(category)
+            } for index, category in enumerate(raster.categories))
+            # Image traces otherwise flip the y axis and lock the aspect ratio
+            yaxis = {**(yaxis or {}), 'autorange': True, 'scaleanchor': False}
+        else:
+            traces = [{
+                'type': 'heatmap',
+                'x': raster.x_centers,
+                'y': raster.y_centers,
+                'z': _raster_z(raster),
+                'colorscale': _VIRIDIS,
+                'colorbar': {'title': {'text': _raster_label(raster, config)}}
+            }]
+        return build_figure(
+            'raster', config, traces,
+            xaxis=_titled(config.x_column),
+            yaxis=yaxis,
+            legend=_titled(config.color_column if raster.categories is not None else None),
+            annotations=[_rasterized_annotation(raster)]
+        )
+    except Exception as e:
+        logger.error(f"Failed to create raster plot: {e}")
+        raise PlotCreationError("Failed to create raster plot") from e
+
+def _combined_y_columns(config: Config) -> List[str]:
+    return list(config.combined_y_columns or [config.y_column])
+
+# Statistics of recent combined plots by data content and settings, reused
+# when a plot of the same data is only restyled
+_statistics = MemoryCache(
+    Config.statistics_cache_bytes,
+    sizeof=lambda entry: sum(int(frame.memory_usage().sum()) for frame in entry if frame is not None)
+)
+
+def _combined_statistics(data: pd.DataFrame, config: Config):
+    """
+    Computes the rolling and resampled statistics of a combined plot, or
+    returns those computed for data with the same content and settings.
+
+    The key hashes the values of the columns the statistics read, so frames
+    modified in place are not mistaken for the data they used to hold.
+
+    Returns:
+        Tuple[pd.DataFrame, Optional[pd.DataFrame]]: As rolling_statistics,
+        and as resampled_means when 'resample' is drawn.
+    """
+    y_columns = _combined_y_columns(config)
+    group = config.color_column if config.combined_by_color else None
+    statistics = list(config.combined_statistics)
+    settings = (config.x_column, y_columns, statistics, config.rolling_window, list(config.rolling_quantiles),
+                config.ewm_span, config.resample_rule, config.histogram_bins, group)
+    used = list(dict.fromkeys([config.x_column, *y_columns] + ([group] if group else [])))
+    content = hashlib.sha256(pd.util.hash_pandas_object(data[used], index=False).to_numpy().tobytes())
+    key = f"{content.hexdigest()}:{settings}"
+    entry = _statistics.get(key)
+    if entry is not None:
+        logger.debug("Reusing combined plot statistics")
+        return entry
+
+    rolling = rolling_statistics(
+        data, config.x_column, y_columns,
+        statistics=[statistic for statistic in statistics if statistic != 'resample'],
+        window=config.rolling_window,
+        quantiles=config.rolling_quantiles,
+        ewm_span=config.ewm_span,
+        group_column=group
+    )
+    resampled = None
+    if 'resample' in statistics:
+        resampled = resampled_means(data, config.x_column, y_columns, bins=config.histogram_bins,
+                                    rule=config.resample_rule, group_column=group)
+    _statistics.put(key, (rolling, resampled))
+    return rolling, resampled
+
+def _group_rows(frame: pd.DataFrame, group: Optional[str]) -> list:
+    """
+    Pairs every group of statistics sorted by group with the positions of its rows.
+    """
+    if group is None:
+        return [(None, slice(None))]
+    return list(frame.groupby(group, sort=False, observed=True).indices.items())
+
+def _combined_traces(rolling: pd.DataFrame, resampled: Optional[pd.DataFrame],
+                     config: Config, trace_type: str) -> List[dict]:
+    """
+    Traces of a combined plot: the points and the chosen statistics of every
+    y column, per group when the statistics are split by color.
+    """
+    x, y_columns = config.x_column, _combined_y_columns(config)
+    group = config.color_column if config.combined_by_color else None
+    resampled_rows = dict(_group_rows(resampled, group)) if resampled is not None else {}
+    traces = []
+    for key, rows in _group_rows(rolling, group):
+        frame = rolling.iloc[rows]
+        x_values = frame[x].to_numpy()
+        for column in y_columns:
+            parts = ([] if key is None else [str(key)]) + ([column] if key is None or len(y_columns) > 1 else [])
+            label = ' '.join(parts)
+
+            def line(suffix, y, **settings):
+                traces.append({'type': trace_type, 'x': x_values, 'y': y, 'mode': 'lines',
+                               'name': f"{label} {suffix}", 'legendgroup': label, **settings})
+
+            traces.append({'type': trace_type, 'x': x_values, 'y': frame[column].to_numpy(),
+                           'mode': 'markers', 'name': label, 'legendgroup': label})
+            for statistic in config.combined_statistics:
+                if statistic == 'mean':
+                    line('rolling mean', frame[f'{column} mean'].to_numpy())
+                elif statistic == 'median':
+                    line('rolling median', frame[f'{column} median'].to_numpy())
+                elif statistic == 'quantile':
+                    low, high = config.rolling_quantiles
+                    line(f'q{low:g}', frame[f'{column} q{low:g}'].to_numpy(), line={'width': 0}, showlegend=False)
+                    line(f'q{low:g}-q{high:g} band', frame[f'{column} q{high:g}'].to_numpy(),
+                         line={'width': 0}, fill='tonexty')
+                elif statistic == 'ewm':
+                    line('EWMA', frame[f'{column} ewm'].to_numpy())
+                elif statistic == 'resample' and key in resampled_rows:
+                    means = resampled.iloc[resampled_rows[key]]
+                    traces.append({'type': trace_type, 'x': means[x].to_numpy(), 'y': means[column].to_numpy(),
+                                   'mode': 'lines+markers', 'name': f"{label} resampled mean",
+                                   'legendgroup': label})
+    return traces
+
+@traced(frame='data', result=figure_size)
+def create_combined_plot(data: pd.DataFrame, config: Optional[Config] = None) -> go.Figure:
     """
     Creates a combined plot with multiple chart types using Plotly.
 
+    The points of every column of Config.combined_y_columns are drawn with
+    the statistics of Config.combined_statistics along x: rolling means,
+    medians and quantile bands, exponentially weighted means and means
+    over intervals of x, per color when Config.combined_by_color is set.
+    The statistics are computed over the data sorted by x, and kept for
+    replotting the same data with other styling.
+
     Args:
         data (pd.DataFrame): DataFrame containing the data.
+        config (Config, optional): Plot settings; defaults to Config().
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating combined plot")
-    config = Config()
+    config = config or Config()
     try:
-        fig = go.Figure()
-
-        # Add scatter plot
-        fig.add_trace(go.Scatter(
-            x=data[config.x_column],
-            y=data[config.y_column],
-            mode='markers',
-            name='Scatter'
-        ))
-
-        # Add line plot (rolling mean)
-        fig.add_trace(go.Scatter(
-            x=data[config.x_column],
-            y=data[config.y_column].rolling(window=5).mean(),
-            mode='lines',
-            name='Rolling Mean'
-        ))
-
-        fig.update_layout(
-            title=config.title,
-            template=config.theme
+        _require_columns(data, required_columns('combined', config), 'combined plot')
+        trace_type = 'scattergl' if _render_mode(config, len(data)) == 'webgl' else 'scatter'
+        rolling, resampled = _combined_statistics(data, config)
+        traces = _combined_traces(rolling, resampled, config, trace_type)
+        return build_figure(
+            'combined', config, traces,
+            legend=_titled(config.color_column) if config.combined_by_color else None
         )
-
-        return fig
     except KeyError as e:
         logger.error(f"Failed to create combined plot: {e}")
         raise PlotCreationError(f"Failed to create combined plot: {e}") from e
@@ -216,23 +763,148 @@ def create_combined_plot(data: pd.DataFrame) -> go.Figure:
         logger.error(f"Failed to create combined plot: {e}")
         raise PlotCreationError("Failed to create combined plot") from e
 
-def create_animated_scatter_plot(data: pd.DataFrame, animation_frame: str) -> go.Figure:
+def _animate_compactly(config: Config, n_rows: int, n_frames: int) -> bool:
+    """
+    Resolves Config.animation_mode to whether an animation is built from compact frames.
+    """
+    if config.animation_mode == 'auto':
+        return n_rows > config.animation_threshold or n_frames > config.animation_max_frames
+    if config.animation_mode not in ('always', 'never'):
+        raise ValueError(f"Unsupported animation mode: {config.animation_mode}")
+    return config.animation_mode == 'always'
+
+def _animation_frames(data: pd.DataFrame, animation_frame: str, config: Config) -> AnimationFrames:
+    """
+    Splits the points into frames and colors with the settings of Config.
+    """
+    return split_frames(
+        data, config.x_column, config.y_column, animation_frame,
+        color_column=config.color_column,
+        max_frames=config.animation_max_frames,
+        max_points=config.animation_max_points
+    )
+
+def _padded_range(values: np.ndarray) -> Optional[list]:
+    """
+    Axis range holding all values with some margin, so that frames share their axes.
+    """
+    if not len(values) or values.dtype.kind not in 'iuf':
+        return None
+    low, high = float(np.nanmin(values)), float(np.nanmax(values))
+    margin = (high - low) * 0.05 or 1.0
+    return [low - margin, high + margin]
+
+def _animation_controls(animation_frame: str, labels: list, redraw: bool) -> dict:
+    """
+    Play/pause buttons and the frame slider of an animation, laid out as in Plotly Express.
+    """
+    def animate(frames, duration):
+        return [frames, {'frame': {'duration': duration, 'redraw': redraw}, 'mode': 'immediate',
+                         'fromcurrent': True, 'transition': {'duration': 0, 'easing': 'linear'}}]
+
+    return {
+        'updatemenus': [{
+            'type': 'buttons', 'direction': 'left', 'showactive': False,
+            'x': 0.1, 'xanchor': 'right', 'y': 0, 'yanchor': 'top', 'pad': {'r': 10, 't': 70},
+            'buttons': [
+                {'label': '&#9654;', 'method': 'animate', 'args': animate(None, 500)},
+                {'label': '&#9724;', 'method': 'animate', 'args': animate([None], 0)},
+            ],
+        }],
+        'sliders': [{
+            'active': 0, 'currentvalue': {'prefix': f'{animation_frame}='}, 'len': 0.9,
+            'x': 0.1, 'xanchor': 'left', 'y': 0, 'yanchor': 'top', 'pad': {'b': 10, 't': 60},
+            'steps': [{'label': label, 'method': 'animate', 'args': animate([label], 0)} for label in labels],
+        }],
+    }
+
+def _compact_animation(frames: AnimationFrames, animation_frame: str, config: Config,
+                       embed_frames: bool) -> go.Figure:
+    """
+    Builds an animation whose frames only carry the x and y of every trace.
+
+    The traces' styling is set once on the figure, which shows the first
+    frame. Without embedded frames the figure has no frames nor controls,
+    and the frame names are listed in layout.meta.animation_frames for a
+    client that fetches the frames when they are shown.
+    """
+    trace_type = 'scattergl' if _render_mode(config, frames.max_frame_points) == 'webgl' else 'scatter'
+    first = frames.points(0) if len(frames) else [{'x': [], 'y': []} for _ in frames.traces]
+    traces = []
+    for name, points in zip(frames.traces, first):
+        trace = {'type': trace_type, 'mode': 'markers', 'x': points['x'], 'y': points['y']}
+        if name is not None:
+            trace.update(name=name, legendgroup=name, showlegend=True)
+        traces.append(trace)
+
+    def axis(column, values):
+        settings = _titled(column) or {}
+        value_range = _padded_range(values)
+        return {**settings, 'range': value_range} if value_range else settings
+
+    layout = {
+        'xaxis': axis(config.x_column, frames.x),
+        'yaxis': axis(config.y_column, frames.y),
+        'legend': _titled(config.color_column if frames.traces != [None] else None),
+    }
+    if frames.dropped:
+        layout['annotations'] = [{
+            'text': f"Showing at most {config.animation_max_points:,} points per frame",
+            'xref': 'paper', 'yref': 'paper', 'x': 1, 'y': 1.05,
+            'xanchor': 'right', 'yanchor': 'bottom', 'showarrow': False
+        }]
+    if not embed_frames:
+        layout['meta'] = {'animation_frames': frames.labels}
+        return build_figure('animation', config, traces, **layout)
+
+    layout.update(_animation_controls(animation_frame, frames.labels, trace_type == 'scattergl'))
+    trace_indices = list(range(len(frames.traces)))
+    animation = [
+        {'name': label, 'traces': trace_indices,
+         'data': [{'type': trace_type, **points} for points in frames.points(index)]}
+        for index, label in enumerate(frames.labels)
+    ]
+    return build_figure('animation', config, traces, frames=animation, **layout)
+
+@traced(frame='data', result=figure_size)
+def create_animated_scatter_plot(data: pd.DataFrame, animation_frame: str,
+                                 config: Optional[Config] = None, embed_frames: bool = True) -> go.Figure:
     """
     Creates an animated scatter plot using Plotly.
 
+    Small animations are built by Plotly Express. Large ones (see
+    Config.animation_mode) are built from compact frames: the frame values
+    are binned into at most Config.animation_max_frames frames, every frame
+    keeps at most Config.animation_max_points points, and the frames only
+    carry the points' x and y, so the figure's size no longer grows with
+    the number of frame values.
+
     Args:
         data (pd.DataFrame): DataFrame containing the data.
         animation_frame (str): Column name to use for animation frames.
+        config (Config, optional): Plot settings; defaults to Config().
+        embed_frames (bool): Include the frames in the figure; otherwise
+            compact frames are always used and only the first one is
+            included, for clients loading the others on demand.
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info("Creating animated scatter plot")
-    config = Config()
+    config = config or Config()
     try:
         if animation_frame not in data.columns:
             raise ValueError(f"Animation frame column '{animation_frame}' does not exist in the data.")
-        
+        _require_columns(
+            data,
+            required_columns('animated_scatter', config, animation_frame=animation_frame),
+            'animated scatter plot'
+        )
+        frame_sizes = data[animation_frame].value_counts()
+        if not embed_frames or _animate_compactly(config, len(data), len(frame_sizes)):
+            frames = _animation_frames(data, animation_frame, config)
+            return _compact_animation(frames, animation_frame, config, embed_frames)
+
         fig = px.scatter(
             data,
             x=config.x_column,
@@ -240,46 +912,93 @@ def create_animated_scatter_plot(data: pd.DataFrame, animation_frame: str) -> go
             color=config.color_column,
             animation_frame=animation_frame,
             title=config.title,
-            template=config.theme
+            template=config.theme,
+            render_mode=_render_mode(config, int(frame_sizes.max()))
         )
         return fig
     except Exception as e:
         logger.error(f"Failed to create animated scatter plot: {e}")
         raise PlotCreationError("Failed to create animated scatter plot") from e
 
+def _histogram_from_table(table, engine, config: Config) -> go.Figure:
+    """
+    Draws a histogram of a backend's table, counting large numeric columns
+    inside the backend so that only the bin counts reach pandas.
+    """
+    if engine.is_numeric(table, config.x_column) and _aggregate(config, engine.num_rows(table)):
+        color = config.color_column if config.color_column in engine.column_names(table) else None
+        bins = engine.histogram(table, config.x_column, bins=config.histogram_bins, group_column=color)
+        return create_binned_histogram(bins, config)
+    return create_histogram(engine.to_pandas(table), config)
+
+@traced(frame='data', result=figure_size)
 def create_plot(data: pd.DataFrame, plot_type: str, **kwargs) -> go.Figure:
     """
     Creates an interactive plot based on the specified plot type.
 
     Args:
-        data (pd.DataFrame): DataFrame containing the data.
+        data (pd.DataFrame or str): DataFrame containing the data, or the path of a
+            CSV file; only the columns the plot needs are loaded from the file,
+            by the execution backend of Config.backend.
         plot_type (str): Type of plot to create. Options: 'scatter', 'line', 'histogram', 'box', '3d_scatter', 'geo_map', 'combined', 'animated_scatter'.
         **kwargs: Additional keyword arguments for specific plot types.
+            config (Config): Plot settings passed to the plot builder.
+            render_mode (str): Overrides Config.render_mode ('auto', 'svg' or 'webgl').
+            aggregate_mode (str): Overrides Config.aggregate_mode ('auto', 'always' or 'never').
+            animation_frame (str): Column animated over; defaults to Config.animation_column.
+            embed_frames (bool): Include all frames of animations (see create_animated_scatter_plot).
+            chunksize (int): Rows per chunk when loading data from a path.
+            sample_rows (int): Maximum rows sampled when loading data from a path.
 
     Returns:
         go.Figure: Plotly figure object.
     """
     logger.info(f"Creating plot of type: {plot_type}")
     try:
+        config = kwargs.get('config')
+        if kwargs.get('render_mode'):
+            config = copy.copy(config or Config())
+            config.render_mode = kwargs['render_mode']
+        if kwargs.get('aggregate_mode'):
+            config = copy.copy(config or Config())
+            config.aggregate_mode = kwargs['aggregate_mode']
+        builder_kwargs = {'config': config} if config is not None else {}
+
+        if isinstance(data, str):
+            engine = get_backend((config or Config()).backend)
+            columns = required_columns(plot_type, config, animation_frame=kwargs.get('animation_frame'))
+            if (plot_type == 'histogram' and engine.name != 'pandas'
+                    and not kwargs.get('chunksize') and not kwargs.get('sample_rows')):
+                return _histogram_from_table(load_table(data, columns, backend=engine), engine, config or Config())
+            data = load_data(
+                data,
+                columns=columns,
+                chunksize=kwargs.get('chunksize'),
+                sample_rows=kwargs.get('sample_rows'),
+                backend=engine
+            )
+
         if plot_type == 'scatter':
-            return create_scatter_plot(data)
+            return create_scatter_plot(data, **builder_kwargs)
         elif plot_type == 'line':
-            return create_line_plot(data)
+            return create_line_plot(data, **builder_kwargs)
         elif plot_type == 'histogram':
-            return create_histogram(data)
+            return create_histogram(data, **builder_kwargs)
         elif plot_type == 'box':
-            return create_box_plot(data)
+            return create_box_plot(data, **builder_kwargs)
         elif plot_type == '3d_scatter':
-            return create_3d_scatter_plot(data)
+            return create_3d_scatter_plot(data, **builder_kwargs)
         elif plot_type == 'geo_map':
-            return create_geographical_map(data)
+            return create_geographical_map(data, **builder_kwargs)
         elif plot_type == 'combined':
-            return create_combined_plot(data)
+            return create_combined_plot(data, **builder_kwargs)
         elif plot_type == 'animated_scatter':
-            animation_frame = kwargs.get('animation_frame')
+            animation_frame = kwargs.get('animation_frame') or (config or Config()).animation_column
             if not animation_frame:
                 raise ValueError("Missing required argument: 'animation_frame'")
-            return create_animated_scatter_plot(data, animation_frame)
+            if 'embed_frames' in kwargs:
+                builder_kwargs['embed_frames'] = kwargs['embed_frames']
+            return create_animated_scatter_plot(data, animation_frame, **builder_kwargs)
         else:
             raise ValueError(f"Unsupported plot type: {plot_type}")
     except Exception as e:
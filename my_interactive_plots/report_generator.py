@@ -1,8 +1,16 @@
 # my_interactive_plots/report_generator.py
 
+import io
 import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 import pandas as pd
-from weasyprint import HTML
+from .config import Config
+from .html_export import figure_div, figure_json, write_html_document
+from .image_export import ImageExportService
+from .tracing import traced
 from .utils import setup_logging
 from .exceptions import PlotCreationError
 from pandas.errors import DataError  # Правильный импорт
@@ -11,33 +19,134 @@ from pandas.errors import DataError  # Правильный импорт
 setup_logging()
 logger = logging.getLogger(__name__)
 
-def generate_report(data: pd.DataFrame, plot_types: list, report_file: str):
+def _write_pdf(html_content: str, report_file: str):
+    """
+    Renders an HTML document to PDF; weasyprint is only imported when needed.
+    """
+    from weasyprint import HTML
+
+    HTML(string=html_content).write_pdf(report_file)
+
+# Set in each worker process by _init_worker, so the data is sent once per worker
+_worker_data = None
+_worker_config = None
+
+def _init_worker(data: pd.DataFrame, config: Optional[Config]):
+    """
+    Stores the report data in a worker process.
+    """
+    global _worker_data, _worker_config
+    _worker_data = data
+    _worker_config = config
+
+def _render_plot(plot_type: str, index: int, data: Optional[pd.DataFrame] = None,
+                 config: Optional[Config] = None) -> Tuple[str, float]:
+    """
+    Builds and serializes one plot, returning its JSON and the time taken.
+    """
+    from .plots import create_plot  # Import here to allow mocking during tests
+
+    if data is None:
+        data, config = _worker_data, _worker_config
+    start = time.perf_counter()
+    builder_kwargs = {'config': config} if config is not None else {}
+    fig = create_plot(data, plot_type, **builder_kwargs)
+    return figure_json(fig), time.perf_counter() - start
+
+def _render_plots(data: pd.DataFrame, plot_types: list, workers: int,
+                  config: Optional[Config]) -> Iterator[Tuple[str, float]]:
+    """
+    Yields the rendered plots in the order of plot_types, using a process pool
+    when more than one worker is requested.
+    """
+    if workers <= 1 or len(plot_types) <= 1:
+        for index, plot_type in enumerate(plot_types):
+            yield _render_plot(plot_type, index, data, config)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(plot_types)),
+                             initializer=_init_worker, initargs=(data, config)) as executor:
+        yield from executor.map(_render_plot, plot_types, range(len(plot_types)))
+
+@traced(frame='data', output='report_file')
+def generate_report(data: pd.DataFrame, plot_types: list, report_file: str,
+                    workers: Optional[int] = None, config: Optional[Config] = None,
+                    plotlyjs: Optional[str] = None, image_dir: Optional[str] = None,
+                    image_format: str = 'png') -> List[Tuple[str, float]]:
     """
     Generates an HTML report with the specified plots.
+
+    Plots are built and serialized in a process pool when several workers are
+    configured, and the document is written section by section in plot order.
+    Reports whose file name ends with .html or .htm (optionally followed by
+    .gz for a gzip-compressed report) are written as HTML with plotly.js
+    included once; other file names are rendered to PDF. With an image
+    directory, every plot is also exported as an image by an
+    ImageExportService while the report is being written.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data.
+        plot_types (list): Types of plots to include, in order.
+        report_file (str): Path of the report to write.
+        workers (int, optional): Worker processes; defaults to Config.report_workers.
+        config (Config, optional): Plot settings passed to the plot builders.
+        plotlyjs (str, optional): How HTML reports include plotly.js ('inline',
+            'cdn' or 'directory'); defaults to Config.plotlyjs_mode.
+        image_dir (str, optional): Directory receiving an image of each plot,
+            named <index>_<plot_type>.<image_format>.
+        image_format (str): Format of the exported images ('png', 'svg', 'pdf', ...).
+
+    Returns:
+        List[Tuple[str, float]]: Seconds spent building and serializing each plot.
     """
     logger.info("Generating report")
-    try:
-        from .plots import create_plot  # Import here to allow mocking during tests
-        
-        html_content = "<html><head><title>Data Report</title></head><body>"
-        html_content += "<h1>Data Report</h1>"
+    settings = config or Config()
+    if workers is None:
+        workers = settings.report_workers
+    timings = []
+    images = []
+    exporter = None
 
-        for plot_type in plot_types:
-            fig = create_plot(data, plot_type)
-            fig_html = fig.to_html(full_html=False)
-            html_content += f"<h2>{plot_type.capitalize()} Plot</h2>"
-            html_content += fig_html
+    def sections():
+        yield '', "<h1>Data Report</h1>"
+        rendered = _render_plots(data, plot_types, workers, config)
+        for index, (plot_type, (fig_json, seconds)) in enumerate(zip(plot_types, rendered)):
+            logger.info(f"Rendered {plot_type} plot in {seconds:.3f}s")
+            timings.append((plot_type, seconds))
+            if exporter is not None:
+                image_path = os.path.join(image_dir, f"{index}_{plot_type}.{image_format}")
+                images.append((image_path, exporter.submit(fig_json, image_path, image_format)))
+            yield f"{plot_type.capitalize()} Plot", figure_div(fig_json, f"plot-{index}")
 
-        html_content += "</body></html>"
-
-        HTML(string=html_content).write_pdf(report_file)
+    try:
+        if image_dir:
+            os.makedirs(image_dir, exist_ok=True)
+            exporter = ImageExportService(workers=min(settings.export_workers, len(plot_types)),
+                                          timeout=settings.export_timeout)
+        if report_file.lower().endswith(('.html', '.htm', '.html.gz', '.htm.gz')):
+            write_html_document(sections(), report_file, plotlyjs=plotlyjs or settings.plotlyjs_mode)
+        else:
+            document = io.StringIO()
+            document.write("<html><head><title>Data Report</title></head><body>")
+            for heading, fragment in sections():
+                if heading:
+                    document.write(f"<h2>{heading}</h2>")
+                document.write(fragment)
+            document.write("</body></html>")
+            _write_pdf(document.getvalue(), report_file)
         logger.info(f"Report saved to {report_file}")
+        for image_path, future in images:
+            future.result()
+            logger.info(f"Image saved to {image_path}")
+        return timings
     except ImportError as e:
         logger.error(f"ImportError: {e}")
         raise PlotCreationError("Failed to import necessary modules for report generation") from e
     except Exception as e:
         logger.error(f"Failed to generate report: {e}")
         raise PlotCreationError("Failed to generate report") from e
+    finally:
+        if exporter is not None:
+            exporter.close(wait=False)
 
 def generate_profile_report(data: pd.DataFrame, profile_file: str):
     """
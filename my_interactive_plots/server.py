@@ -0,0 +1,220 @@
+# my_interactive_plots/server.py
+
+import contextlib
+import io
+import json
+import logging
+import os
+import signal
+import socketserver
+import sys
+import time
+from typing import List, Optional
+
+import click
+
+from .client import ping, stop_daemon
+from .config import Config
+from .data_loader import enable_frame_cache
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class _StreamWriter(io.TextIOBase):
+    """
+    Text stream sending every write to the client as a message.
+    """
+
+    def __init__(self, connection, name: str):
+        self.connection = connection
+        self.name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # Tells click this is a text stream
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            self.connection.write(json.dumps({'stream': self.name, 'text': text}).encode('utf-8') + b'\n')
+            self.connection.flush()
+        return len(text)
+
+
+def run_cli(argv: List[str], cwd: Optional[str] = None, stdout=None, stderr=None) -> int:
+    """
+    Runs a `myplot` command line in this process, as the command would.
+
+    Args:
+        argv (List[str]): Arguments of `myplot`.
+        cwd (str, optional): Directory relative paths refer to during the job.
+        stdout (TextIO, optional): Receives the job's output; defaults to sys.stdout.
+        stderr (TextIO, optional): Receives the job's errors; defaults to sys.stderr.
+
+    Returns:
+        int: The exit code.
+    """
+    from .cli import cli
+
+    previous = os.getcwd()
+    start = time.perf_counter()
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with contextlib.redirect_stdout(stdout or sys.stdout), contextlib.redirect_stderr(stderr or sys.stderr):
+            try:
+                result = cli.main(args=list(argv), prog_name='myplot', standalone_mode=False)
+                return result if isinstance(result, int) else 0
+            except click.ClickException as e:
+                e.show()
+                return e.exit_code
+            except click.exceptions.Exit as e:
+                return e.exit_code
+            except click.Abort:
+                click.echo('Aborted!', err=True)
+                return 1
+    finally:
+        os.chdir(previous)
+        logger.info(f"Ran myplot {' '.join(argv)} in {time.perf_counter() - start:.3f}s")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """
+    Serves one request of the protocol described in client.send_request.
+    """
+
+    def _reply(self, message: dict):
+        self.wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            logger.warning("Ignored a malformed request")
+            return
+        kind = request.get('type')
+        try:
+            if kind == 'ping':
+                self._reply({'exit': 0, 'pid': os.getpid()})
+            elif kind == 'shutdown':
+                self.server.stopping = True
+                self._reply({'exit': 0})
+            elif kind == 'run':
+                code = run_cli(request.get('argv', []), request.get('cwd'),
+                               _StreamWriter(self.wfile, 'stdout'), _StreamWriter(self.wfile, 'stderr'))
+                self._reply({'exit': code})
+            else:
+                self._reply({'stream': 'stderr', 'text': f"Unknown request: {kind}\n"})
+                self._reply({'exit': 2})
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning("The client disconnected before its job finished")
+        except Exception as e:
+            logger.error(f"Request {kind} failed: {e}")
+            self._reply({'stream': 'stderr', 'text': f"Error: {e}\n"})
+            self._reply({'exit': 1})
+
+
+class _Server(socketserver.UnixStreamServer):
+    # Jobs change the working directory and redirect output, so they run one at a time
+    stopping = False
+
+
+def warm_up(warm_kaleido: bool = True):
+    """
+    Imports the CLI's modules, builds and serializes a small figure and
+    optionally starts the image renderer, so that jobs do not pay for them.
+
+    Args:
+        warm_kaleido (bool): Start the image renderer.
+    """
+    import pandas as pd
+
+    from . import cli  # noqa: F401
+    from .plots import create_plot
+
+    start = time.perf_counter()
+    config = Config()
+    data = pd.DataFrame({config.x_column: [1.0, 2.0], config.y_column: [2.0, 1.0], config.color_column: ['a', 'b']})
+    create_plot(data, 'scatter', config=config).to_html(include_plotlyjs=True)
+    if warm_kaleido:
+        from .image_export import _warm_renderer
+
+        _warm_renderer()
+    logger.info(f"Warmed up in {time.perf_counter() - start:.3f}s")
+
+
+def serve(socket_path: Optional[str] = None, frame_cache_bytes: Optional[int] = None,
+          warm_kaleido: Optional[bool] = None):
+    """
+    Runs the worker daemon until it is asked to stop.
+
+    The daemon executes the jobs forwarded by `myplot` (see client.main)
+    one at a time, in a process whose imports, image renderer and loaded
+    data (see data_loader.enable_frame_cache) stay warm between jobs. The
+    socket is only accessible to the user running the daemon.
+
+    Args:
+        socket_path (str, optional): Socket to listen on; defaults to Config.daemon_socket.
+        frame_cache_bytes (int, optional): Size cap of the loaded data kept in
+            memory; defaults to Config.daemon_frame_cache_bytes.
+        warm_kaleido (bool, optional): Start the image renderer before the
+            first job; defaults to Config.daemon_warm_kaleido.
+    """
+    config = Config()
+    socket_path = socket_path or config.daemon_socket
+    if ping(socket_path):
+        raise RuntimeError(f"A worker daemon is already listening on {socket_path}")
+    with contextlib.suppress(FileNotFoundError):
+        # Left behind by a daemon that did not exit cleanly
+        os.remove(socket_path)
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+
+    enable_frame_cache(config.daemon_frame_cache_bytes if frame_cache_bytes is None else frame_cache_bytes)
+    warm_up(config.daemon_warm_kaleido if warm_kaleido is None else warm_kaleido)
+    umask = os.umask(0o177)
+    try:
+        server = _Server(socket_path, _Handler)
+    finally:
+        os.umask(umask)
+    logger.info(f"Worker daemon {os.getpid()} listening on {socket_path}")
+    try:
+        while not server.stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_path)
+        enable_frame_cache(0)
+        logger.info("Worker daemon stopped")
+
+
+@click.command()
+@click.option('--stop', is_flag=True, help='Stop the running daemon once its current job is done')
+@click.option('--frame-cache-bytes', type=int, default=None,
+              help='Size cap of the loaded data kept in memory between jobs (0 disables)')
+@click.option('--no-kaleido', is_flag=True, help='Do not start the image renderer before the first job')
+def daemon(stop, frame_cache_bytes, no_kaleido):
+    """
+    Runs the worker daemon executing the jobs of `myplot` on Config.daemon_socket.
+    """
+    if stop:
+        if not stop_daemon():
+            click.echo(f"No worker daemon is listening on {Config.daemon_socket}")
+        return
+    # Exit through serve's cleanup, removing the socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        serve(frame_cache_bytes=frame_cache_bytes, warm_kaleido=False if no_kaleido else None)
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        click.echo(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    daemon()
@@ -0,0 +1,578 @@
+# my_interactive_plots/streaming.py
+
+import logging
+import math
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+from .config import Config
+from .data_loader import compile_filter, is_parquet, iter_csv, iter_parquet, project_columns, read_header
+from .exceptions import PlotCreationError
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Plot types that can be drawn from aggregates computed in one pass over a file
+STREAMING_PLOT_TYPES = ('scatter', 'histogram', 'box')
+
+
+def _numeric(values: pd.Series) -> np.ndarray:
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def iter_chunks(file_path: str, columns: Optional[List[str]] = None, chunksize: Optional[int] = None,
+                filter_column: Optional[str] = None, filter_value: Any = None,
+                where=None) -> Iterator[pd.DataFrame]:
+    """
+    Reads a CSV or Parquet file chunk by chunk, holding one chunk in memory at a time.
+
+    Chunks are filtered as soon as they are parsed; Parquet row groups whose
+    statistics rule out any match are skipped without being read.
+
+    Args:
+        file_path (str): Path to a CSV file, or a Parquet file (.parquet, .pq).
+        columns (List[str], optional): Columns to read; all columns when None.
+        chunksize (int, optional): Rows per chunk; defaults to Config.chunk_size.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        where (str or Predicate, optional): Filter expression, see filters.parse_filter.
+
+    Yields:
+        pd.DataFrame: The chunks, filtered.
+    """
+    chunksize = chunksize or Config().chunk_size
+    header = read_header(file_path)
+    predicate = compile_filter(header, where, filter_column, filter_value)
+    wanted = project_columns(header, columns, predicate)
+    if is_parquet(file_path):
+        yield from iter_parquet(file_path, wanted, predicate, chunksize)
+    else:
+        yield from iter_csv(file_path, wanted, predicate, chunksize)
+
+
+def parquet_range(file_path: str, column: str) -> Optional[Tuple[float, float]]:
+    """
+    Returns the range of a numeric Parquet column from its row group statistics.
+
+    Args:
+        file_path (str): Path to the Parquet file.
+        column (str): Column name.
+
+    Returns:
+        Optional[Tuple[float, float]]: Minimum and maximum, or None when any
+        row group lacks statistics for the column.
+    """
+    import pyarrow.parquet as pq
+
+    metadata = pq.ParquetFile(file_path).metadata
+    names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+    if column not in names:
+        return None
+    index = names.index(column)
+    low = high = None
+    for group in range(metadata.num_row_groups):
+        stats = metadata.row_group(group).column(index).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        if not isinstance(stats.min, (int, float)) or not isinstance(stats.max, (int, float)):
+            return None
+        low = stats.min if low is None else min(low, stats.min)
+        high = stats.max if high is None else max(high, stats.max)
+    if low is None:
+        return None
+    return float(low), float(high)
+
+
+class _Axis:
+    """
+    Equal-width bins over a range that doubles, merging pairs of bins, when
+    values fall outside of it, so data can be binned before its range is known.
+    """
+
+    def __init__(self, bins: int, value_range: Optional[Tuple[float, float]] = None):
+        self.bins = bins + bins % 2
+        self.low: Optional[float] = None
+        self.width: Optional[float] = None
+        self.fixed = value_range is not None
+        if value_range is not None:
+            low, high = value_range
+            self.low = float(low)
+            self.width = (high - low) / self.bins if high > low else 1.0
+
+    @property
+    def high(self) -> float:
+        return self.low + self.bins * self.width
+
+    def fit(self, low: float, high: float) -> List[str]:
+        """
+        Extends the range to cover [low, high] and returns the growth steps taken
+        ('down' or 'up'), which the counts must follow with _merge.
+        """
+        if self.fixed:
+            return []
+        if self.low is None:
+            span = high - low
+            self.low = low
+            self.width = span / self.bins * (1 + 1e-9) if span > 0 else max(abs(low), 1.0) * 1e-9
+            return []
+        steps = []
+        while low < self.low:
+            self.low -= self.bins * self.width
+            self.width *= 2
+            steps.append('down')
+        while high >= self.high:
+            self.width *= 2
+            steps.append('up')
+        return steps
+
+    def positions(self, values: np.ndarray) -> np.ndarray:
+        return np.clip(((values - self.low) / self.width).astype('int64'), 0, self.bins - 1)
+
+    def inside(self, values: np.ndarray) -> np.ndarray:
+        if not self.fixed:
+            return np.ones(len(values), dtype=bool)
+        return (values >= self.low) & (values <= self.high)
+
+    def edges(self) -> np.ndarray:
+        return self.low + np.arange(self.bins + 1) * self.width
+
+
+def _merge(counts: np.ndarray, axis: int, step: str) -> np.ndarray:
+    """
+    Merges pairs of bins along an axis after its range doubled.
+    """
+    merged = np.take(counts, np.arange(0, counts.shape[axis], 2), axis=axis) \
+        + np.take(counts, np.arange(1, counts.shape[axis], 2), axis=axis)
+    zeros = np.zeros_like(merged)
+    return np.concatenate((merged, zeros) if step == 'up' else (zeros, merged), axis=axis)
+
+
+def _trimmed(counts: np.ndarray, axis: int) -> slice:
+    """
+    Returns the slice of bins along an axis between the first and last non-empty bin.
+    """
+    other = tuple(i for i in range(counts.ndim) if i != axis)
+    filled = np.flatnonzero(counts.sum(axis=other) if other else counts)
+    if not len(filled):
+        return slice(0, 0)
+    return slice(filled[0], filled[-1] + 1)
+
+
+class StreamingHistogram:
+    """
+    Histogram counts per group, accumulated chunk by chunk.
+
+    Without a value range the bins adapt to the data seen so far, so at least
+    half of the requested bins cover the final range of the data.
+    """
+
+    def __init__(self, bins: int = 50, value_range: Optional[Tuple[float, float]] = None):
+        self.axis = _Axis(bins, value_range)
+        self.groups: Dict[Hashable, int] = {}
+        self.counts = np.zeros((0, self.axis.bins), dtype='int64')
+
+    def update(self, values: pd.Series, groups: Optional[pd.Series] = None):
+        """
+        Adds the values of one chunk.
+
+        Args:
+            values (pd.Series): Values to count.
+            groups (pd.Series, optional): Group of every value.
+        """
+        numbers = _numeric(values)
+        valid = np.isfinite(numbers)
+        if groups is not None:
+            valid &= groups.notna().to_numpy()
+        numbers = numbers[valid]
+        if not len(numbers):
+            return
+        for step in self.axis.fit(numbers.min(), numbers.max()):
+            self.counts = _merge(self.counts, 1, step)
+        inside = self.axis.inside(numbers)
+        numbers = numbers[inside]
+
+        if groups is None:
+            codes = np.zeros(len(numbers), dtype='int64')
+            keys = [None]
+        else:
+            codes, keys = pd.factorize(groups.to_numpy()[valid][inside])
+        rows = np.array([self.groups.setdefault(key, len(self.groups)) for key in keys], dtype='int64')
+        if len(self.groups) > len(self.counts):
+            grow = np.zeros((len(self.groups) - len(self.counts), self.axis.bins), dtype='int64')
+            self.counts = np.vstack((self.counts, grow))
+        flat = rows[codes] * self.axis.bins + self.axis.positions(numbers)
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def result(self, group_column: Optional[str] = None) -> pd.DataFrame:
+        """
+        Returns the counts in the layout of aggregation.histogram_bins, without
+        empty bins at either end.
+
+        Args:
+            group_column (str, optional): Name of the group column in the result.
+
+        Returns:
+            pd.DataFrame: Columns [group_column,] 'bin_start', 'bin_end' and 'count'.
+        """
+        if self.axis.low is None:
+            columns = ([group_column] if group_column else []) + ['bin_start', 'bin_end', 'count']
+            return pd.DataFrame(columns=columns)
+        keep = _trimmed(self.counts, 1)
+        edges = self.axis.edges()
+        starts, ends = edges[:-1][keep], edges[1:][keep]
+        counts = self.counts[:, keep]
+        result = pd.DataFrame({
+            'bin_start': np.tile(starts, len(self.groups)),
+            'bin_end': np.tile(ends, len(self.groups)),
+            'count': counts.ravel(),
+        })
+        if group_column:
+            result.insert(0, group_column, np.repeat(np.array(list(self.groups), dtype=object), len(starts)))
+        return result
+
+
+class StreamingDensity:
+    """
+    Two-dimensional point counts on a grid, accumulated chunk by chunk.
+    """
+
+    def __init__(self, bins: int = 200, x_range: Optional[Tuple[float, float]] = None,
+                 y_range: Optional[Tuple[float, float]] = None):
+        self.x_axis = _Axis(bins, x_range)
+        self.y_axis = _Axis(bins, y_range)
+        self.counts = np.zeros((self.y_axis.bins, self.x_axis.bins), dtype='int64')
+
+    def update(self, x: pd.Series, y: pd.Series):
+        """
+        Adds the points of one chunk.
+
+        Args:
+            x (pd.Series): X coordinates.
+            y (pd.Series): Y coordinates.
+        """
+        x_values, y_values = _numeric(x), _numeric(y)
+        valid = np.isfinite(x_values) & np.isfinite(y_values)
+        x_values, y_values = x_values[valid], y_values[valid]
+        if not len(x_values):
+            return
+        for step in self.x_axis.fit(x_values.min(), x_values.max()):
+            self.counts = _merge(self.counts, 1, step)
+        for step in self.y_axis.fit(y_values.min(), y_values.max()):
+            self.counts = _merge(self.counts, 0, step)
+        inside = self.x_axis.inside(x_values) & self.y_axis.inside(y_values)
+        flat = self.y_axis.positions(y_values[inside]) * self.x_axis.bins + self.x_axis.positions(x_values[inside])
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def result(self) -> pd.DataFrame:
+        """
+        Returns the counts indexed by y bin center, with x bin centers as
+        columns, without empty rows or columns at the borders.
+        """
+        if self.x_axis.low is None:
+            return pd.DataFrame()
+        rows, columns = _trimmed(self.counts, 0), _trimmed(self.counts, 1)
+        x_edges, y_edges = self.x_axis.edges(), self.y_axis.edges()
+        return pd.DataFrame(
+            self.counts[rows, columns],
+            index=((y_edges[:-1] + y_edges[1:]) / 2)[rows],
+            columns=((x_edges[:-1] + x_edges[1:]) / 2)[columns]
+        )
+
+
+class TDigest:
+    """
+    Mergeable sketch of a distribution answering approximate quantile queries.
+
+    Values are kept as weighted centroids, small near the tails and larger
+    around the median; `compression` bounds the number of centroids.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray, weights: Optional[np.ndarray] = None):
+        """
+        Adds values (finite floats) to the sketch.
+
+        Args:
+            values (np.ndarray): Values to add.
+            weights (np.ndarray, optional): Weight of every value; 1 by default.
+        """
+        if not len(values):
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        means = np.concatenate((self.means, values))
+        weights = np.concatenate((self.weights, np.ones(len(values)) if weights is None else weights))
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        quantiles = (cumulative - weights / 2) / cumulative[-1]
+        # k1 scale function: clusters are narrow at the tails, wide around the median
+        clusters = np.floor(self.compression * (np.arcsin(2 * quantiles - 1) / np.pi + 0.5)).astype('int64')
+        merged = np.bincount(clusters, weights=weights)
+        sums = np.bincount(clusters, weights=weights * means)
+        filled = merged > 0
+        self.weights = merged[filled]
+        self.means = sums[filled] / self.weights
+
+    def merge(self, other: 'TDigest'):
+        """
+        Adds the centroids of another sketch.
+        """
+        if other.count:
+            self.update(other.means, other.weights)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates the q-quantile (0 <= q <= 1) of the values added so far.
+        """
+        if not len(self.means):
+            return math.nan
+        cumulative = np.cumsum(self.weights)
+        centers = cumulative - self.weights / 2
+        total = cumulative[-1]
+        return float(np.interp(
+            q * total,
+            np.concatenate(([0.0], centers, [total])),
+            np.concatenate(([self.min], self.means, [self.max]))
+        ))
+
+
+class _BoxGroup:
+    """
+    Running box plot statistics of one group: a t-digest, exact count, sum,
+    and the most extreme values at both ends as outlier candidates.
+    """
+
+    def __init__(self, compression: int, max_extremes: int):
+        self.digest = TDigest(compression)
+        self.total = 0.0
+        self.max_extremes = max(max_extremes, 1)
+        self.lowest = np.empty(0)
+        self.highest = np.empty(0)
+
+    def update(self, values: np.ndarray):
+        self.digest.update(values)
+        self.total += float(values.sum())
+        k = self.max_extremes
+        lowest = np.concatenate((self.lowest, values))
+        highest = np.concatenate((self.highest, values))
+        self.lowest = np.sort(np.partition(lowest, k - 1)[:k]) if len(lowest) > k else np.sort(lowest)
+        self.highest = np.sort(np.partition(highest, -k)[-k:]) if len(highest) > k else np.sort(highest)
+
+    def statistics(self, whisker_width: float, max_outliers: int) -> Dict[str, Any]:
+        digest = self.digest
+        q1, median, q3 = (digest.quantile(q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        low_limit, high_limit = q1 - whisker_width * iqr, q3 + whisker_width * iqr
+        candidates = np.unique(np.concatenate((self.lowest, self.highest)))
+        outliers = candidates[(candidates < low_limit) | (candidates > high_limit)]
+        within = candidates[(candidates >= low_limit) & (candidates <= high_limit)]
+        centroids = digest.means[(digest.means >= low_limit) & (digest.means <= high_limit)]
+        within = np.concatenate((within, centroids)) if len(centroids) else within
+        if len(outliers) > max_outliers:
+            outliers = outliers[np.argsort(-np.abs(outliers - median), kind='stable')[:max_outliers]]
+        return {
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'lowerfence': float(within.min()) if len(within) else q1,
+            'upperfence': float(within.max()) if len(within) else q3,
+            'mean': self.total / digest.count,
+            'count': int(digest.count),
+            'outliers': outliers.tolist(),
+        }
+
+
+class StreamingBoxStatistics:
+    """
+    Approximate box plot statistics per group, accumulated chunk by chunk.
+
+    Quartiles come from a t-digest per group; whiskers and outliers are
+    exact while a group has at most max_outliers values beyond each
+    whisker, and approximate beyond that. Memory grows with the number of
+    groups, so more than max_groups groups raise a ValueError.
+    """
+
+    def __init__(self, group_columns: Sequence[str] = (), max_outliers: int = 1000,
+                 compression: int = 200, whisker_width: float = 1.5, max_groups: int = 10000):
+        self.group_columns = list(group_columns)
+        self.max_outliers = max_outliers
+        self.max_groups = max_groups
+        self.compression = compression
+        self.whisker_width = whisker_width
+        self.groups: Dict[Tuple, _BoxGroup] = {}
+
+    def update(self, chunk: pd.DataFrame, value_column: str):
+        """
+        Adds the values of one chunk.
+
+        Args:
+            chunk (pd.DataFrame): Chunk with the value column and the group columns.
+            value_column (str): Numeric column summarized by the boxes.
+        """
+        values = _numeric(chunk[value_column])
+        valid = np.isfinite(values)
+        if self.group_columns:
+            valid &= chunk[self.group_columns].notna().all(axis=1).to_numpy()
+            grouped = pd.Series(values[valid]).groupby(
+                [chunk[col].to_numpy()[valid] for col in self.group_columns], sort=False
+            )
+            parts = ((key if isinstance(key, tuple) else (key,), group.to_numpy()) for key, group in grouped)
+        else:
+            parts = [((), values[valid])]
+        for key, group_values in parts:
+            if key not in self.groups:
+                if len(self.groups) >= self.max_groups:
+                    raise ValueError(
+                        f"Box plot grouped by {', '.join(self.group_columns)} has more than {self.max_groups} "
+                        f"groups; raise Config.box_max_groups or group by a column with fewer values"
+                    )
+                self.groups[key] = _BoxGroup(self.compression, self.max_outliers)
+            self.groups[key].update(group_values)
+
+    def result(self) -> pd.DataFrame:
+        """
+        Returns the statistics in the layout of aggregation.box_statistics.
+        """
+        rows = []
+        for key in sorted(self.groups, key=lambda key: tuple(str(part) for part in key)):
+            row = dict(zip(self.group_columns, key))
+            row.update(self.groups[key].statistics(self.whisker_width, self.max_outliers))
+            rows.append(row)
+        columns = self.group_columns + ['q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'count', 'outliers']
+        return pd.DataFrame(rows, columns=columns)
+
+
+def _stream_columns(plot_type: str, config: Config, header: Sequence[str]) -> List[str]:
+    if plot_type == 'scatter':
+        return [config.x_column, config.y_column]
+    if plot_type == 'histogram':
+        return [col for col in (config.x_column, config.color_column) if col in header]
+    if plot_type == 'box':
+        return [col for col in (config.y_column, config.color_column, config.x_column) if col in header]
+    raise ValueError(f"Plot type '{plot_type}' cannot be aggregated while streaming")
+
+
+def aggregate_file(file_path: str, plot_types: Sequence[str], config: Optional[Config] = None,
+                   chunksize: Optional[int] = None, filter_column: Optional[str] = None,
+                   filter_value: Any = None, density_bins: int = 200, where=None) -> Dict[str, pd.DataFrame]:
+    """
+    Computes the aggregates of several plot types in one chunked pass over a file.
+
+    Memory use depends on the chunk size and the number of groups, not on the
+    size of the file. Parquet column ranges are taken from the file's
+    statistics; CSV ranges are discovered while streaming.
+
+    Args:
+        file_path (str): Path to a CSV or Parquet file.
+        plot_types (Sequence[str]): Any of STREAMING_PLOT_TYPES.
+        config (Config, optional): Plot settings; defaults to Config().
+        chunksize (int, optional): Rows per chunk; defaults to Config.chunk_size.
+        filter_column (str, optional): Column to filter on.
+        filter_value (Any, optional): Value rows of `filter_column` must equal.
+        density_bins (int): Grid bins per axis of scatter densities.
+        where (str or Predicate, optional): Filter expression, see filters.parse_filter.
+
+    Returns:
+        Dict[str, pd.DataFrame]: For each plot type, the input of its builder:
+        a density grid (scatter), bin counts (histogram) or box statistics (box).
+    """
+    config = config or Config()
+    parquet = is_parquet(file_path)
+    header = list(read_header(file_path))
+
+    def value_range(column):
+        return parquet_range(file_path, column) if parquet else None
+
+    columns: List[str] = []
+    for plot_type in plot_types:
+        columns += _stream_columns(plot_type, config, header)
+    for col in columns:
+        if col not in header:
+            raise ValueError(f"Missing required column '{col}' in {file_path}.")
+
+    color = config.color_column if config.color_column in header else None
+    box_groups = [col for col in (color, config.x_column) if col in header]
+    aggregators: Dict[str, Any] = {}
+    for plot_type in plot_types:
+        if plot_type == 'scatter':
+            aggregators[plot_type] = StreamingDensity(
+                density_bins, value_range(config.x_column), value_range(config.y_column)
+            )
+        elif plot_type == 'histogram':
+            aggregators[plot_type] = StreamingHistogram(config.histogram_bins, value_range(config.x_column))
+        else:
+            aggregators[plot_type] = StreamingBoxStatistics(box_groups, max_outliers=config.box_max_outliers,
+                                                            max_groups=config.box_max_groups)
+
+    rows = 0
+    for chunk in iter_chunks(file_path, list(dict.fromkeys(columns)), chunksize, filter_column, filter_value, where):
+        rows += len(chunk)
+        for plot_type, aggregator in aggregators.items():
+            if plot_type == 'scatter':
+                aggregator.update(chunk[config.x_column], chunk[config.y_column])
+            elif plot_type == 'histogram':
+                aggregator.update(chunk[config.x_column], chunk[color] if color else None)
+            else:
+                aggregator.update(chunk, config.y_column)
+    logger.info(f"Aggregated {rows} rows of {file_path} for {', '.join(plot_types)}")
+
+    results = {}
+    for plot_type, aggregator in aggregators.items():
+        if plot_type == 'histogram':
+            results[plot_type] = aggregator.result(color)
+        else:
+            results[plot_type] = aggregator.result()
+    return results
+
+
+def plot_file(file_path: str, plot_types: Sequence[str], config: Optional[Config] = None,
+              **kwargs: Any) -> Dict[str, go.Figure]:
+    """
+    Creates plots of a file too large for memory from aggregates computed in one pass.
+
+    Scatter plots are drawn as density heatmaps, histograms from bin counts
+    and box plots from approximate statistics.
+
+    Args:
+        file_path (str): Path to a CSV or Parquet file.
+        plot_types (Sequence[str]): Any of STREAMING_PLOT_TYPES.
+        config (Config, optional): Plot settings; defaults to Config().
+        **kwargs: chunksize, filter_column, filter_value, density_bins and where, see aggregate_file.
+
+    Returns:
+        Dict[str, go.Figure]: Figure of each plot type.
+    """
+    from .plots import create_binned_histogram, create_density_heatmap, create_summary_box_plot
+
+    config = config or Config()
+    try:
+        aggregates = aggregate_file(file_path, plot_types, config, **kwargs)
+    except (FileNotFoundError, ValueError):
+        raise
+    except Exception as e:
+        logger.error(f"Failed to aggregate {file_path}: {e}")
+        raise PlotCreationError(f"Failed to aggregate {file_path}") from e
+
+    builders = {
+        'scatter': create_density_heatmap,
+        'histogram': create_binned_histogram,
+        'box': create_summary_box_plot,
+    }
+    return {plot_type: builders[plot_type](aggregate, config) for plot_type, aggregate in aggregates.items()}
@@ -0,0 +1,255 @@
+# my_interactive_plots/tracing.py
+
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Sinks receiving finished spans; while empty, spans cost one list check
+_sinks: List[Any] = []
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """
+    A timed step, such as loading a file or building a figure.
+
+    Attributes:
+        name (str): What was timed, e.g. 'load_data'.
+        attributes (dict): Measurements such as 'rows', 'columns' and 'output_bytes'.
+        span_id (int): Identifier, unique within the process.
+        parent_id (int): Identifier of the enclosing span, if any.
+    """
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional['Span']):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+
+    def set(self, **attributes):
+        """
+        Adds measurements to the span.
+        """
+        self.attributes.update(attributes)
+
+
+class _NullSpan:
+    """
+    Stands in for a span while tracing is disabled.
+    """
+
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LogSink:
+    """
+    Writes each span as a log line.
+    """
+
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+
+    def emit(self, record: Dict[str, Any]):
+        details = ' '.join(f'{key}={value}' for key, value in record.items()
+                           if key not in ('name', 'seconds', 'start', 'span_id', 'parent_id'))
+        logger.log(self.level, f"{record['name']} took {record['seconds']:.4f}s {details}".rstrip())
+
+
+class JsonLinesSink:
+    """
+    Appends each span as one JSON object per line to a file.
+
+    Args:
+        path (str): File receiving the spans.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', buffering=1, encoding='utf-8')
+
+    def emit(self, record: Dict[str, Any]):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def close(self):
+        self._file.close()
+
+
+class MemorySink:
+    """
+    Keeps spans in a list, e.g. for tests.
+    """
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+
+    def emit(self, record: Dict[str, Any]):
+        self.spans.append(record)
+
+    def named(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Returns the recorded spans with the given name.
+        """
+        return [record for record in self.spans if record['name'] == name]
+
+    def clear(self):
+        self.spans.clear()
+
+
+def add_sink(sink):
+    """
+    Starts sending finished spans to a sink, an object with an emit(record) method.
+    """
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    """
+    Stops sending spans to a sink, closing it when it can be closed.
+    """
+    if sink in _sinks:
+        _sinks.remove(sink)
+    if hasattr(sink, 'close'):
+        sink.close()
+
+
+def enabled() -> bool:
+    """
+    Tells whether any sink receives spans.
+    """
+    return bool(_sinks)
+
+
+def configure_tracing(config: Optional[Config] = None):
+    """
+    Adds the sink selected by Config.trace_sink.
+
+    Args:
+        config (Config, optional): Settings; defaults to Config().
+
+    Returns:
+        The added sink, to be passed to remove_sink when done, or None when
+        tracing is not configured.
+    """
+    target = (config or Config()).trace_sink
+    if not target:
+        return None
+    sink = LogSink() if target == 'log' else JsonLinesSink(target)
+    add_sink(sink)
+    return sink
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """
+    Times the enclosed block as a span, nested in the span that is current.
+
+    Args:
+        name (str): What is timed.
+        **attributes: Measurements known up front; more can be added with Span.set.
+
+    Yields:
+        Span: The span, or a stand-in ignoring measurements while tracing is disabled.
+    """
+    if not _sinks:
+        yield _NULL_SPAN
+        return
+    current = Span(name, attributes, _current_span.get())
+    token = _current_span.set(current)
+    start = time.time()
+    started = time.perf_counter()
+    status = 'ok'
+    try:
+        yield current
+    except BaseException as e:
+        status = 'error'
+        current.set(error=f'{type(e).__name__}: {e}')
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        _current_span.reset(token)
+        record = {
+            'name': name,
+            'seconds': seconds,
+            'start': start,
+            'span_id': current.span_id,
+            'parent_id': current.parent_id,
+            'pid': os.getpid(),
+            'status': status,
+            **current.attributes,
+        }
+        for sink in list(_sinks):
+            try:
+                sink.emit(record)
+            except Exception as e:
+                logger.warning(f"Failed to record span {name}: {e}")
+
+
+def frame_shape(frame: Any) -> Dict[str, int]:
+    """
+    Returns the row and column counts of a DataFrame, or nothing for other values.
+    """
+    shape = getattr(frame, 'shape', None)
+    if shape is None or len(shape) != 2:
+        return {}
+    return {'rows': int(shape[0]), 'columns': int(shape[1])}
+
+
+def figure_size(fig: Any) -> Dict[str, int]:
+    """
+    Returns the trace count of a figure, or nothing for other values.
+    """
+    data = getattr(fig, 'data', None)
+    return {'traces': len(data)} if isinstance(data, tuple) else {}
+
+
+def traced(name: Optional[str] = None, frame: Optional[str] = None, output: Optional[str] = None,
+           result: Optional[Callable[[Any], Dict[str, Any]]] = None):
+    """
+    Records each call of the decorated function as a span.
+
+    Args:
+        name (str, optional): Span name; defaults to the function's name.
+        frame (str, optional): Argument whose rows and columns are recorded.
+        output (str, optional): Argument naming a file written by the call,
+            whose size is recorded as 'output_bytes'.
+        result (Callable, optional): Maps the return value to measurements.
+    """
+    def decorate(fn):
+        span_name = name or fn.__name__
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return fn(*args, **kwargs)
+            arguments = signature.bind_partial(*args, **kwargs).arguments if frame or output else {}
+            with span(span_name, **frame_shape(arguments.get(frame))) as current:
+                value = fn(*args, **kwargs)
+                if result is not None:
+                    current.set(**result(value))
+                path = arguments.get(output)
+                if isinstance(path, str) and os.path.exists(path):
+                    current.set(output_bytes=os.path.getsize(path))
+                return value
+        return wrapper
+    return decorate
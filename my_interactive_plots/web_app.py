@@ -1,7 +1,366 @@
+import copy
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
 import dash
+import pandas as pd
 from dash import html, dcc
-from dash.dependencies import Input, Output
-from .plots import create_plot
+from dash.dependencies import Input, Output, State
+from .cache import (
+    MemoryCache,
+    config_fingerprint,
+    get_figure_cache,
+    read_text,
+    source_key,
+    write_text
+)
+from .config import Config
+from .data_loader import load_data, load_data_tail
+from .jobs import JobQueue
+from .plots import _animation_frames, _rasterize, create_plot, required_columns
+from .tracing import configure_tracing
+from .utils import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Frames and serialized figures are kept per worker process in memory; figures
+# are also written to the disk cache, which all workers on the host share.
+_frames = MemoryCache(Config.memory_cache_bytes // 2, sizeof=lambda frame: int(frame.memory_usage(deep=True).sum()))
+_figures = MemoryCache(Config.memory_cache_bytes * 3 // 8)
+# Points of the animations shown, whose frames are sent one at a time
+_animations = MemoryCache(Config.memory_cache_bytes // 8, sizeof=lambda frames: frames.nbytes)
+# Loads and builds run in worker processes, keeping the web workers responsive
+_jobs = JobQueue()
+
+def _load_frame(data_source: str, columns: list) -> pd.DataFrame:
+    """
+    Loads the columns a plot needs, reusing frames loaded by earlier callbacks.
+    """
+    key = source_key(data_source, columns=columns)
+    data = _frames.get(key)
+    if data is None:
+        data = load_data(data_source, columns=columns)
+        _frames.put(key, data)
+    return data
+
+def _figure_key(data_source: str, plot_type: str, config: Config) -> str:
+    return source_key(data_source, plot_type=plot_type, config=config_fingerprint(config))
+
+def build_figure_json(data_source: str, plot_type: str, config: Optional[Config] = None) -> str:
+    """
+    Returns the serialized figure for a data source and plot type.
+
+    Figures are memoized by the data source's path, modification time and
+    size, the plot type and the plot settings, first in memory and then in
+    the shared disk cache. Animations only hold their first frame; the
+    others are sent when shown (see animation_frame_points).
+
+    Args:
+        data_source (str): Path to the data file.
+        plot_type (str): Type of plot to create.
+        config (Config, optional): Plot settings; defaults to Config().
+
+    Returns:
+        str: The figure as Plotly JSON.
+    """
+    config = config or Config()
+    key = _figure_key(data_source, plot_type, config)
+    fig_json = _figures.get(key)
+    if fig_json is not None:
+        return fig_json
+
+    disk_cache = get_figure_cache(config) if config.cache_enabled else None
+    if disk_cache is not None:
+        fig_json = read_text(disk_cache, key, '.json')
+    if fig_json is None:
+        data = _load_frame(data_source, required_columns(plot_type, config))
+        fig_json = create_plot(data, plot_type, config=config, embed_frames=False).to_json()
+        if disk_cache is not None:
+            write_text(disk_cache, key, '.json', fig_json)
+    _figures.put(key, fig_json)
+    return fig_json
+
+def animation_frame_points(data_source: str, frame: int, config: Optional[Config] = None) -> List[Dict[str, list]]:
+    """
+    Returns the points of one frame of an animated scatter plot.
+
+    The frames are split from the data once per worker process and are the
+    same as those of the figure built by build_figure_json.
+
+    Args:
+        data_source (str): Path to the data file.
+        frame (int): Position of the frame.
+        config (Config, optional): Plot settings; defaults to Config().
+
+    Returns:
+        List[Dict[str, list]]: The x and y of every trace of the figure.
+    """
+    config = config or Config()
+    key = _figure_key(data_source, 'animated_scatter', config)
+    frames = _animations.get(key)
+    if frames is None:
+        data = _load_frame(data_source, required_columns('animated_scatter', config))
+        frames = _animation_frames(data, config.animation_column, config)
+        _animations.put(key, frames)
+    return [{'x': points['x'].tolist(), 'y': points['y'].tolist()} for points in frames.points(frame)]
+
+# Plot types drawn on cartesian axes that are re-rasterized for the visible extent
+_ZOOMABLE_RASTER_TYPES = ('scatter',)
+
+def _visible_extent(relayout_data: Dict[str, Any]) -> Optional[Tuple[Optional[tuple], Optional[tuple]]]:
+    """
+    Reads the x and y ranges shown after a zoom or pan from a graph's relayoutData.
+
+    Returns:
+        The (x_range, y_range) pair, a range being None when its axis autoranges,
+        or None when the event did not change the axes.
+    """
+    ranges = []
+    changed = False
+    for axis in ('xaxis', 'yaxis'):
+        if f'{axis}.range[0]' in relayout_data:
+            ranges.append((relayout_data[f'{axis}.range[0]'], relayout_data[f'{axis}.range[1]']))
+            changed = True
+        elif f'{axis}.range' in relayout_data:
+            ranges.append(tuple(relayout_data[f'{axis}.range']))
+            changed = True
+        else:
+            changed = changed or relayout_data.get(f'{axis}.autorange', False)
+            ranges.append(None)
+    return tuple(ranges) if changed else None
+
+def _view_changed(plot_type: str, relayout_data: Optional[Dict[str, Any]]) -> bool:
+    """
+    Tells whether a zoom or pan may call for a new figure, without loading any data.
+    """
+    return relayout_data is None or (
+        plot_type in _ZOOMABLE_RASTER_TYPES and _visible_extent(relayout_data) is not None
+    )
+
+def figure_for_view(data_source: str, plot_type: str,
+                    relayout_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Returns the figure to show, re-rasterizing rasterized plots for the visible extent.
+
+    Args:
+        data_source (str): Path to the data file.
+        plot_type (str): Type of plot to create.
+        relayout_data (dict, optional): The graph's relayoutData after a zoom or pan.
+
+    Returns:
+        Optional[dict]: The figure, or None when the current figure can stay,
+        e.g. when a plot that is not rasterized was zoomed in the browser.
+    """
+    fig_json = _view_json(data_source, plot_type, relayout_data)
+    return None if fig_json is None else json.loads(fig_json)
+
+def _view_json(data_source: str, plot_type: str,
+               relayout_data: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    config = Config()
+    if relayout_data is not None:
+        extent = _visible_extent(relayout_data)
+        if extent is None or plot_type not in _ZOOMABLE_RASTER_TYPES:
+            return None
+        frame = _load_frame(data_source, required_columns(plot_type, config))
+        if not _rasterize(config, len(frame)):
+            return None
+        config = copy.copy(config)
+        config.raster_x_range, config.raster_y_range = extent
+    return build_figure_json(data_source, plot_type, config)
+
+# Plot types whose figures are extended with appended rows instead of rebuilt
+_INCREMENTAL_PLOT_TYPES = ('scatter', 'line')
+
+def _complete_offset(data_source: str) -> int:
+    """
+    Returns the byte offset just past the last complete line of a file.
+    """
+    with open(data_source, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        position = size
+        while position > 0:
+            start = max(position - 65536, 0)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            position = start
+    return 0
+
+def tail_state(data_source: str, plot_type: str) -> Dict[str, Any]:
+    """
+    Describes the figure shown for a data source, for later incremental refreshes.
+
+    The offset is taken before the figure is built, so rows appended while
+    it is built may be drawn twice but are never missed.
+
+    Args:
+        data_source (str): Path to the data file.
+        plot_type (str): Type of plot shown.
+
+    Returns:
+        dict: Source, plot type, byte offset and file size at build time,
+        trace names, whether the figure can be extended with new points,
+        and the names of the frames of animations (None for other figures).
+    """
+    offset = _complete_offset(data_source)
+    figure = json.loads(build_figure_json(data_source, plot_type))
+    traces = figure.get('data', [])
+    meta = figure.get('layout', {}).get('meta')
+    return {
+        'source': data_source,
+        'plot_type': plot_type,
+        'offset': offset,
+        'size': os.path.getsize(data_source),
+        'traces': [trace.get('name') for trace in traces],
+        'incremental': plot_type in _INCREMENTAL_PLOT_TYPES and bool(traces)
+                       and all(trace.get('type') in ('scatter', 'scattergl') for trace in traces),
+        'frames': meta.get('animation_frames') if isinstance(meta, dict) else None,
+    }
+
+def _extend_data(new_rows: pd.DataFrame, traces: List[Optional[str]], config: Config) -> Optional[list]:
+    """
+    Splits new rows over the figure's traces in Plotly's extendData format,
+    or returns None when a row belongs to no existing trace.
+    """
+    if config.color_column in new_rows.columns:
+        names = new_rows[config.color_column].astype(str)
+    else:
+        names = pd.Series(traces[0], index=new_rows.index)
+    if not names.isin(traces).all():
+        return None
+    updates: Dict[str, list] = {'x': [], 'y': []}
+    indices = []
+    for index, name in enumerate(traces):
+        rows = new_rows[names == name]
+        if len(rows):
+            updates['x'].append(rows[config.x_column].tolist())
+            updates['y'].append(rows[config.y_column].tolist())
+            indices.append(index)
+    return [updates, indices, config.max_points or None]
+
+def refresh_tail(state: Dict[str, Any]) -> Tuple[Optional[list], Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Brings the shown figure up to date with rows appended to its data source.
+
+    Only the rows after the remembered offset are parsed and sent as points
+    to extend the figure's traces. Figures that cannot be extended (other
+    plot types, new colors, a truncated or rewritten file) are rebuilt when
+    the file changed.
+
+    Args:
+        state (dict): State returned by tail_state or an earlier refresh.
+
+    Returns:
+        Tuple: extendData for the graph (or None), the new state, and a
+        rebuilt figure (or None).
+    """
+    data_source, plot_type = state['source'], state['plot_type']
+    size = os.path.getsize(data_source)
+    if size == state['size']:
+        return None, state, None
+    if size < state['offset'] or not state['incremental']:
+        return None, tail_state(data_source, plot_type), json.loads(build_figure_json(data_source, plot_type))
+
+    config = Config()
+    new_rows, offset = load_data_tail(data_source, state['offset'], required_columns(plot_type, config))
+    if not len(new_rows):
+        return None, state, None
+    extend = _extend_data(new_rows, state['traces'], config)
+    if extend is None:
+        return None, tail_state(data_source, plot_type), json.loads(build_figure_json(data_source, plot_type))
+    return extend, {**state, 'offset': offset, 'size': size}, None
+
+def _build_view(data_source: str, plot_type: str,
+                relayout_data: Optional[Dict[str, Any]] = None) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Job run by a worker process: builds the figure for a view and, for the
+    full extent, the state of later incremental refreshes.
+    """
+    if relayout_data is None:
+        state = tail_state(data_source, plot_type)
+        return build_figure_json(data_source, plot_type), state
+    return _view_json(data_source, plot_type, relayout_data), None
+
+BuildUpdate = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]], str]
+
+def start_build(data_source: str, plot_type: str, relayout_data: Optional[Dict[str, Any]] = None,
+                previous: Optional[Dict[str, Any]] = None) -> BuildUpdate:
+    """
+    Starts building the figure for a view in the background.
+
+    Figures already in this worker's memory are returned at once. Otherwise
+    the build is queued, joining an identical build requested by another
+    session, and the build of the superseded request is released, which
+    cancels it unless it already started or someone else waits for it.
+
+    Args:
+        data_source (str): Path to the data file.
+        plot_type (str): Type of plot to create.
+        relayout_data (dict, optional): The graph's relayoutData after a zoom or pan.
+        previous (dict, optional): The job started for the session's previous request.
+
+    Returns:
+        Tuple: As collect_build.
+    """
+    job = {
+        'key': json.dumps([data_source, plot_type, relayout_data], sort_keys=True),
+        'args': [data_source, plot_type, relayout_data],
+        'started': time.time(),
+    }
+    try:
+        cached = relayout_data is None and _figures.get(_figure_key(data_source, plot_type, Config())) is not None
+    except OSError:
+        # A missing source is reported by the build
+        cached = False
+    if cached:
+        update = (json.loads(build_figure_json(data_source, plot_type)), tail_state(data_source, plot_type), None, '')
+    else:
+        _jobs.submit(job['key'], _build_view, *job['args'])
+        update = collect_build(job)
+    if previous and previous['key'] != job['key']:
+        _jobs.release(previous['key'])
+    return update
+
+def collect_build(job: Dict[str, Any]) -> BuildUpdate:
+    """
+    Checks on a figure being built in the background.
+
+    Args:
+        job (dict): Job returned by start_build or an earlier check.
+
+    Returns:
+        Tuple: The figure (None to keep the current one), the state for
+        incremental refreshes (None to keep it), the job while it is still
+        running (None once it finished) and a status message.
+    """
+    future = _jobs.get(job['key'])
+    if future is None:
+        # Started by another web worker process; the figure caches make joining it cheap
+        future = _jobs.submit(job['key'], _build_view, *job['args'])
+    if not future.done():
+        if future.running():
+            return None, None, job, f"Building figure... {time.time() - job['started']:.0f}s"
+        return None, None, job, 'Waiting for a free worker...'
+    _jobs.release(job['key'])
+    try:
+        fig_json, state = future.result()
+    except Exception as e:
+        logger.error(f"Failed to build figure for {job['args']}: {e}")
+        return None, None, None, f"Failed to build the figure: {e}"
+    data_source, plot_type, relayout_data = job['args']
+    if fig_json is None:
+        return None, state, None, ''
+    if relayout_data is None:
+        _figures.put(_figure_key(data_source, plot_type, Config()), fig_json)
+    return json.loads(fig_json), state, None, ''
+
+# Timing spans of the loads and builds behind the callbacks, when Config.trace_sink is set
+configure_tracing()
 
 app = dash.Dash(__name__)
 
@@ -21,22 +380,154 @@ app.layout = html.Div([
             {'label': 'Histogram', 'value': 'histogram'},
             {'label': 'Box Plot', 'value': 'box'},
             {'label': '3D Scatter Plot', 'value': '3d_scatter'},
-            {'label': 'Geographical Map', 'value': 'geo_map'}
+            {'label': 'Geographical Map', 'value': 'geo_map'},
+            {'label': 'Animated Scatter Plot', 'value': 'animated_scatter'}
         ],
         value='scatter',
         clearable=False
     ),
+    dcc.Checklist(
+        id='live-refresh',
+        options=[{'label': 'Live refresh', 'value': 'live'}],
+        value=[]
+    ),
+    html.Div(id='build-status'),
     dcc.Graph(id='interactive-plot'),
+    html.Div(id='animation-controls', style={'display': 'none'}, children=[
+        html.Button('Play', id='animation-play'),
+        dcc.Slider(id='animation-slider', min=0, max=0, step=1, value=0, marks=None),
+    ]),
+    dcc.Interval(id='animation-interval', interval=Config.animation_frame_ms, disabled=True),
+    dcc.Interval(id='refresh-interval', interval=Config.refresh_interval_ms, disabled=True),
+    dcc.Interval(id='build-poll', interval=Config.build_poll_ms, disabled=True),
+    dcc.Store(id='tail-state'),
+    dcc.Store(id='build-job'),
 ])
 
+def _build_outputs(update: BuildUpdate) -> tuple:
+    figure, state, job, status = update
+    return (
+        dash.no_update if figure is None else figure,
+        dash.no_update if state is None else state,
+        job,
+        job is None,
+        status
+    )
+
 @app.callback(
-    Output('interactive-plot', 'figure'),
+    [Output('interactive-plot', 'figure'),
+     Output('tail-state', 'data'),
+     Output('build-job', 'data'),
+     Output('build-poll', 'disabled'),
+     Output('build-status', 'children')],
     [Input('plot-type-dropdown', 'value'),
-     Input('data-source-input', 'value')]
+     Input('data-source-input', 'value'),
+     Input('interactive-plot', 'relayoutData')],
+    State('build-job', 'data')
+)
+def update_graph(plot_type, data_source, relayout_data=None, job=None):
+    if relayout_data is not None and dash.ctx.triggered_id != 'interactive-plot':
+        # A new plot or source starts from the full extent
+        relayout_data = None
+    if not _view_changed(plot_type, relayout_data):
+        return (dash.no_update,) * 5
+    return _build_outputs(start_build(data_source, plot_type, relayout_data, job))
+
+@app.callback(
+    [Output('interactive-plot', 'figure', allow_duplicate=True),
+     Output('tail-state', 'data', allow_duplicate=True),
+     Output('build-job', 'data', allow_duplicate=True),
+     Output('build-poll', 'disabled', allow_duplicate=True),
+     Output('build-status', 'children', allow_duplicate=True)],
+    Input('build-poll', 'n_intervals'),
+    State('build-job', 'data'),
+    prevent_initial_call=True
+)
+def poll_build(n_intervals, job):
+    if not job:
+        return dash.no_update, dash.no_update, None, True, dash.no_update
+    return _build_outputs(collect_build(job))
+
+@app.callback(
+    Output('refresh-interval', 'disabled'),
+    Input('live-refresh', 'value')
+)
+def toggle_live_refresh(live):
+    return 'live' not in (live or [])
+
+@app.callback(
+    [Output('interactive-plot', 'extendData'),
+     Output('tail-state', 'data', allow_duplicate=True),
+     Output('interactive-plot', 'figure', allow_duplicate=True)],
+    Input('refresh-interval', 'n_intervals'),
+    State('tail-state', 'data'),
+    prevent_initial_call=True
+)
+def extend_graph(n_intervals, state):
+    if not state:
+        return dash.no_update, dash.no_update, dash.no_update
+    extend, new_state, figure = refresh_tail(state)
+    return (
+        dash.no_update if extend is None else extend,
+        dash.no_update if new_state is state else new_state,
+        dash.no_update if figure is None else figure
+    )
+
+@app.callback(
+    [Output('animation-controls', 'style'),
+     Output('animation-slider', 'max'),
+     Output('animation-slider', 'marks'),
+     Output('animation-slider', 'value'),
+     Output('animation-interval', 'disabled'),
+     Output('animation-play', 'children')],
+    Input('tail-state', 'data')
+)
+def setup_animation(state):
+    labels = (state or {}).get('frames')
+    if not labels:
+        return {'display': 'none'}, 0, None, 0, True, 'Play'
+    step = max(1, len(labels) // 10)
+    marks = {index: labels[index] for index in range(0, len(labels), step)}
+    return {'display': 'block'}, len(labels) - 1, marks, 0, True, 'Play'
+
+@app.callback(
+    Output('interactive-plot', 'figure', allow_duplicate=True),
+    Input('animation-slider', 'value'),
+    State('tail-state', 'data'),
+    prevent_initial_call=True
+)
+def show_frame(frame, state):
+    if not state or not state.get('frames') or frame is None:
+        return dash.no_update
+    # Only the points of the frame are sent; the figure's styling stays in the browser
+    figure = dash.Patch()
+    for index, points in enumerate(animation_frame_points(state['source'], frame)):
+        figure['data'][index]['x'] = points['x']
+        figure['data'][index]['y'] = points['y']
+    return figure
+
+@app.callback(
+    [Output('animation-interval', 'disabled', allow_duplicate=True),
+     Output('animation-play', 'children', allow_duplicate=True)],
+    Input('animation-play', 'n_clicks'),
+    State('animation-interval', 'disabled'),
+    prevent_initial_call=True
+)
+def toggle_animation(n_clicks, paused):
+    return not paused, 'Play' if not paused else 'Pause'
+
+@app.callback(
+    Output('animation-slider', 'value', allow_duplicate=True),
+    Input('animation-interval', 'n_intervals'),
+    [State('animation-slider', 'value'),
+     State('tail-state', 'data')],
+    prevent_initial_call=True
 )
-def update_graph(plot_type, data_source):
-    fig = create_plot(data_source, plot_type)
-    return fig
+def advance_animation(n_intervals, frame, state):
+    labels = (state or {}).get('frames')
+    if not labels:
+        return dash.no_update
+    return ((frame or 0) + 1) % len(labels)
 
 if __name__ == '__main__':
     app.run_server(debug=True)
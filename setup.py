@@ -11,7 +11,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
    install_requires=[
-        'pandas>=1.0.0',
+        'pandas>=2.0.0',
         'plotly>=5.0.0',
         'click>=8.0.0',
         'requests>=2.25.0',
@@ -37,7 +37,8 @@ setup(
     python_requires='>=3.6',
     entry_points={
         'console_scripts': [
-            'myplot=my_interactive_plots.cli:cli'
+            'myplot=my_interactive_plots.client:main',
+            'myplot-daemon=my_interactive_plots.server:daemon'
         ],
     },
 )
@@ -0,0 +1,155 @@
+# tests/test_aggregation.py
+
+import unittest
+import numpy as np
+import pandas as pd
+from my_interactive_plots.aggregation import (
+    box_statistics,
+    category_counts,
+    histogram_bins,
+    rasterize,
+    resampled_means,
+    rolling_statistics,
+    shade
+)
+
+class TestHistogramBins(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'value': [0.0, 1.0, 2.0, 3.0, 4.0, np.nan, 4.0],
+            'group': ['a', 'a', 'b', 'b', 'b', 'a', None]
+        })
+
+    def test_counts_per_group(self):
+        bins = histogram_bins(self.data, 'value', bins=2, group_column='group')
+        self.assertEqual(list(bins.columns), ['group', 'bin_start', 'bin_end', 'count'])
+        self.assertEqual(bins['group'].tolist(), ['a', 'a', 'b', 'b'])
+        self.assertEqual(bins['count'].tolist(), [2, 0, 0, 3])
+        self.assertEqual(bins['bin_start'].tolist(), [0.0, 2.0, 0.0, 2.0])
+
+    def test_counts_match_numpy(self):
+        values = np.random.default_rng(0).normal(size=10000)
+        bins = histogram_bins(pd.DataFrame({'value': values}), 'value', bins=20)
+        expected, edges = np.histogram(values, bins=20)
+        self.assertEqual(bins['count'].tolist(), expected.tolist())
+        np.testing.assert_allclose(bins['bin_start'], edges[:-1])
+
+    def test_value_range(self):
+        bins = histogram_bins(self.data, 'value', bins=2, value_range=(0.0, 2.0))
+        self.assertEqual(bins['count'].tolist(), [1, 2])
+
+    def test_category_counts(self):
+        counts = category_counts(self.data, 'group')
+        self.assertEqual(counts.set_index('group')['count'].to_dict(), {'a': 3, 'b': 3})
+
+class TestBoxStatistics(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'value': [1, 2, 3, 4, 5, 6, 7, 100, -50, 1, 1, 2],
+            'group': ['a'] * 9 + ['b'] * 3
+        })
+
+    def test_statistics_per_group(self):
+        stats = box_statistics(self.data, 'value', ['group']).set_index('group')
+        a = self.data.loc[self.data['group'] == 'a', 'value']
+        self.assertAlmostEqual(stats.loc['a', 'q1'], a.quantile(0.25))
+        self.assertAlmostEqual(stats.loc['a', 'median'], a.median())
+        self.assertAlmostEqual(stats.loc['a', 'q3'], a.quantile(0.75))
+        self.assertEqual(stats.loc['a', 'lowerfence'], 1)
+        self.assertEqual(stats.loc['a', 'upperfence'], 7)
+        self.assertEqual(sorted(stats.loc['a', 'outliers']), [-50, 100])
+        self.assertEqual(stats.loc['b', 'outliers'], [])
+        self.assertEqual(stats['count'].tolist(), [9, 3])
+
+    def test_outliers_are_capped_to_most_extreme(self):
+        stats = box_statistics(self.data, 'value', ['group'], max_outliers=1)
+        self.assertEqual(stats.loc[0, 'outliers'], [100.0])
+
+class TestRasterize(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'x': [0.0, 0.1, 0.9, 1.0, 5.0],
+            'y': [0.0, 0.1, 0.9, 1.0, np.nan],
+            'value': [1.0, 3.0, 10.0, 20.0, 0.0],
+            'group': ['a', 'b', 'a', 'a', 'b']
+        })
+
+    def test_count(self):
+        raster = rasterize(self.data, 'x', 'y', width=2, height=2, x_range=(0, 1), y_range=(0, 1))
+        self.assertEqual(raster.counts.tolist(), [[2, 0], [0, 2]])
+        self.assertEqual(raster.x_centers.tolist(), [0.25, 0.75])
+        self.assertEqual(raster.points, 4)
+
+    def test_mean(self):
+        raster = rasterize(self.data, 'x', 'y', width=2, height=2, how='mean', value_column='value')
+        self.assertEqual(raster.values[0, 0], 2.0)
+        self.assertEqual(raster.values[1, 1], 15.0)
+        self.assertTrue(np.isnan(raster.values[0, 1]))
+
+    def test_categories_and_shade(self):
+        raster = rasterize(self.data, 'x', 'y', width=2, height=2, category_column='group')
+        self.assertEqual(raster.categories, ['a', 'b'])
+        self.assertEqual(raster.counts[:, 0, 0].tolist(), [1, 1])
+        image = shade(raster, [(255, 0, 0), (0, 0, 255)])
+        self.assertEqual(image.shape, (2, 2, 4))
+        self.assertEqual(image[0, 0].tolist()[:3], [128, 0, 128])
+        self.assertEqual(image[0, 1, 3], 0)
+        self.assertEqual(image[1, 1].tolist(), [255, 0, 0, 255])
+
+class TestRollingStatistics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame({
+            'x': rng.permutation(200).astype('float64'),
+            'a': rng.normal(size=200),
+            'b': rng.normal(size=200),
+            'group': rng.choice(['p', 'q', 'r'], size=200)
+        })
+
+    def test_statistics_over_sorted_x(self):
+        stats = rolling_statistics(self.data, 'x', ['a', 'b'], ['mean', 'median', 'quantile', 'ewm'],
+                                   window=10, quantiles=(0.25,))
+        expected = self.data.sort_values('x').reset_index(drop=True)
+        np.testing.assert_array_equal(stats['x'], expected['x'])
+        for column in ('a', 'b'):
+            rolling = expected[column].rolling(10)
+            np.testing.assert_allclose(stats[f'{column} mean'], rolling.mean())
+            np.testing.assert_allclose(stats[f'{column} median'], rolling.median())
+            np.testing.assert_allclose(stats[f'{column} q0.25'], rolling.quantile(0.25))
+            np.testing.assert_allclose(stats[f'{column} ewm'], expected[column].ewm(span=20).mean())
+
+    def test_statistics_per_group(self):
+        stats = rolling_statistics(self.data, 'x', ['a'], ['mean', 'ewm'], window=5, group_column='group')
+        expected = self.data.sort_values(['group', 'x']).reset_index(drop=True)
+        self.assertEqual(stats['group'].tolist(), expected['group'].tolist())
+        by_group = expected.groupby('group')['a']
+        np.testing.assert_allclose(stats['a mean'], by_group.rolling(5).mean().to_numpy())
+        np.testing.assert_allclose(stats['a ewm'], by_group.ewm(span=20).mean().to_numpy())
+
+    def test_time_windows(self):
+        data = pd.DataFrame({'t': pd.date_range('2024-01-01', periods=6, freq='h')[::-1], 'v': np.arange(6.0)})
+        stats = rolling_statistics(data, 't', ['v'], window='2h')
+        self.assertEqual(stats['v'].tolist(), [5.0, 4.0, 3.0, 2.0, 1.0, 0.0])
+        self.assertEqual(stats['v mean'].tolist(), [5.0, 4.5, 3.5, 2.5, 1.5, 0.5])
+
+    def test_unsupported_statistic(self):
+        with self.assertRaises(ValueError):
+            rolling_statistics(self.data, 'x', ['a'], ['mode'])
+
+    def test_resampled_means(self):
+        data = pd.DataFrame({'x': [0.0, 1.0, 2.0, 3.0, 4.0], 'a': [1.0, 3.0, 5.0, 7.0, 9.0],
+                             'group': ['p', 'p', 'q', 'q', 'q']})
+        means = resampled_means(data, 'x', ['a'], bins=2)
+        self.assertEqual(means['x'].tolist(), [1.0, 3.0])
+        self.assertEqual(means['a'].tolist(), [2.0, 7.0])
+        self.assertEqual(means['count'].tolist(), [2, 3])
+        means = resampled_means(data, 'x', ['a'], rule=2, group_column='group')
+        self.assertEqual(means[['group', 'x', 'a']].values.tolist(),
+                         [['p', 1.0, 2.0], ['q', 3.0, 6.0], ['q', 5.0, 9.0]])
+        times = pd.DataFrame({'t': pd.date_range('2024-01-01', periods=4, freq='12h'), 'a': [1.0, 2.0, 3.0, 4.0]})
+        means = resampled_means(times, 't', ['a'], rule='1D')
+        self.assertEqual(means['t'].tolist(), [pd.Timestamp('2024-01-01 12:00'), pd.Timestamp('2024-01-02 12:00')])
+        self.assertEqual(means['a'].tolist(), [1.5, 3.5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_animation.py
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots.animation import bin_frames, split_frames
+
+class TestAnimation(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame({
+            'x': rng.normal(size=3000),
+            'y': rng.normal(size=3000),
+            'year': np.repeat(np.arange(2000, 2030), 100),
+            'species': rng.choice(['a', 'b', 'c'], size=3000, p=[0.6, 0.3, 0.1])
+        })
+
+    def test_few_values_are_frames_in_order(self):
+        codes, labels = bin_frames(pd.Series([3, 1, 2, 1, None]), 10)
+        self.assertEqual(labels, ['1.0', '2.0', '3.0'])
+        self.assertEqual(list(codes), [2, 0, 1, 0, -1])
+        codes, labels = bin_frames(pd.Series(['late', 'early', 'late']), 10)
+        self.assertEqual(labels, ['late', 'early'])
+
+    def test_many_values_are_binned(self):
+        codes, labels = bin_frames(self.data['year'], 10)
+        self.assertEqual(len(labels), 10)
+        self.assertEqual(labels[0], '2000')
+        self.assertTrue(np.all(np.diff(codes) >= 0))
+        codes, labels = bin_frames(pd.Series(pd.date_range('2020-01-01', periods=100, freq='D')), 4)
+        self.assertEqual(labels[0], '2020-01-01 00:00:00')
+        self.assertEqual(np.bincount(codes).sum(), 100)
+        codes, labels = bin_frames(pd.Series([f'k{i:02d}' for i in range(20)]), 4)
+        self.assertEqual(labels, ['k00 - k04', 'k05 - k09', 'k10 - k14', 'k15 - k19'])
+
+    def test_frames_are_sampled_to_the_point_budget(self):
+        frames = split_frames(self.data, 'x', 'y', 'year', 'species', max_frames=10, max_points=50)
+        self.assertEqual(len(frames), 10)
+        self.assertCountEqual(frames.traces, ['a', 'b', 'c'])
+        self.assertEqual(frames.max_frame_points, 50)
+        self.assertEqual(frames.dropped, 3000 - 500)
+        points = frames.points(3)
+        self.assertEqual(sum(len(trace['x']) for trace in points), 50)
+        # Every kept point is a point of the data, in its frame and color
+        rows = self.data.set_index(['x', 'y'])
+        for name, trace in zip(frames.traces, points):
+            for x, y in zip(trace['x'], trace['y']):
+                self.assertEqual(rows.loc[(x, y), 'species'], name)
+                self.assertIn(rows.loc[(x, y), 'year'], range(2009, 2012))
+
+    def test_splitting_is_deterministic(self):
+        first = split_frames(self.data, 'x', 'y', 'year', 'species', max_points=20)
+        second = split_frames(self.data, 'x', 'y', 'year', 'species', max_points=20)
+        np.testing.assert_array_equal(first.x, second.x)
+        np.testing.assert_array_equal(first.offsets, second.offsets)
+        everything = split_frames(self.data, 'x', 'y', 'year')
+        self.assertEqual(everything.traces, [None])
+        self.assertEqual(everything.dropped, 0)
+        self.assertEqual(len(everything.x), 3000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_backends.py
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots.aggregation import histogram_bins
+from my_interactive_plots.backends import get_backend
+from my_interactive_plots.config import Config
+from my_interactive_plots.data_loader import aggregate_from_file, histogram_from_file, load_data
+from my_interactive_plots.plots import create_plot
+
+# Backends whose engine is installed
+BACKENDS = ['pandas'] + [name for name, module in (('pyarrow', 'pyarrow'), ('polars', 'polars'))
+                         if importlib.util.find_spec(module) is not None]
+
+class TestBackends(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame({
+            'sepal_width': rng.normal(3, 0.5, 1000),
+            'sepal_length': rng.normal(6, 0.8, 1000),
+            'species': rng.choice(['setosa', 'versicolor', 'virginica'], 1000),
+            'batch': rng.integers(0, 4, 1000)
+        })
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, 'iris.csv')
+        self.data.to_csv(self.path, index=False)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_backend('spark')
+
+    def test_load_data_filters_and_projects(self):
+        expected = self.data.loc[self.data['batch'] == 2, ['sepal_width', 'batch']].reset_index(drop=True)
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                data = load_data(self.path, columns=['sepal_width'], filter_column='batch', filter_value=2,
+                                 use_cache=False, backend=backend)
+                pd.testing.assert_frame_equal(data.reset_index(drop=True), expected, check_dtype=False)
+
+    def test_histograms_match_pandas(self):
+        expected = histogram_bins(self.data, 'sepal_width', bins=20, group_column='species')
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                bins = histogram_from_file(self.path, 'sepal_width', bins=20, group_column='species', backend=backend)
+                pd.testing.assert_frame_equal(bins, expected, check_dtype=False)
+
+    def test_aggregates_match_pandas(self):
+        expected = self.data.groupby('species')['sepal_length'].agg(['count', 'sum', 'mean', 'min', 'max'])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                result = aggregate_from_file(self.path, ['species'], 'sepal_length',
+                                             ['count', 'sum', 'mean', 'min', 'max'], backend=backend)
+                self.assertEqual(list(result.columns), ['species', 'count', 'sum', 'mean', 'min', 'max'])
+                np.testing.assert_allclose(result[['count', 'sum', 'mean', 'min', 'max']].to_numpy(dtype=float),
+                                           expected.to_numpy(dtype=float))
+        with self.assertRaises(ValueError):
+            aggregate_from_file(self.path, ['species'], 'sepal_length', ['mode'])
+
+    @unittest.skipUnless('pyarrow' in BACKENDS, 'pyarrow is not installed')
+    def test_engine_filters_compare_in_the_column_type(self):
+        bins = histogram_from_file(self.path, 'sepal_width', filter_column='batch', filter_value='1', backend='pyarrow')
+        self.assertEqual(bins['count'].sum(), (self.data['batch'] == 1).sum())
+        data = load_data(self.path, filter_column='batch', filter_value='one', use_cache=False, backend='pyarrow')
+        self.assertEqual(len(data), 0)
+
+    @unittest.skipUnless('pyarrow' in BACKENDS, 'pyarrow is not installed')
+    def test_create_plot_counts_histograms_in_the_backend(self):
+        config = Config()
+        config.backend = 'pyarrow'
+        config.aggregate_mode = 'always'
+        fig = create_plot(self.path, 'histogram', config=config)
+        self.assertEqual(fig.data[0].type, 'bar')
+        self.assertEqual(sum(sum(trace.y) for trace in fig.data), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# tests/test_batch.py
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from click.testing import CliRunner
+from my_interactive_plots import batch as batch_module, client
+from my_interactive_plots.batch import batch, load_manifest, run_batch
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.iris_path = os.path.join(self.temp_dir.name, 'iris.csv')
+        self.geo_path = os.path.join(self.temp_dir.name, 'geo_data.csv')
+        pd.DataFrame({
+            'sepal_length': [5.1, 4.9, 4.7, 7.0],
+            'sepal_width': [3.5, 3.0, 3.2, 3.2],
+            'petal_length': [1.4, 1.4, 1.3, 4.7],
+            'species': ['setosa', 'setosa', 'setosa', 'versicolor']
+        }).to_csv(self.iris_path, index=False)
+        pd.DataFrame({
+            'latitude': [34.05, 36.16],
+            'longitude': [-118.24, -115.15],
+            'species': ['setosa', 'versicolor']
+        }).to_csv(self.geo_path, index=False)
+
+    def _write_manifest(self, manifest):
+        path = os.path.join(self.temp_dir.name, 'manifest.json')
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+        return path
+
+    def _output(self, name):
+        return os.path.join(self.temp_dir.name, 'out', name)
+
+    def test_load_manifest_merges_defaults(self):
+        path = self._write_manifest({
+            'defaults': {'theme': 'plotly_white'},
+            'jobs': [
+                {'source': self.iris_path, 'plot_type': 'scatter', 'output': 'a.html'},
+                {'source': self.iris_path, 'plot_type': 'box', 'output': 'b.html', 'theme': 'ggplot2'}
+            ]
+        })
+        jobs = load_manifest(path)['jobs']
+        self.assertEqual([job['theme'] for job in jobs], ['plotly_white', 'ggplot2'])
+
+    def test_load_manifest_missing_key(self):
+        path = self._write_manifest({'jobs': [{'source': self.iris_path, 'plot_type': 'scatter'}]})
+        with self.assertRaises(ValueError):
+            load_manifest(path)
+
+    def test_source_is_loaded_once(self):
+        jobs = [
+            {'name': name, 'source': self.iris_path, 'plot_type': name, 'output': self._output(f"{name}.html")}
+            for name in ('scatter', 'histogram', 'box')
+        ]
+        with patch('my_interactive_plots.batch.load_data', wraps=batch_module.load_data) as mock_load_data:
+            results = run_batch(jobs, workers=1)
+        mock_load_data.assert_called_once()
+        self.assertEqual([result['status'] for result in results], ['ok'] * 3)
+        for name in ('scatter', 'histogram', 'box'):
+            self.assertTrue(os.path.exists(self._output(f"{name}.html")))
+
+    def test_shared_filter_is_applied_while_loading(self):
+        jobs = [
+            {'name': name, 'source': self.iris_path, 'plot_type': name, 'where': "species != 'setosa'",
+             'output': self._output(f"{name}.html")}
+            for name in ('scatter', 'histogram')
+        ]
+        with patch('my_interactive_plots.batch.load_data', wraps=batch_module.load_data) as mock_load_data:
+            results = run_batch(jobs, workers=1)
+        self.assertEqual(str(mock_load_data.call_args.kwargs['where']), "species != 'setosa'")
+        self.assertEqual([result['status'] for result in results], ['ok'] * 2)
+
+    def test_run_batch_in_pool_keeps_order_and_reports_failures(self):
+        jobs = [
+            {'name': 'map', 'source': self.geo_path, 'plot_type': 'geo_map', 'output': self._output('map.html')},
+            {'name': 'setosa', 'source': self.iris_path, 'plot_type': 'scatter',
+             'filter_column': 'species', 'filter_value': 'setosa', 'output': self._output('setosa.html')},
+            {'name': 'missing', 'source': self.iris_path, 'plot_type': 'geo_map', 'output': self._output('bad.html')},
+            {'name': 'nofile', 'source': os.path.join(self.temp_dir.name, 'none.csv'),
+             'plot_type': 'scatter', 'output': self._output('none.html')}
+        ]
+        results = run_batch(jobs, workers=2)
+        self.assertEqual([result['name'] for result in results], ['map', 'setosa', 'missing', 'nofile'])
+        self.assertEqual([result['status'] for result in results], ['ok', 'ok', 'failed', 'failed'])
+        self.assertIn("latitude", results[2]['error'])
+
+    @patch('my_interactive_plots.image_export.pio.write_image')
+    def test_image_jobs_go_through_export_service(self, mock_write_image):
+        jobs = [
+            {'name': 'png', 'source': self.iris_path, 'plot_type': 'scatter', 'output': self._output('scatter.png')},
+            {'name': 'html', 'source': self.iris_path, 'plot_type': 'box', 'output': self._output('box.html')}
+        ]
+        results = run_batch(jobs, workers=1, export_workers=0)
+        self.assertEqual([result['status'] for result in results], ['ok', 'ok'])
+        self.assertNotIn('image', results[0])
+        mock_write_image.assert_called_once()
+        self.assertEqual(mock_write_image.call_args.args[1], self._output('scatter.png'))
+
+    def test_batch_command_summary(self):
+        path = self._write_manifest({
+            'workers': 1,
+            'jobs': [
+                {'source': self.iris_path, 'plot_type': 'line', 'output': self._output('line.html')},
+                {'source': self.iris_path, 'plot_type': 'unknown', 'output': self._output('unknown.html')}
+            ]
+        })
+        result = CliRunner().invoke(batch, [path])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('1 succeeded, 1 failed', result.output)
+
+    def test_batch_subcommand_of_myplot(self):
+        path = self._write_manifest({
+            'jobs': [{'source': self.iris_path, 'plot_type': 'line', 'output': self._output('line.html')}]
+        })
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertRaises(SystemExit) as exit_info:
+            client.main(['batch', path, '--workers', '1'])
+        self.assertEqual(exit_info.exception.code, 0)
+        self.assertIn('1 succeeded, 0 failed', output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# tests/test_benchmarks.py
+
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.suite import compare, geo_like, iris_like, main, parse_size
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size('1k'), 1000)
+        self.assertEqual(parse_size('10M'), 10_000_000)
+        self.assertEqual(parse_size('2500'), 2500)
+
+    def test_synthetic_data_matches_the_sample_files(self):
+        self.assertEqual(list(iris_like(10).columns),
+                         ['sepal_length', 'sepal_width', 'petal_length', 'petal_width', 'species'])
+        self.assertEqual(list(geo_like(10).columns), ['latitude', 'longitude', 'species'])
+        self.assertEqual(len(iris_like(123)), 123)
+
+    def test_compare_reports_slower_and_failing_stages(self):
+        baseline = {'results': [
+            {'dataset': 'iris', 'rows': 10, 'stage': 'load_data', 'plot_type': None, 'median_seconds': 1.0},
+            {'dataset': 'iris', 'rows': 10, 'stage': 'create_plot', 'plot_type': 'box', 'median_seconds': 1.0},
+            {'dataset': 'iris', 'rows': 10, 'stage': 'to_json', 'plot_type': 'box', 'median_seconds': 1.0},
+        ]}
+        results = {'results': [
+            {'dataset': 'iris', 'rows': 10, 'stage': 'load_data', 'plot_type': None, 'median_seconds': 1.1},
+            {'dataset': 'iris', 'rows': 10, 'stage': 'create_plot', 'plot_type': 'box', 'median_seconds': 1.5},
+            {'dataset': 'iris', 'rows': 10, 'stage': 'to_json', 'plot_type': 'box', 'error': 'ValueError: x'},
+        ]}
+        regressions = compare(results, baseline, tolerance=0.2)
+        self.assertEqual([(r['stage'], r['plot_type']) for r in regressions],
+                         [('create_plot', 'box'), ('to_json', 'box')])
+
+    def test_run_writes_json_results(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'results.json')
+            status = main(['--sizes', '200', '--plot-types', 'scatter,geo_map', '--repeat', '1',
+                           '--data-dir', temp_dir, '--output', output])
+            self.assertEqual(status, 0)
+            with open(output) as f:
+                results = json.load(f)
+        stages = [(r['dataset'], r['stage'], r['plot_type']) for r in results['results']]
+        self.assertEqual(stages, [
+            ('iris', 'load_data', None), ('geo', 'load_data', None),
+            ('iris', 'create_plot', 'scatter'), ('iris', 'to_json', 'scatter'), ('iris', 'to_html', 'scatter'),
+            ('geo', 'create_plot', 'geo_map'), ('geo', 'to_json', 'geo_map'), ('geo', 'to_html', 'geo_map'),
+            ('iris', 'generate_report', None),
+        ])
+        self.assertTrue(all(r['peak_memory_bytes'] > 0 for r in results['results']))
+        self.assertGreater(results['results'][3]['output_bytes'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 # tests/test_cli.py
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 from click.testing import CliRunner
 from build.lib.my_interactive_plots.exceptions import PlotCreationError
 from my_interactive_plots.cli import cli
@@ -100,7 +100,8 @@ class TestCLI(unittest.TestCase):
             ])
             self.assertEqual(result.exit_code, 0)
             self.assertIn('Report saved to report.html', result.output)
-            mock_generate_report.assert_called_once_with(pd.read_csv('iris.csv'), ['scatter'], 'report.html')
+            mock_generate_report.assert_called_once_with(pd.read_csv('iris.csv'), ['scatter'], 'report.html',
+                                                         config=ANY, plotlyjs='inline')
 
     @patch('my_interactive_plots.report_generator.generate_report')
     def test_cli_generate_report_failure_invalid_output_format(self, mock_generate_report):
@@ -116,7 +117,8 @@ class TestCLI(unittest.TestCase):
             ])
             self.assertNotEqual(result.exit_code, 0)
             self.assertIn('Error: Unsupported export format.', result.output)
-            mock_generate_report.assert_called_once_with(pd.read_csv('iris.csv'), ['scatter'], 'report.txt')
+            mock_generate_report.assert_called_once_with(pd.read_csv('iris.csv'), ['scatter'], 'report.txt',
+                                                         config=ANY, plotlyjs='inline')
 
     @patch('my_interactive_plots.report_generator.generate_profile_report')
     def test_cli_generate_profile_report_success(self, mock_generate_profile_report):
@@ -0,0 +1,245 @@
+# tests/test_data_loader.py
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from my_interactive_plots import cache
+from my_interactive_plots.config import Config
+from my_interactive_plots.data_loader import (
+    load_data,
+    load_data_tail,
+    load_data_from_db,
+    enable_frame_cache,
+    histogram_from_db,
+    aggregate_from_db,
+    get_engine,
+    dispose_engines
+)
+from my_interactive_plots.exceptions import PlotCreationError
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+class TestLoadData(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.data_path = os.path.join(self.temp_dir.name, 'iris.csv')
+        n = 1000
+        self.data = pd.DataFrame({
+            'sepal_length': np.linspace(4.0, 8.0, n),
+            'sepal_width': np.linspace(2.0, 4.5, n),
+            'petal_length': np.linspace(1.0, 7.0, n),
+            'petal_width': np.linspace(0.1, 2.5, n),
+            'species': np.resize(['setosa', 'versicolor', 'virginica'], n)
+        })
+        self.data.to_csv(self.data_path, index=False)
+
+    def test_load_all_columns(self):
+        data = load_data(self.data_path)
+        pd.testing.assert_frame_equal(data, self.data)
+
+    def test_load_projected_columns(self):
+        data = load_data(self.data_path, columns=['species', 'sepal_width', 'missing'])
+        self.assertEqual(list(data.columns), ['sepal_width', 'species'])
+        self.assertEqual(len(data), len(self.data))
+
+    def test_chunked_filter(self):
+        data = load_data(self.data_path, columns=['sepal_width'], chunksize=100,
+                         filter_column='species', filter_value='setosa')
+        expected = self.data[self.data['species'] == 'setosa']
+        self.assertEqual(len(data), len(expected))
+        self.assertTrue((data['species'] == 'setosa').all())
+        np.testing.assert_array_equal(data.index, expected.index)
+
+    def test_chunked_sample(self):
+        data = load_data(self.data_path, chunksize=64, sample_rows=100, seed=1)
+        self.assertEqual(len(data), 100)
+        self.assertTrue(data.index.is_monotonic_increasing)
+        pd.testing.assert_frame_equal(data, self.data.loc[data.index])
+
+    def test_missing_filter_column(self):
+        with self.assertRaises(ValueError):
+            load_data(self.data_path, filter_column='color', filter_value='red')
+
+    def test_frame_cache_keeps_loaded_frames(self):
+        enable_frame_cache(10 * 1024 ** 2)
+        self.addCleanup(enable_frame_cache, 0)
+        first = load_data(self.data_path, columns=['sepal_width'])
+        self.assertIs(load_data(self.data_path, columns=['sepal_width']), first)
+        self.assertIsNot(load_data(self.data_path, columns=['sepal_width'], use_cache=False), first)
+        self.data.iloc[:10].to_csv(self.data_path, index=False)
+        self.assertEqual(len(load_data(self.data_path, columns=['sepal_width'])), 10)
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            load_data(os.path.join(self.temp_dir.name, 'nonexistent.csv'))
+
+    def test_load_tail_parses_only_appended_rows(self):
+        data, offset = load_data_tail(self.data_path, columns=['sepal_width', 'species'])
+        self.assertEqual(len(data), len(self.data))
+        self.assertEqual(offset, os.path.getsize(self.data_path))
+        with open(self.data_path, 'a') as f:
+            f.write('5.0,3.0,1.5,0.2,setosa\n6.0,2.0,4.0,1.0,versi')
+        data, offset = load_data_tail(self.data_path, offset, columns=['sepal_width', 'species'])
+        self.assertEqual(data.to_dict('records'), [{'sepal_width': 3.0, 'species': 'setosa'}])
+        # The partly written line is parsed once complete
+        with open(self.data_path, 'a') as f:
+            f.write('color\n')
+        data, offset = load_data_tail(self.data_path, offset)
+        self.assertEqual(data['species'].tolist(), ['versicolor'])
+        self.assertEqual(offset, os.path.getsize(self.data_path))
+
+    def test_unparseable_file(self):
+        with open(self.data_path, 'w') as f:
+            f.write('')
+        with self.assertRaises(PlotCreationError):
+            load_data(self.data_path)
+
+class TestLoadDataFromDB(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.addCleanup(dispose_engines)
+        self.connection_string = f"sqlite:///{os.path.join(self.temp_dir.name, 'iris.db')}"
+        self.data = pd.DataFrame({
+            'sepal_length': [5.1, 4.9, 4.7, 7.0, 6.4, 6.3],
+            'sepal_width': [3.5, 3.0, 3.2, 3.2, 3.2, 3.3],
+            'species': ['setosa', 'setosa', 'setosa', 'versicolor', 'versicolor', 'virginica']
+        })
+        self.data.to_sql('iris', get_engine(self.connection_string), index=False)
+
+    def test_engine_is_pooled(self):
+        self.assertIs(get_engine(self.connection_string), get_engine(self.connection_string))
+
+    def test_query(self):
+        data = load_data_from_db(self.connection_string, 'SELECT * FROM iris')
+        pd.testing.assert_frame_equal(data, self.data)
+
+    def test_table_with_projection_and_filter(self):
+        data = load_data_from_db(self.connection_string, table='iris', columns=['sepal_length'],
+                                 filter_column='species', filter_value='setosa', chunksize=2)
+        self.assertEqual(list(data.columns), ['sepal_length'])
+        self.assertEqual(data['sepal_length'].tolist(), [5.1, 4.9, 4.7])
+
+    def test_histogram_from_db(self):
+        bins = histogram_from_db(self.connection_string, 'iris', 'sepal_length', bins=2,
+                                 group_column='species')
+        self.assertEqual(list(bins.columns), ['species', 'bin_start', 'bin_end', 'count'])
+        self.assertEqual(bins['count'].sum(), len(self.data))
+        expected = self.data.assign(bin=np.minimum(((self.data['sepal_length'] - 4.7) / 1.15).astype(int), 1))
+        expected = expected.groupby(['species', 'bin']).size().tolist()
+        self.assertEqual(bins['count'].tolist(), expected)
+        self.assertAlmostEqual(bins['bin_end'].max(), 7.0)
+
+    def test_histogram_bins_floor_on_other_servers(self):
+        import sqlalchemy
+        from sqlalchemy.dialects import postgresql, sqlite
+        from my_interactive_plots.data_loader import _bin_index
+
+        value = sqlalchemy.table('t', sqlalchemy.column('v')).c.v
+        statement = sqlalchemy.select(_bin_index(value, 0.0, 1.0, 10, 'postgresql'))
+        sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+        # PostgreSQL and MySQL round in CAST, which would move 0.5 to 0.999 into the next bin
+        self.assertIn('CAST(floor((t.v - 0.0) / CAST(1.0 AS DOUBLE PRECISION)) AS INTEGER)', sql)
+        sql = str(sqlalchemy.select(_bin_index(value, 0.0, 1.0, 10, 'sqlite')).compile(dialect=sqlite.dialect()))
+        self.assertNotIn('floor', sql)
+
+    def test_histogram_from_db_with_filter(self):
+        bins = histogram_from_db(self.connection_string, 'iris', 'sepal_length', bins=4,
+                                 filter_column='species', filter_value='versicolor')
+        self.assertEqual(bins['count'].sum(), 2)
+        self.assertAlmostEqual(bins['bin_start'].min(), 6.4)
+
+    def test_aggregate_from_db(self):
+        result = aggregate_from_db(self.connection_string, 'iris', ['species'], 'sepal_length',
+                                   aggregates=('count', 'max'))
+        self.assertEqual(result['species'].tolist(), ['setosa', 'versicolor', 'virginica'])
+        self.assertEqual(result['count'].tolist(), [3, 2, 1])
+        self.assertEqual(result['max'].tolist(), [5.1, 7.0, 6.3])
+
+@unittest.skipUnless(HAS_PYARROW, 'pyarrow is required for the data cache')
+class TestDataCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.data_path = os.path.join(self.temp_dir.name, 'iris.csv')
+        self.data = pd.DataFrame({
+            'sepal_length': [5.1, 4.9, 4.7],
+            'sepal_width': [3.5, 3.0, 3.2],
+            'species': ['setosa', 'setosa', 'virginica']
+        })
+        self.data.to_csv(self.data_path, index=False)
+        patcher = patch.object(Config, 'cache_dir', os.path.join(self.temp_dir.name, 'cache'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = cache.get_data_cache()
+
+    def test_second_load_hits_cache(self):
+        first = load_data(self.data_path, use_cache=True)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 1)
+        with patch('my_interactive_plots.data_loader.pd.read_csv', wraps=pd.read_csv) as mock_read_csv:
+            second = load_data(self.data_path, use_cache=True)
+        # Only the header is parsed on a cache hit
+        mock_read_csv.assert_called_once_with(self.data_path, nrows=0)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_cached_numeric_columns_are_not_copied(self):
+        import pyarrow as pa
+
+        data = pd.DataFrame({'value': np.arange(500000, dtype='float64'), 'group': np.arange(500000) % 3})
+        cache.write_frame(self.cache, 'numbers', data)
+        before = pa.total_allocated_bytes()
+        cached = cache.read_frame(self.cache, 'numbers')
+        # 8 MB of numbers map onto the file instead of being read into memory
+        self.assertLess(pa.total_allocated_bytes() - before, 1024 ** 2)
+        self.assertFalse(cached['value'].to_numpy().flags.writeable)
+        pd.testing.assert_frame_equal(cached, data)
+
+    def test_fingerprint_ignores_runtime_settings(self):
+        config = Config()
+        fingerprint = cache.config_fingerprint(config)
+        config.export_timeout = 5
+        config.daemon_mode = 'never'
+        config.trace_sink = 'log'
+        config.build_workers = 0
+        self.assertEqual(cache.config_fingerprint(config), fingerprint)
+        config.histogram_bins = 7
+        self.assertNotEqual(cache.config_fingerprint(config), fingerprint)
+
+    def test_key_depends_on_parameters_and_file(self):
+        load_data(self.data_path, use_cache=True)
+        filtered = load_data(self.data_path, use_cache=True, filter_column='species', filter_value='setosa')
+        self.assertEqual(len(filtered), 2)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 2)
+
+        self.data.iloc[:1].to_csv(self.data_path, index=False)
+        self.assertEqual(len(load_data(self.data_path, use_cache=True)), 1)
+
+    def test_small_files_bypass_cache_by_default(self):
+        load_data(self.data_path)
+        self.assertFalse(os.path.exists(self.cache.directory))
+
+    def test_lru_eviction(self):
+        small_cache = cache.DiskCache(self.cache.directory, max_bytes=15)
+        for key in ('a', 'b', 'c'):
+            small_cache.write(key, '.txt', lambda path: open(path, 'w').write('12345'))
+            os.utime(small_cache.path(key, '.txt'), (0, ord(key)))
+        small_cache.lookup('a', '.txt')
+        small_cache.max_bytes = 10
+        small_cache.evict()
+        self.assertEqual(sorted(os.listdir(self.cache.directory)), ['a.txt', 'c.txt'])
+
+    def test_clear_cache(self):
+        load_data(self.data_path, use_cache=True)
+        cache.clear_cache()
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+if __name__ == '__main__':
+    unittest.main()
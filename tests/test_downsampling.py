@@ -0,0 +1,89 @@
+# tests/test_downsampling.py
+
+import unittest
+import numpy as np
+import pandas as pd
+from my_interactive_plots import downsampling
+from my_interactive_plots.downsampling import (
+    downsample,
+    lttb,
+    minmax,
+    stratified,
+    get_downsampler,
+    register_downsampler
+)
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        n = 10000
+        self.data = pd.DataFrame({
+            'x': np.arange(n, dtype='float64'),
+            'y': np.sin(np.arange(n) / 100.0) + rng.normal(0, 0.01, n),
+            'species': np.where(np.arange(n) < 9900, 'common', 'rare')
+        })
+
+    def test_downsample_under_budget_returns_input(self):
+        result, dropped = downsample(self.data, 'x', 'y', 20000, 'lttb')
+        self.assertIs(result, self.data)
+        self.assertEqual(dropped, 0)
+
+    def test_downsample_disabled(self):
+        result, dropped = downsample(self.data, 'x', 'y', 0, 'lttb')
+        self.assertIs(result, self.data)
+        self.assertEqual(dropped, 0)
+
+    def test_downsample_reports_dropped_points(self):
+        result, dropped = downsample(self.data, 'x', 'y', 500, 'lttb')
+        self.assertEqual(len(result) + dropped, len(self.data))
+        self.assertLessEqual(len(result), 500)
+
+    def test_lttb_keeps_endpoints_and_sorts_by_x(self):
+        shuffled = self.data.sample(frac=1, random_state=0)
+        positions = lttb(shuffled, 'x', 'y', 100)
+        xs = shuffled['x'].to_numpy()[positions]
+        self.assertEqual(len(positions), 100)
+        self.assertEqual(xs[0], 0)
+        self.assertEqual(xs[-1], len(self.data) - 1)
+        self.assertTrue(np.all(np.diff(xs) > 0))
+
+    def test_text_x_keeps_row_order(self):
+        labels = self.data.assign(x=[f"day {i:05d}" for i in range(len(self.data))])
+        for method in (lttb, minmax):
+            positions = method(labels, 'x', 'y', 100)
+            self.assertGreater(len(positions), 50)
+            self.assertTrue(np.all(np.diff(positions) > 0))
+        result, _ = downsample(labels.astype({'x': 'category'}), 'x', 'y', 100, 'lttb')
+        self.assertEqual(result['x'].iloc[0], 'day 00000')
+        self.assertEqual(result['x'].iloc[-1], f"day {len(self.data) - 1:05d}")
+
+    def test_minmax_keeps_spikes(self):
+        data = self.data.copy()
+        data.loc[5000, 'y'] = 100.0
+        data.loc[7000, 'y'] = -100.0
+        positions = minmax(data, 'x', 'y', 200)
+        kept = data['y'].to_numpy()[positions]
+        self.assertIn(100.0, kept)
+        self.assertIn(-100.0, kept)
+        self.assertLessEqual(len(positions), 200)
+
+    def test_stratified_preserves_group_share(self):
+        positions = stratified(self.data, 'x', 'y', 1000, 'species')
+        kept = self.data['species'].to_numpy()[positions]
+        self.assertEqual((kept == 'common').sum(), 990)
+        # Small groups keep at least a minimum share of the budget
+        self.assertEqual((kept == 'rare').sum(), 10)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            get_downsampler('unknown')
+
+    def test_register_downsampler(self):
+        register_downsampler('head', lambda data, x, y, max_points, group: np.arange(max_points))
+        self.addCleanup(downsampling._DOWNSAMPLERS.pop, 'head', None)
+        result, dropped = downsample(self.data, 'x', 'y', 10, 'head')
+        self.assertEqual(len(result), 10)
+        self.assertEqual(dropped, len(self.data) - 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# tests/test_dtypes.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots.config import Config
+from my_interactive_plots.data_loader import load_data
+from my_interactive_plots.dtypes import memory_usage, optimize_dtypes, parse_dtypes
+
+class TestDtypes(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'sepal_length': np.linspace(4, 8, 1000),
+            'count': np.arange(1000, dtype='int64'),
+            'offset': np.arange(-500, 500, dtype='int64'),
+            'species': pd.Series(['setosa', 'versicolor', 'virginica'] * 333 + ['setosa'], dtype=object),
+            'label': pd.Series([f'row {i}' for i in range(1000)], dtype=object),
+            'flag': np.arange(1000) % 2 == 0
+        })
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_optimize_dtypes(self):
+        optimized = optimize_dtypes(self.data)
+        self.assertEqual(optimized['sepal_length'].dtype, np.float32)
+        self.assertEqual(optimized['count'].dtype, np.uint16)
+        self.assertEqual(optimized['offset'].dtype, np.int16)
+        self.assertIsInstance(optimized['species'].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(optimized['label'].dtype, pd.CategoricalDtype)
+        self.assertEqual(optimized['flag'].dtype, bool)
+        self.assertLess(memory_usage(optimized), memory_usage(self.data) / 2)
+        pd.testing.assert_frame_equal(optimized.astype(self.data.dtypes), self.data, check_exact=False, rtol=1e-6)
+
+    def test_optional_settings(self):
+        config = Config()
+        config.downcast_floats = False
+        config.category_max_ratio = 0
+        config.arrow_strings = True
+        optimized = optimize_dtypes(self.data, config)
+        self.assertEqual(optimized['sepal_length'].dtype, np.float64)
+        self.assertEqual(optimized['species'].dtype, pd.StringDtype('pyarrow'))
+        self.assertEqual(optimized['label'].dtype, pd.StringDtype('pyarrow'))
+
+    def test_parse_dtypes(self):
+        self.assertEqual(parse_dtypes(self.data), {'sepal_length': 'float32', 'species': 'category'})
+
+    def test_load_data_optimizes_while_parsing(self):
+        path = os.path.join(self.temp_dir.name, 'data.csv')
+        self.data.to_csv(path, index=False)
+        for chunksize in (None, 100):
+            data = load_data(path, chunksize=chunksize, use_cache=False, optimize=True)
+            self.assertEqual(len(data), 1000)
+            self.assertEqual(data['sepal_length'].dtype, np.float32)
+            self.assertIsInstance(data['species'].dtype, pd.CategoricalDtype)
+            self.assertEqual(data['count'].dtype, np.uint16)
+
+    def test_rows_beyond_the_sample_fall_back_to_inferred_types(self):
+        path = os.path.join(self.temp_dir.name, 'data.csv')
+        pd.DataFrame({'value': ['1.5', '2.5', 'n/a?'], 'species': ['a', 'a', 'b']}).to_csv(path, index=False)
+        with patch('my_interactive_plots.data_loader._DTYPE_SAMPLE_ROWS', 2):
+            data = load_data(path, use_cache=False, optimize=True)
+        self.assertEqual(list(data['value']), ['1.5', '2.5', 'n/a?'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# tests/test_filters.py
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots.data_loader import get_engine, histogram_from_db, load_data, load_data_from_db
+from my_interactive_plots.filters import build_filter, parse_filter
+from my_interactive_plots.streaming import iter_chunks
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+class TestFilters(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'price': [5, 12, 18, 25, 40],
+            'species': ['setosa', 'virginica', None, 'setosa', 'versicolor'],
+            'width': [1.5, np.nan, 2.5, 3.5, 0.5],
+            'ts': pd.to_datetime(['2024-01-01', '2024-01-05', '2024-01-08', '2024-01-09', '2024-01-10']),
+        })
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _matches(self, text, data=None, **kwargs):
+        data = self.data if data is None else data
+        return data.index[parse_filter(text, **kwargs).mask(data)].tolist()
+
+    def test_conditions(self):
+        self.assertEqual(self._matches('price between 10 and 25'), [1, 2, 3])
+        self.assertEqual(self._matches("species in ('setosa', 'versicolor')"), [0, 3, 4])
+        self.assertEqual(self._matches('species is null or width is null'), [1, 2])
+        self.assertEqual(self._matches("price > 10 and (species = 'setosa' or width < 1)"), [3, 4])
+        self.assertEqual(self._matches("ts >= '2024-01-08' and ts < '2024-01-10'"), [2, 3])
+        self.assertEqual(self._matches('ts within 2d', now=pd.Timestamp('2024-01-10')), [2, 3, 4])
+
+    def test_negations_exclude_missing_values(self):
+        self.assertEqual(self._matches("species != 'setosa'"), [1, 4])
+        self.assertEqual(self._matches("species not in ('setosa')"), [1, 4])
+        self.assertEqual(self._matches('not (price < 20 and width > 1)'), [3, 4])
+        self.assertEqual(self._matches('price not between 10 and 25'), [0, 4])
+
+    def test_literals_take_the_column_type(self):
+        self.assertEqual(build_filter(filter_column='price', filter_value='12').mask(self.data).tolist(),
+                         [False, True, False, False, False])
+        self.assertFalse(build_filter(filter_column='price', filter_value='twelve').mask(self.data).any())
+        categories = self.data.astype({'species': 'category', 'price': 'category'})
+        self.assertEqual(self._matches("species = 'setosa' and price >= '20'", categories), [3])
+        dates = self.data.assign(ts=self.data['ts'].dt.strftime('%Y-%m-%d'))
+        self.assertEqual(self._matches('ts within 2d', dates, now=pd.Timestamp('2024-01-10')), [2, 3, 4])
+        with self.assertRaises(ValueError):
+            self._matches("price < 'cheap'")
+
+    def test_within_uses_utc_and_the_column_time_zone(self):
+        local = self.data.assign(ts=self.data['ts'].dt.tz_localize('Europe/Berlin'))
+        now = pd.Timestamp('2024-01-09 23:30', tz='UTC')
+        # The window starts at 2024-01-07 23:30 UTC, after midnight of 2024-01-08 in Berlin
+        self.assertEqual(self._matches('ts within 2d', local, now=now), [3, 4])
+        self.assertEqual(self._matches('ts within 2d', self.data, now=now), [2, 3, 4])
+        self.assertEqual(self._matches("ts >= '2024-01-09'", local), [3, 4])
+        # Repeated parses share cache keys
+        self.assertEqual(str(parse_filter('ts within 1h')), str(parse_filter('ts within 1h')))
+        if HAS_PYARROW:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(local)
+            kept = table.filter(parse_filter('ts within 2d', now=now).to_arrow(table.schema))
+            self.assertEqual(kept.num_rows, 2)
+
+    def test_syntax(self):
+        expression = parse_filter('"sepal width" <> 2 and not x is null or y in (1, 2.5, \'it\'\'s\', true)')
+        self.assertEqual(str(expression), "\"sepal width\" != 2 and x is not null or y in (1, 2.5, 'it''s', true)")
+        self.assertEqual(parse_filter(str(expression)), expression)
+        self.assertEqual(expression.columns(), ['sepal width', 'x', 'y'])
+        for text in ('price >', "price == 'a' and", 'price in ()', 'price ~ 3', 'within 7d', 'price not = 3'):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_filter(text)
+        self.assertIsNone(build_filter(' ', 'price', None))
+
+    def test_chunked_csv_reads_filter_every_chunk(self):
+        path = os.path.join(self.temp_dir.name, 'data.csv')
+        self.data.to_csv(path, index=False)
+        data = load_data(path, columns=['width'], chunksize=2, where='price >= 12 and species is not null')
+        self.assertEqual(data.index.tolist(), [1, 3, 4])
+        self.assertEqual(list(data.columns), ['price', 'species', 'width'])
+        # The legacy equality filter compares in the column type, as given on the command line
+        data = load_data(path, filter_column='price', filter_value='25', use_cache=False)
+        self.assertEqual(data['price'].tolist(), [25])
+        with self.assertRaises(ValueError):
+            load_data(path, where='color = 1')
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_parquet_row_groups_are_pruned(self):
+        path = os.path.join(self.temp_dir.name, 'data.parquet')
+        data = pd.DataFrame({'value': np.arange(10000), 'group': np.repeat(['a', 'b'], 5000)})
+        data.to_parquet(path, row_group_size=1000)
+        loaded = load_data(path, columns=['group'], where='value >= 9500 or value < 10', use_cache=False)
+        self.assertEqual(len(loaded), 510)
+        self.assertEqual(list(loaded.columns), ['value', 'group'])
+        chunks = list(iter_chunks(path, ['group'], 300, where="group = 'b' and value < 5300"))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 300)
+        self.assertTrue(all(len(chunk) <= 300 for chunk in chunks))
+        # Only the matching row group is scanned
+        import pyarrow.dataset as ds
+        expression = parse_filter('value >= 9500').to_arrow(ds.dataset(path).schema)
+        fragment, = ds.dataset(path).get_fragments()
+        self.assertEqual(len(fragment.split_by_row_group(expression)), 1)
+
+    def test_sql_where_clauses(self):
+        connection_string = f"sqlite:///{os.path.join(self.temp_dir.name, 'data.db')}"
+        self.data.drop(columns='ts').to_sql('data', get_engine(connection_string), index=False)
+        data = load_data_from_db(connection_string, table='data', columns=['price'],
+                                 where="species in ('setosa', 'virginica') and price < 20")
+        self.assertEqual(data['price'].tolist(), [5, 12])
+        bins = histogram_from_db(connection_string, 'data', 'price', bins=2, where='width is null or width > 3')
+        self.assertEqual(bins['count'].sum(), 2)
+
+if __name__ == '__main__':
+    unittest.main()
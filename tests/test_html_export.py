@@ -0,0 +1,86 @@
+# tests/test_html_export.py
+
+import base64
+import gzip
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+import plotly.graph_objs as go
+from my_interactive_plots.html_export import (
+    figure_div,
+    figure_json,
+    write_figure_html,
+    write_html_document,
+    PLOTLYJS_FILENAME
+)
+
+PLOTLYJS_MARKER = 'plotly.js v'
+
+class TestHtmlExport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.fig = go.Figure(go.Scatter(x=np.arange(1000), y=np.linspace(0, 1, 1000), name='line'))
+
+    def test_figure_json_uses_typed_arrays(self):
+        trace = json.loads(figure_json(self.fig))['data'][0]
+        self.assertEqual(trace['x']['dtype'], 'i2')
+        self.assertEqual(trace['y']['dtype'], 'f8')
+        decoded = np.frombuffer(base64.b64decode(trace['y']['bdata']), dtype='float64')
+        np.testing.assert_array_equal(decoded, np.linspace(0, 1, 1000))
+        self.assertEqual(trace['name'], 'line')
+
+    def test_document_includes_plotlyjs_once(self):
+        path = os.path.join(self.temp_dir.name, 'report.html')
+        sections = [(f"Plot {i}", figure_div(self.fig, f"plot-{i}")) for i in range(3)]
+        write_html_document(sections, path)
+        with open(path, encoding='utf-8') as f:
+            document = f.read()
+        self.assertEqual(document.count(PLOTLYJS_MARKER), 1)
+        self.assertEqual(document.count('Plotly.newPlot'), 3)
+
+    def test_animation_frames_reach_the_page(self):
+        import pandas as pd
+        from my_interactive_plots.plots import create_animated_scatter_plot
+
+        data = pd.DataFrame({
+            'sepal_width': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            'sepal_length': [2.0, 1.0, 3.0, 5.0, 4.0, 6.0],
+            'species': ['a', 'b'] * 3,
+            'yr': [2000, 2000, 2001, 2001, 2002, 2002]
+        })
+        fig = create_animated_scatter_plot(data, 'yr')
+        self.assertEqual(len(fig.frames), 3)
+        path = os.path.join(self.temp_dir.name, 'animated.html')
+        write_figure_html(fig, path)
+        with open(path, encoding='utf-8') as f:
+            document = f.read()
+        script = document.split('var figure = ', 1)[1]
+        figure = json.loads(script.split('; Plotly.newPlot', 1)[0])
+        self.assertEqual([frame['name'] for frame in figure['frames']], ['2000', '2001', '2002'])
+        self.assertIn('"frames": figure.frames', script)
+
+    def test_directory_mode_shares_bundle(self):
+        for name in ('a.html', 'b.html'):
+            write_figure_html(self.fig, os.path.join(self.temp_dir.name, name), plotlyjs='directory')
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, PLOTLYJS_FILENAME)))
+        with open(os.path.join(self.temp_dir.name, 'a.html'), encoding='utf-8') as f:
+            document = f.read()
+        self.assertNotIn(PLOTLYJS_MARKER, document)
+        self.assertIn(f'src="{PLOTLYJS_FILENAME}"', document)
+
+    def test_gzip_output(self):
+        path = os.path.join(self.temp_dir.name, 'plot.html.gz')
+        write_figure_html(self.fig, path, plotlyjs='cdn')
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            document = f.read()
+        self.assertIn('https://cdn.plot.ly/plotly-', document)
+
+    def test_unsupported_plotlyjs_mode(self):
+        with self.assertRaises(ValueError):
+            write_figure_html(self.fig, os.path.join(self.temp_dir.name, 'plot.html'), plotlyjs='bundle')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_image_export.py
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import plotly.graph_objs as go
+from my_interactive_plots.image_export import ImageExportService, export_figures
+
+def _hanging_write_image(fig, path, **kwargs):
+    # Renderer stuck on exports named 'hang', see test_timeouts_interrupt_stuck_exports
+    if 'hang' in os.path.basename(path):
+        time.sleep(30)
+    with open(path, 'w') as f:
+        f.write('image')
+
+class TestImageExport(unittest.TestCase):
+    def setUp(self):
+        self.fig = go.Figure(go.Scatter(x=[1, 2, 3], y=[3, 1, 2]))
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    @patch('my_interactive_plots.image_export.pio.write_image')
+    def test_export_in_process(self, mock_write_image):
+        figures = [(self.fig, self._path('a.png')), (self.fig, self._path('b.jpg'))]
+        results = export_figures(figures, workers=0)
+        self.assertEqual([result['status'] for result in results], ['ok', 'ok'])
+        self.assertEqual([result['output'] for result in results], [path for _, path in figures])
+        formats = [call.kwargs['format'] for call in mock_write_image.call_args_list]
+        self.assertEqual(formats, ['png', 'jpeg'])
+        exported = mock_write_image.call_args_list[0].args[0]
+        self.assertEqual(list(exported.data[0].y), [3, 1, 2])
+
+    @patch('my_interactive_plots.image_export.pio.write_image')
+    def test_unsupported_format_fails_only_that_export(self, mock_write_image):
+        results = export_figures([(self.fig, self._path('a.bmp')), (self.fig, self._path('b.svg'))], workers=0)
+        self.assertEqual(results[0]['status'], 'failed')
+        self.assertIn('Unsupported image format', results[0]['error'])
+        self.assertEqual(results[1]['status'], 'ok')
+        mock_write_image.assert_called_once()
+
+    def test_pool_reports_failures_in_order(self):
+        with ImageExportService(workers=2, timeout=60, warm=False) as service:
+            results = service.export_many([('not json', self._path(f"{i}.png")) for i in range(3)])
+        self.assertEqual([result['output'] for result in results], [self._path(f"{i}.png") for i in range(3)])
+        self.assertTrue(all(result['status'] == 'failed' for result in results))
+
+    @patch('my_interactive_plots.image_export.pio.write_image', _hanging_write_image)
+    def test_timeouts_interrupt_stuck_exports(self):
+        names = ['hang0.png', 'a.png', 'hang1.png', 'b.png', 'hang2.png', 'c.png']
+        start = time.monotonic()
+        results = export_figures([(self.fig, self._path(name)) for name in names], workers=2, timeout=1, warm=False)
+        elapsed = time.monotonic() - start
+        self.assertEqual([result['status'] for result in results], ['failed', 'ok'] * 3)
+        self.assertTrue(all('timed out after 1s' in result['error'] for result in results[::2]))
+        self.assertTrue(all(os.path.exists(self._path(name)) for name in names[1::2]))
+        # Three stuck exports on two workers take two deadlines, far from the 30s of each hang
+        self.assertLess(elapsed, 15)
+
+    @patch('my_interactive_plots.image_export.pio.write_image', _hanging_write_image)
+    @patch('my_interactive_plots.image_export._warm_renderer', lambda: time.sleep(1.5))
+    def test_warm_up_does_not_count_against_the_timeout(self):
+        names = ['a.png', 'hang.png', 'b.png']
+        results = export_figures([(self.fig, self._path(name)) for name in names], workers=1, timeout=1, warm=True)
+        # b.png runs on the worker replacing the stuck one, after it warmed up for longer than the timeout
+        self.assertEqual([result['status'] for result in results], ['ok', 'failed', 'ok'])
+
+if __name__ == '__main__':
+    unittest.main()
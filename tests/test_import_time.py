@@ -0,0 +1,56 @@
+# tests/test_import_time.py
+
+import json
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ['pandas', 'plotly', 'sqlalchemy', 'dash', 'weasyprint']
+
+def _run(code):
+    """
+    Runs code in a fresh interpreter and returns what it prints as JSON.
+    """
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+class TestImportTime(unittest.TestCase):
+    def test_package_import_is_cheap(self):
+        # Which modules load is what keeps the import cheap; wall time is too noisy to assert on
+        result = _run(
+            "import json, sys\n"
+            "import my_interactive_plots\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        self.assertEqual(result, [])
+
+    def test_plot_builders_do_not_load_web_or_report_dependencies(self):
+        result = _run(
+            "import json, sys\n"
+            "from my_interactive_plots import create_scatter_plot, load_data, Config, cli, generate_report\n"
+            "print(json.dumps([m for m in ['sqlalchemy', 'dash', 'weasyprint'] if m in sys.modules]))"
+        )
+        self.assertEqual(result, [])
+
+    def test_public_names_resolve(self):
+        import click
+        import my_interactive_plots.cli  # noqa: F401
+        import my_interactive_plots
+        from my_interactive_plots.plots import create_plot
+        # The submodule import does not replace the command of the same name
+        self.assertIsInstance(my_interactive_plots.cli, click.Command)
+        result = _run(
+            "import json, click\n"
+            "import my_interactive_plots.cli\n"
+            "import my_interactive_plots\n"
+            "print(json.dumps(isinstance(my_interactive_plots.cli, click.Command)))"
+        )
+        self.assertTrue(result)
+        for name in my_interactive_plots.__all__:
+            self.assertIsNotNone(getattr(my_interactive_plots, name))
+        self.assertIs(my_interactive_plots.create_plot, create_plot)
+        with self.assertRaises(AttributeError):
+            my_interactive_plots.missing_name
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# tests/test_jobs.py
+
+import os
+import time
+import unittest
+
+from my_interactive_plots.jobs import JobQueue
+
+class TestJobQueue(unittest.TestCase):
+    def test_jobs_run_in_worker_processes(self):
+        jobs = JobQueue(workers=1)
+        self.addCleanup(jobs.close)
+        future = jobs.submit('pid', os.getpid)
+        self.assertNotEqual(future.result(timeout=60), os.getpid())
+
+    def test_same_key_joins_the_running_job(self):
+        jobs = JobQueue(workers=1)
+        self.addCleanup(jobs.close)
+        first = jobs.submit('sleep', time.sleep, 0.2)
+        second = jobs.submit('sleep', time.sleep, 0.2)
+        self.assertIs(first, second)
+        jobs.release('sleep')
+        self.assertIs(jobs.get('sleep'), first)
+        jobs.release('sleep')
+        self.assertIsNone(jobs.get('sleep'))
+
+    def test_released_queued_jobs_are_cancelled(self):
+        jobs = JobQueue(workers=1)
+        self.addCleanup(jobs.close)
+        jobs.submit('busy', time.sleep, 1)
+        # The worker's call queue takes at most two more jobs; later ones wait to be handed over
+        for index in range(3):
+            jobs.submit(f'next-{index}', time.sleep, 0)
+        waiting = jobs.submit('waiting', time.sleep, 0)
+        jobs.release('waiting')
+        self.assertTrue(waiting.cancelled())
+        self.assertIsNone(jobs.get('waiting'))
+
+    def test_without_workers_jobs_run_on_submit(self):
+        jobs = JobQueue(workers=0)
+        self.assertEqual(jobs.submit('sum', sum, [1, 2]).result(), 3)
+        failed = jobs.submit('bad', int, 'x')
+        self.assertIsInstance(failed.exception(), ValueError)
+
+    def test_unreleased_finished_jobs_expire(self):
+        jobs = JobQueue(workers=0, keep_seconds=0)
+        jobs.submit('a', sum, [1])
+        jobs.submit('b', sum, [2])
+        self.assertIsNone(jobs.get('a'))
+        self.assertEqual(len(jobs), 1)
+
+if __name__ == '__main__':
+    unittest.main()
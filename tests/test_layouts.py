@@ -0,0 +1,71 @@
+# tests/test_layouts.py
+
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots.aggregation import box_statistics, histogram_bins, rasterize
+from my_interactive_plots.config import Config
+from my_interactive_plots.layouts import base_layout, build_figure, clear_layout_cache, template_json
+from my_interactive_plots.plots import (
+    create_binned_histogram,
+    create_combined_plot,
+    create_raster_plot,
+    create_summary_box_plot
+)
+
+class TestLayouts(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = pd.DataFrame({
+            'sepal_width': rng.normal(3, 0.5, 500),
+            'sepal_length': rng.normal(6, 0.8, 500),
+            'species': rng.choice(['setosa', 'versicolor'], 500)
+        })
+        self.unvalidated = Config()
+        self.unvalidated.validate_figures = False
+
+    def tearDown(self):
+        clear_layout_cache()
+
+    def test_base_layout_is_resolved_once(self):
+        layout = base_layout('plotly_dark', 'summary_box')
+        self.assertIs(base_layout('plotly_dark', 'summary_box'), layout)
+        self.assertIs(layout['template'], template_json('plotly_dark'))
+        self.assertEqual(layout['boxmode'], 'group')
+
+    def test_merged_themes(self):
+        template = template_json('plotly_dark+presentation')
+        self.assertIn('layout', template)
+        self.assertEqual(template['layout']['font']['size'],
+                         template_json('presentation')['layout']['font']['size'])
+
+    def test_unvalidated_figures_match_validated_ones(self):
+        builds = [
+            lambda config: create_combined_plot(self.data, config),
+            lambda config: create_binned_histogram(
+                histogram_bins(self.data, 'sepal_width', bins=10, group_column='species'), config),
+            lambda config: create_summary_box_plot(
+                box_statistics(self.data, 'sepal_length', ['species']), config),
+            lambda config: create_raster_plot(
+                rasterize(self.data, 'sepal_width', 'sepal_length', 20, 10, category_column='species'), config),
+            lambda config: create_raster_plot(
+                rasterize(self.data, 'sepal_width', 'sepal_length', 20, 10), config),
+        ]
+        for build in builds:
+            validated = json.loads(build(Config()).to_json())
+            unvalidated = json.loads(build(self.unvalidated).to_json())
+            self.assertEqual(unvalidated, validated)
+
+    def test_changing_a_figure_leaves_the_cache_alone(self):
+        fig = build_figure('combined', self.unvalidated, [{'type': 'scatter', 'x': [1], 'y': [2]}])
+        fig.update_layout(template={'layout': {'paper_bgcolor': 'red'}}, overwrite=True)
+        self.assertNotEqual(template_json('plotly_dark')['layout']['paper_bgcolor'], 'red')
+        fig = build_figure('combined', self.unvalidated, [{'type': 'scatter', 'x': [1], 'y': [2]}])
+        self.assertEqual(fig.layout.template.layout.paper_bgcolor,
+                         template_json('plotly_dark')['layout']['paper_bgcolor'])
+
+if __name__ == '__main__':
+    unittest.main()
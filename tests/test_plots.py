@@ -1,6 +1,7 @@
 # tests/test_plots.py
 
 import unittest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
 from my_interactive_plots.plots import (
@@ -13,8 +14,11 @@ from my_interactive_plots.plots import (
     create_geographical_map,
     create_combined_plot,
     create_animated_scatter_plot,
+    create_binned_histogram,
     PlotCreationError
 )
+from my_interactive_plots.backends import get_backend
+from my_interactive_plots.config import Config
 
 class TestPlots(unittest.TestCase):
     def setUp(self):
@@ -56,7 +60,8 @@ class TestPlots(unittest.TestCase):
             y='sepal_length', 
             color='species',
             title='Sepal Width vs Sepal Length',
-            template='plotly_dark'
+            template='plotly_dark',
+            render_mode='svg'
         )
 
     @patch('my_interactive_plots.plots.px.scatter')
@@ -79,7 +84,8 @@ class TestPlots(unittest.TestCase):
             y='sepal_length',
             color='species',
             title='Sepal Width vs Sepal Length',
-            template='plotly_dark'
+            template='plotly_dark',
+            render_mode='svg'
         )
 
     @patch('my_interactive_plots.plots.px.line')
@@ -90,6 +96,20 @@ class TestPlots(unittest.TestCase):
             create_line_plot(invalid_data)
         mock_line.assert_not_called()
 
+    def test_line_plot_of_text_x_keeps_points(self):
+        n = 60000
+        data = pd.DataFrame({
+            'sepal_width': [f"t{i:05d}" for i in range(n)],
+            'sepal_length': np.sin(np.arange(n) / 500.0),
+            'species': 'setosa'
+        })
+        config = Config()
+        config.max_points = 1000
+        fig = create_line_plot(data, config)
+        points = sum(len(trace.y) for trace in fig.data)
+        self.assertGreater(points, 500)
+        self.assertLessEqual(points, 1000)
+
     @patch('my_interactive_plots.plots.px.histogram')
     def test_create_histogram_success(self, mock_histogram):
         mock_fig = MagicMock()
@@ -112,6 +132,63 @@ class TestPlots(unittest.TestCase):
             create_histogram(invalid_data)
         mock_histogram.assert_not_called()
 
+    def test_create_binned_histogram(self):
+        bins = pd.DataFrame({
+            'species': ['Setosa', 'Setosa', 'Virginica'],
+            'bin_start': [4.0, 5.0, 5.0],
+            'bin_end': [5.0, 6.0, 6.0],
+            'count': [3, 1, 2]
+        })
+        fig = create_binned_histogram(bins)
+        self.assertEqual([trace.name for trace in fig.data], ['Setosa', 'Virginica'])
+        self.assertEqual(list(fig.data[0].x), [4.5, 5.5])
+        self.assertEqual(list(fig.data[0].y), [3, 1])
+
+    def test_create_binned_histogram_failure(self):
+        with self.assertRaises(PlotCreationError):
+            create_binned_histogram(pd.DataFrame({'count': [1]}))
+
+    @patch('my_interactive_plots.plots.px.histogram')
+    def test_create_histogram_aggregated(self, mock_histogram):
+        config = Config()
+        config.aggregate_mode = 'always'
+        config.histogram_bins = 4
+        fig = create_histogram(self.data, config)
+        mock_histogram.assert_not_called()
+        self.assertEqual(len(fig.data), 1)
+        self.assertEqual(fig.data[0].type, 'bar')
+        self.assertEqual(sum(fig.data[0].y), len(self.data))
+
+    @patch('my_interactive_plots.plots.px.box')
+    def test_create_box_plot_aggregated(self, mock_box):
+        fig = create_plot(self.data, 'box', aggregate_mode='always')
+        mock_box.assert_not_called()
+        self.assertEqual(fig.data[0].type, 'box')
+        self.assertEqual(fig.data[0].name, 'Setosa')
+        self.assertEqual(list(fig.data[0].x), [3.0, 3.2, 3.5])
+        self.assertEqual(list(fig.data[0].median), [4.9, 4.7, 5.1])
+
+    @patch('my_interactive_plots.plots.px.scatter')
+    def test_create_scatter_plot_rasterized(self, mock_scatter):
+        config = Config()
+        config.raster_mode = 'always'
+        config.raster_width, config.raster_height = 4, 3
+        fig = create_scatter_plot(self.data, config)
+        mock_scatter.assert_not_called()
+        self.assertEqual(fig.data[0].type, 'image')
+        self.assertEqual(fig.data[0].z.shape, (3, 4, 4))
+        self.assertEqual([trace.name for trace in fig.data[1:]], ['Setosa'])
+
+    def test_create_geographical_map_rasterized(self):
+        config = Config()
+        config.raster_mode = 'always'
+        config.raster_aggregate = 'mean'
+        config.raster_value_column = 'value'
+        data = self.geo_data.assign(value=[1.0, 2.0, 3.0])
+        fig = create_geographical_map(data, config)
+        self.assertEqual(fig.data[0].type, 'scattergeo')
+        self.assertEqual(sorted(fig.data[0].marker.color), [1.0, 2.0, 3.0])
+
     @patch('my_interactive_plots.plots.px.box')
     def test_create_box_plot_success(self, mock_box):
         mock_fig = MagicMock()
@@ -202,6 +279,59 @@ class TestPlots(unittest.TestCase):
             template='plotly_dark'
         )
 
+    def test_create_combined_plot_statistics(self):
+        data = pd.DataFrame({
+            'sepal_width': [3.0, 1.0, 2.0, 5.0, 4.0, 6.0],
+            'sepal_length': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            'petal_length': [6.0, 5.0, 4.0, 3.0, 2.0, 1.0],
+            'species': ['a', 'b', 'a', 'b', 'a', 'b']
+        })
+        config = Config()
+        config.combined_y_columns = ['sepal_length', 'petal_length']
+        config.combined_statistics = ['median', 'quantile', 'resample']
+        config.rolling_window = 2
+        config.histogram_bins = 2
+        fig = create_combined_plot(data, config)
+        self.assertEqual([trace.name for trace in fig.data][:5], [
+            'sepal_length', 'sepal_length rolling median', 'sepal_length q0.1',
+            'sepal_length q0.1-q0.9 band', 'sepal_length resampled mean'
+        ])
+        self.assertEqual(len(fig.data), 10)
+        # The statistics follow x in increasing order
+        self.assertEqual(list(fig.data[0].x), [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        self.assertEqual(list(fig.data[1].y[1:]), [2.5, 2.0, 3.0, 4.5, 5.0])
+        self.assertEqual(fig.data[3].fill, 'tonexty')
+
+        config.combined_y_columns = None
+        config.combined_statistics = ['mean']
+        config.combined_by_color = True
+        fig = create_combined_plot(data, config)
+        self.assertEqual([trace.name for trace in fig.data], ['a', 'a rolling mean', 'b', 'b rolling mean'])
+        self.assertEqual(list(fig.data[1].y[1:]), [2.0, 3.0])
+        self.assertEqual(fig.layout.legend.title.text, 'species')
+
+    def test_combined_plot_statistics_are_reused_when_restyled(self):
+        config = Config()
+        fig = create_combined_plot(self.data, config)
+        config.theme = 'plotly_white'
+        with patch('my_interactive_plots.plots.rolling_statistics') as mock_rolling:
+            restyled = create_combined_plot(self.data, config)
+            mock_rolling.assert_not_called()
+            config.rolling_window = 2
+            with self.assertRaises(PlotCreationError):
+                create_combined_plot(self.data, config)
+            mock_rolling.assert_called_once()
+        np.testing.assert_array_equal(restyled.data[1].y, fig.data[1].y)
+
+    def test_combined_plot_statistics_follow_in_place_changes(self):
+        config = Config()
+        data = self.data.copy()
+        create_combined_plot(data, config)
+        data.loc[:, config.y_column] = data[config.y_column] * 100
+        fig = create_combined_plot(data, config)
+        expected = data.sort_values(config.x_column)[config.y_column].to_numpy()
+        np.testing.assert_array_equal(fig.data[0].y, expected)
+
     def test_create_combined_plot_failure_missing_x_column(self):
         # Удаляем обязательный столбец 'sepal_width' (x_column)
         invalid_data = self.data.drop(columns=['sepal_width'])
@@ -221,7 +351,8 @@ class TestPlots(unittest.TestCase):
             color='species',
             animation_frame='animation_frame',
             title='Sepal Width vs Sepal Length',
-            template='plotly_dark'
+            template='plotly_dark',
+            render_mode='svg'
         )
 
     @patch('my_interactive_plots.plots.px.scatter')
@@ -231,6 +362,52 @@ class TestPlots(unittest.TestCase):
             create_animated_scatter_plot(self.data, 'animation_frame')
         mock_scatter.assert_not_called()
 
+    def _many_frames(self):
+        return pd.DataFrame({
+            'sepal_width': [float(i % 7) for i in range(3000)],
+            'sepal_length': [float(i % 11) for i in range(3000)],
+            'species': ['Setosa', 'Virginica', 'Setosa'] * 1000,
+            'animation_frame': [i // 10 for i in range(3000)]
+        })
+
+    def test_create_animated_scatter_plot_compact(self):
+        config = Config()
+        config.animation_max_frames = 50
+        config.animation_max_points = 8
+        for validate in (True, False):
+            config.validate_figures = validate
+            fig = create_animated_scatter_plot(self._many_frames(), 'animation_frame', config)
+            self.assertEqual(len(fig.frames), 50)
+            self.assertEqual([trace.name for trace in fig.data], ['Setosa', 'Virginica'])
+            self.assertEqual(len(fig.data[0].x) + len(fig.data[1].x), 8)
+            # Frames only carry the points; styling stays on the figure's traces
+            frame = fig.frames[1].to_plotly_json()
+            self.assertEqual(set(frame['data'][0]), {'type', 'x', 'y'})
+            self.assertEqual(frame['traces'], [0, 1])
+            self.assertEqual(len(fig.layout.sliders[0].steps), 50)
+            self.assertEqual(list(fig.layout.sliders[0].steps[1].args[0]), [fig.frames[1].name])
+            low, high = fig.layout.xaxis.range
+            self.assertAlmostEqual(low, -0.3)
+            self.assertAlmostEqual(high, 6.3)
+
+    def test_compact_animation_size_does_not_grow_with_frames(self):
+        config = Config()
+        config.animation_mode = 'always'
+        config.animation_max_frames = 20
+        data = self._many_frames()
+        sizes = []
+        for frames in (20, 300):
+            data['animation_frame'] = [i % frames for i in range(3000)]
+            sizes.append(len(create_animated_scatter_plot(data, 'animation_frame', config).to_json()))
+        self.assertLess(sizes[1], sizes[0] * 1.2)
+
+    def test_create_animated_scatter_plot_without_embedded_frames(self):
+        fig = create_plot(self._many_frames(), 'animated_scatter', embed_frames=False)
+        self.assertEqual(len(fig.frames), 0)
+        self.assertFalse(fig.layout.sliders)
+        self.assertEqual(len(fig.layout.meta['animation_frames']), 200)
+        self.assertEqual(fig.layout.meta['animation_frames'][0], '0')
+
     @patch('my_interactive_plots.plots.create_geographical_map')
     @patch('my_interactive_plots.plots.create_3d_scatter_plot')
     @patch('my_interactive_plots.plots.create_box_plot')
@@ -286,6 +463,42 @@ class TestPlots(unittest.TestCase):
                 elif plot_type == 'combined':
                     mock_combined_plot.assert_called_once_with(self.data)
 
+    @patch('my_interactive_plots.plots.px.scatter')
+    def test_create_scatter_plot_render_mode(self, mock_scatter):
+        config = Config()
+        config.render_mode = 'webgl'
+        create_scatter_plot(self.data, config=config)
+        self.assertEqual(mock_scatter.call_args.kwargs['render_mode'], 'webgl')
+
+        config.render_mode = 'auto'
+        config.webgl_threshold = 2
+        create_scatter_plot(self.data, config=config)
+        self.assertEqual(mock_scatter.call_args.kwargs['render_mode'], 'webgl')
+
+    def test_create_combined_plot_webgl(self):
+        fig = create_plot(self.data, 'combined', render_mode='webgl')
+        self.assertEqual([trace.type for trace in fig.data], ['scattergl', 'scattergl'])
+        fig = create_plot(self.data, 'combined', render_mode='svg')
+        self.assertEqual([trace.type for trace in fig.data], ['scatter', 'scatter'])
+
+    def test_create_plot_invalid_render_mode(self):
+        with self.assertRaises(PlotCreationError):
+            create_plot(self.data, 'scatter', render_mode='canvas')
+
+    @patch('my_interactive_plots.plots.create_scatter_plot')
+    @patch('my_interactive_plots.plots.load_data')
+    def test_create_plot_from_path_loads_required_columns(self, mock_load_data, mock_scatter_plot):
+        mock_load_data.return_value = self.data
+        create_plot('data/iris.csv', 'scatter')
+        mock_load_data.assert_called_once_with(
+            'data/iris.csv',
+            columns=['sepal_width', 'sepal_length', 'species'],
+            chunksize=None,
+            sample_rows=None,
+            backend=get_backend('pandas')
+        )
+        mock_scatter_plot.assert_called_once_with(self.data)
+
     @patch('my_interactive_plots.plots.create_plot')
     def test_create_plot_invalid_type(self, mock_create_plot):
         with self.assertRaises(PlotCreationError):
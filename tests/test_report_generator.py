@@ -0,0 +1,70 @@
+# tests/test_report_generator.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, ANY
+import pandas as pd
+from my_interactive_plots.report_generator import generate_report
+from my_interactive_plots.exceptions import PlotCreationError
+
+class TestGenerateReport(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'sepal_length': [5.1, 4.9, 4.7],
+            'sepal_width': [3.5, 3.0, 3.2],
+            'petal_length': [1.4, 1.4, 1.3],
+            'petal_width': [0.2, 0.2, 0.2],
+            'species': ['Setosa', 'Setosa', 'Setosa']
+        })
+        self.plot_types = ['histogram', 'scatter', 'box', 'line']
+
+    def _document(self, mock_write_pdf):
+        return mock_write_pdf.call_args.args[0]
+
+    @patch('my_interactive_plots.report_generator._write_pdf')
+    def test_generate_report_serial(self, mock_write_pdf):
+        timings = generate_report(self.data, self.plot_types, 'report.pdf', workers=1)
+        self.assertEqual([plot_type for plot_type, _ in timings], self.plot_types)
+        mock_write_pdf.assert_called_once_with(ANY, 'report.pdf')
+        document = self._document(mock_write_pdf)
+        positions = [document.index(f"<h2>{plot_type.capitalize()} Plot</h2>") for plot_type in self.plot_types]
+        self.assertEqual(positions, sorted(positions))
+
+    @patch('my_interactive_plots.report_generator._write_pdf')
+    def test_generate_report_parallel_matches_serial(self, mock_write_pdf):
+        timings = generate_report(self.data, self.plot_types, 'report.pdf', workers=2)
+        self.assertEqual([plot_type for plot_type, _ in timings], self.plot_types)
+        self.assertTrue(all(seconds >= 0 for _, seconds in timings))
+        headings = [part.split('</h2>')[0] for part in self._document(mock_write_pdf).split('<h2>')[1:]]
+        self.assertEqual(headings, [f"{plot_type.capitalize()} Plot" for plot_type in self.plot_types])
+
+    @patch('my_interactive_plots.report_generator._write_pdf')
+    def test_generate_html_report(self, mock_write_pdf):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_file = os.path.join(temp_dir, 'report.html')
+            generate_report(self.data, self.plot_types, report_file)
+            with open(report_file, encoding='utf-8') as f:
+                document = f.read()
+        mock_write_pdf.assert_not_called()
+        self.assertEqual(document.count('plotly.js v'), 1)
+        self.assertEqual(document.count('Plotly.newPlot'), len(self.plot_types))
+
+    @patch('my_interactive_plots.report_generator.ImageExportService')
+    @patch('my_interactive_plots.report_generator._write_pdf')
+    def test_generate_report_exports_images(self, mock_write_pdf, mock_service):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generate_report(self.data, self.plot_types, 'report.pdf', image_dir=temp_dir, image_format='svg')
+        exporter = mock_service.return_value
+        paths = [call.args[1] for call in exporter.submit.call_args_list]
+        self.assertEqual(paths, [os.path.join(temp_dir, f"{i}_{plot_type}.svg") for i, plot_type in enumerate(self.plot_types)])
+        exporter.close.assert_called_once()
+
+    @patch('my_interactive_plots.report_generator._write_pdf')
+    def test_generate_report_failure(self, mock_write_pdf):
+        with self.assertRaises(PlotCreationError):
+            generate_report(self.data, ['invalid_type'], 'report.pdf')
+        mock_write_pdf.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# tests/test_server.py
+
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from my_interactive_plots import client, data_loader
+from my_interactive_plots.client import ping, run_job, stop_daemon
+from my_interactive_plots.server import serve
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.socket_path = os.path.join(self.temp_dir.name, 'daemon.sock')
+        n = 200
+        pd.DataFrame({
+            'sepal_length': np.linspace(4.0, 8.0, n),
+            'sepal_width': np.linspace(2.0, 4.5, n),
+            'species': np.resize(['setosa', 'versicolor', 'virginica'], n)
+        }).to_csv(os.path.join(self.temp_dir.name, 'iris.csv'), index=False)
+
+    def _start(self):
+        thread = threading.Thread(target=serve, args=(self.socket_path, 10 * 1024 ** 2, False), daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 30
+        while not ping(self.socket_path):
+            self.assertLess(time.monotonic(), deadline, 'daemon did not start')
+            time.sleep(0.05)
+
+        def stop():
+            stop_daemon(self.socket_path)
+            thread.join(10)
+        self.addCleanup(stop)
+        return thread
+
+    def _run(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        code = run_job(list(argv), self.socket_path, cwd=self.temp_dir.name, stdout=stdout, stderr=stderr)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_jobs_run_in_the_daemon_with_warm_data(self):
+        self._start()
+        with patch('my_interactive_plots.data_loader._read_csv', wraps=data_loader._read_csv) as read_csv:
+            for output in ('first.html', 'second.html'):
+                code, stdout, _ = self._run('iris.csv', '--plot-type', 'histogram', '--output', output)
+                self.assertEqual(code, 0)
+                self.assertIn(f"Plot saved to {output}", stdout)
+                self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, output)))
+        # The second job reuses the frame loaded by the first
+        self.assertEqual(read_csv.call_count, 1)
+
+    def test_errors_are_streamed_back(self):
+        self._start()
+        code, _, stderr = self._run('iris.csv', '--bogus')
+        self.assertEqual(code, 2)
+        self.assertIn('No such option', stderr)
+        code, stdout, _ = self._run('iris.csv', '--where', 'species =', '--output', 'plot.html')
+        self.assertEqual(code, 0)
+        self.assertIn('Invalid filter', stdout)
+
+    def test_stop_removes_the_socket(self):
+        thread = self._start()
+        with self.assertRaises(RuntimeError):
+            serve(self.socket_path, 0, False)
+        self.assertTrue(stop_daemon(self.socket_path))
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertIsNone(data_loader._FRAMES)
+
+    def test_client_runs_in_process_without_a_daemon(self):
+        self.assertIsNone(run_job(['iris.csv'], self.socket_path))
+        output = os.path.join(self.temp_dir.name, 'plot.html')
+        argv = [os.path.join(self.temp_dir.name, 'iris.csv'), '--plot-type', 'box', '--output', output]
+        with patch.object(client.Config, 'daemon_socket', self.socket_path):
+            with self.assertRaises(SystemExit) as exit_info:
+                client.main(argv + ['--daemon', 'always'])
+            self.assertEqual(exit_info.exception.code, 1)
+            self.assertFalse(os.path.exists(output))
+            with self.assertRaises(SystemExit) as exit_info:
+                client.main(argv)
+        self.assertEqual(exit_info.exception.code, 0)
+        self.assertTrue(os.path.exists(output))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# tests/test_streaming.py
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from my_interactive_plots.aggregation import box_statistics, histogram_bins
+from my_interactive_plots.config import Config
+from my_interactive_plots.streaming import (
+    StreamingDensity,
+    StreamingHistogram,
+    TDigest,
+    aggregate_file,
+    iter_chunks,
+    plot_file
+)
+
+class TestStreamingAggregates(unittest.TestCase):
+    def test_histogram_matches_in_memory_counts(self):
+        rng = np.random.default_rng(0)
+        values = pd.Series(rng.normal(size=20000))
+        groups = pd.Series(rng.choice(['a', 'b'], size=20000))
+        histogram = StreamingHistogram(bins=10, value_range=(values.min(), values.max()))
+        for start in range(0, len(values), 3000):
+            histogram.update(values[start:start + 3000], groups[start:start + 3000])
+        result = histogram.result('group').sort_values(['group', 'bin_start'], kind='stable')
+        expected = histogram_bins(pd.DataFrame({'value': values, 'group': groups}), 'value', bins=10, group_column='group')
+        self.assertEqual(result['count'].tolist(), expected['count'].tolist())
+
+    def test_histogram_grows_range_without_losing_counts(self):
+        histogram = StreamingHistogram(bins=4)
+        histogram.update(pd.Series([0.0, 1.0]))
+        histogram.update(pd.Series([-10.0, 50.0, np.nan]))
+        result = histogram.result()
+        self.assertEqual(result['count'].sum(), 4)
+        self.assertLessEqual(result['bin_start'].iloc[0], -10.0)
+        self.assertGreater(result['bin_end'].iloc[-1], 50.0)
+
+    def test_density_counts_every_point(self):
+        density = StreamingDensity(bins=8)
+        density.update(pd.Series([0.0, 1.0, 1.0]), pd.Series([0.0, 1.0, 1.0]))
+        density.update(pd.Series([4.0]), pd.Series([-2.0]))
+        grid = density.result()
+        self.assertEqual(grid.to_numpy().sum(), 4)
+        self.assertTrue(grid.index.is_monotonic_increasing)
+
+    def test_tdigest_quantiles(self):
+        rng = np.random.default_rng(1)
+        values = rng.exponential(size=100000)
+        digest = TDigest(compression=100)
+        for part in np.array_split(values, 10):
+            digest.update(part)
+        self.assertLessEqual(len(digest.means), 101)
+        for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+            self.assertAlmostEqual(digest.quantile(q), np.quantile(values, q), delta=0.02)
+        self.assertEqual(digest.quantile(0.0), values.min())
+        self.assertEqual(digest.quantile(1.0), values.max())
+
+class TestAggregateFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        rng = np.random.default_rng(2)
+        self.data = pd.DataFrame({
+            'sepal_width': rng.integers(0, 3, 5000),
+            'sepal_length': rng.normal(size=5000),
+            'species': rng.choice(['setosa', 'virginica'], 5000)
+        })
+        self.csv_path = os.path.join(self.temp_dir.name, 'data.csv')
+        self.data.to_csv(self.csv_path, index=False)
+
+    def test_one_pass_for_several_plot_types(self):
+        results = aggregate_file(self.csv_path, ['scatter', 'histogram', 'box'], chunksize=700)
+        self.assertEqual(results['scatter'].to_numpy().sum(), len(self.data))
+        self.assertEqual(results['histogram'].groupby('species')['count'].sum().to_dict(),
+                         self.data['species'].value_counts().to_dict())
+        exact = box_statistics(self.data, 'sepal_length', ['species', 'sepal_width'])
+        np.testing.assert_allclose(results['box']['median'], exact['median'], atol=0.05)
+        self.assertEqual(results['box']['count'].tolist(), exact['count'].tolist())
+
+    def test_filter_is_applied_per_chunk(self):
+        chunks = list(iter_chunks(self.csv_path, ['sepal_length'], 1000, 'species', 'setosa'))
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), (self.data['species'] == 'setosa').sum())
+
+    def test_parquet_source(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest('pyarrow is not installed')
+        path = os.path.join(self.temp_dir.name, 'data.parquet')
+        self.data.to_parquet(path, row_group_size=1000)
+        config = Config()
+        config.histogram_bins = 10
+        result = aggregate_file(path, ['histogram'], config)['histogram']
+        expected = histogram_bins(self.data, 'sepal_width', bins=10, group_column='species')
+        self.assertEqual(result['count'].sum(), expected['count'].sum())
+        self.assertEqual(result['bin_start'].min(), 0)
+
+    def test_plot_file(self):
+        figures = plot_file(self.csv_path, ['scatter', 'box'])
+        self.assertEqual(figures['scatter'].data[0].type, 'heatmap')
+        self.assertEqual({trace.type for trace in figures['box'].data}, {'box'})
+
+    def test_box_groups_are_capped(self):
+        config = Config()
+        config.box_max_groups = 5
+        # species x sepal_width makes 6 boxes
+        with self.assertRaisesRegex(ValueError, 'more than 5 groups'):
+            aggregate_file(self.csv_path, ['box'], config, chunksize=700)
+        config.box_max_groups = 6
+        self.assertEqual(len(aggregate_file(self.csv_path, ['box'], config)['box']), 6)
+
+    def test_unsupported_plot_type(self):
+        with self.assertRaises(ValueError):
+            aggregate_file(self.csv_path, ['line'])
+
+if __name__ == '__main__':
+    unittest.main()
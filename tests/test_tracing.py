@@ -0,0 +1,93 @@
+# tests/test_tracing.py
+
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from my_interactive_plots.config import Config
+from my_interactive_plots.data_loader import load_data
+from my_interactive_plots.html_export import write_figure_html
+from my_interactive_plots.plots import create_plot
+from my_interactive_plots.tracing import (
+    JsonLinesSink,
+    MemorySink,
+    add_sink,
+    configure_tracing,
+    enabled,
+    remove_sink,
+    span,
+    traced
+)
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.sink = MemorySink()
+        add_sink(self.sink)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.temp_dir.name, 'iris.csv')
+        pd.DataFrame({
+            'sepal_length': [5.1, 4.9, 4.7],
+            'sepal_width': [3.5, 3.0, 3.2],
+            'species': ['setosa', 'setosa', 'virginica']
+        }).to_csv(self.data_path, index=False)
+
+    def tearDown(self):
+        remove_sink(self.sink)
+        self.temp_dir.cleanup()
+
+    def test_load_build_and_render_spans(self):
+        data = load_data(self.data_path, use_cache=False)
+        fig = create_plot(data, 'scatter')
+        output = os.path.join(self.temp_dir.name, 'plot.html')
+        write_figure_html(fig, output, plotlyjs='cdn')
+
+        load, = self.sink.named('load_data')
+        self.assertEqual((load['rows'], load['columns']), (3, 3))
+        build, = self.sink.named('create_plot')
+        self.assertEqual((build['rows'], build['traces']), (3, 2))
+        scatter, = self.sink.named('create_scatter_plot')
+        self.assertEqual(scatter['parent_id'], build['span_id'])
+        render, = self.sink.named('write_figure_html')
+        self.assertEqual(render['output_bytes'], os.path.getsize(output))
+        to_json, = self.sink.named('to_json')
+        self.assertEqual(to_json['parent_id'], render['span_id'])
+        self.assertTrue(all(record['seconds'] >= 0 and record['status'] == 'ok' for record in self.sink.spans))
+
+    def test_failures_are_recorded(self):
+        with self.assertRaises(FileNotFoundError):
+            load_data(os.path.join(self.temp_dir.name, 'missing.csv'), use_cache=False)
+        failed, = self.sink.named('load_data')
+        self.assertEqual(failed['status'], 'error')
+        self.assertIn('FileNotFoundError', failed['error'])
+
+    def test_disabled_tracing_records_nothing(self):
+        remove_sink(self.sink)
+        self.assertFalse(enabled())
+        with span('outer') as current:
+            current.set(rows=1)
+        traced()(lambda: None)()
+        self.assertEqual(self.sink.spans, [])
+
+    def test_json_lines_sink(self):
+        path = os.path.join(self.temp_dir.name, 'spans.jsonl')
+        config = Config()
+        config.trace_sink = path
+        sink = configure_tracing(config)
+        self.assertIsInstance(sink, JsonLinesSink)
+        try:
+            with span('outer', rows=2):
+                with span('inner') as inner:
+                    inner.set(output_bytes=10)
+        finally:
+            remove_sink(sink)
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record['name'] for record in records], ['inner', 'outer'])
+        self.assertEqual(records[0]['parent_id'], records[1]['span_id'])
+        self.assertEqual((records[0]['output_bytes'], records[1]['rows']), (10, 2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+# tests/test_web_app.py
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from my_interactive_plots import web_app
+from my_interactive_plots.cache import MemoryCache
+from my_interactive_plots.config import Config
+from my_interactive_plots.jobs import JobQueue
+
+class TestFigureCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.data_path = os.path.join(self.temp_dir.name, 'iris.csv')
+        pd.DataFrame({
+            'sepal_length': [5.1, 4.9, 4.7],
+            'sepal_width': [3.5, 3.0, 3.2],
+            'petal_length': [1.4, 1.4, 1.3],
+            'species': ['Setosa', 'Setosa', 'Virginica']
+        }).to_csv(self.data_path, index=False)
+        patcher = patch.object(Config, 'cache_dir', os.path.join(self.temp_dir.name, 'cache'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        web_app._frames.clear()
+        web_app._figures.clear()
+        web_app._animations.clear()
+        # Build in the test process unless a test starts worker processes
+        patcher = patch.object(web_app, '_jobs', JobQueue(workers=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_update_graph_returns_figure(self):
+        figure, state, job, poll_disabled, status = web_app.update_graph('scatter', self.data_path)
+        self.assertEqual(len(figure['data']), 2)
+        self.assertEqual(state['traces'], ['Setosa', 'Virginica'])
+        self.assertIsNone(job)
+        self.assertTrue(poll_disabled)
+
+    def test_figures_are_built_in_the_background(self):
+        jobs = JobQueue(workers=1)
+        self.addCleanup(jobs.close)
+        with patch.object(web_app, '_jobs', jobs):
+            figure, state, job, status = web_app.start_build(self.data_path, 'histogram')
+            deadline = time.time() + 60
+            while job is not None and time.time() < deadline:
+                self.assertIsNone(figure)
+                self.assertTrue(status)
+                time.sleep(0.05)
+                figure, state, job, status = web_app.collect_build(job)
+            self.assertEqual(status, '')
+            self.assertEqual(figure['data'][0]['type'], 'histogram')
+            self.assertEqual(state['plot_type'], 'histogram')
+            self.assertEqual(len(jobs), 0)
+            # The collected figure is kept by the web worker and returned at once
+            figure, state, job, status = web_app.start_build(self.data_path, 'histogram')
+            self.assertIsNone(job)
+            self.assertEqual(figure['data'][0]['type'], 'histogram')
+
+    def test_superseded_builds_are_released(self):
+        jobs = JobQueue(workers=1)
+        self.addCleanup(jobs.close)
+        with patch.object(web_app, '_jobs', jobs):
+            first = web_app.start_build(self.data_path, 'scatter')[2]
+            second = web_app.start_build(self.data_path, 'box', previous=first)[2]
+            self.assertIsNone(jobs.get(first['key']))
+            self.assertIsNotNone(jobs.get(second['key']))
+
+    def test_failed_builds_report_the_error(self):
+        figure, state, job, status = web_app.start_build(os.path.join(self.temp_dir.name, 'missing.csv'), 'scatter')
+        self.assertIsNone(figure)
+        self.assertIsNone(job)
+        self.assertTrue(status.startswith('Failed to build the figure'))
+
+    def test_repeated_builds_are_cached(self):
+        with patch('my_interactive_plots.web_app.create_plot', wraps=web_app.create_plot) as mock_create_plot:
+            first = web_app.build_figure_json(self.data_path, 'scatter')
+            web_app.build_figure_json(self.data_path, 'histogram')
+            second = web_app.build_figure_json(self.data_path, 'scatter')
+        self.assertEqual(first, second)
+        self.assertEqual(mock_create_plot.call_count, 2)
+
+    def test_disk_cache_is_shared(self):
+        first = web_app.build_figure_json(self.data_path, 'box')
+        # A fresh worker has an empty memory cache but finds the figure on disk
+        web_app._figures.clear()
+        with patch('my_interactive_plots.web_app.create_plot') as mock_create_plot:
+            second = web_app.build_figure_json(self.data_path, 'box')
+        mock_create_plot.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_zoom_rerasterizes_visible_extent(self):
+        zoom = {'xaxis.range[0]': 3.1, 'xaxis.range[1]': 3.6, 'yaxis.range[0]': 4.0, 'yaxis.range[1]': 5.0}
+        self.assertIsNone(web_app.figure_for_view(self.data_path, 'scatter', zoom))
+        with patch.object(Config, 'raster_mode', 'always'):
+            full = web_app.figure_for_view(self.data_path, 'scatter')
+            zoomed = web_app.figure_for_view(self.data_path, 'scatter', zoom)
+            self.assertIsNone(web_app.figure_for_view(self.data_path, 'scatter', {'autosize': True}))
+        self.assertEqual(full['data'][0]['type'], 'image')
+        self.assertAlmostEqual(zoomed['data'][0]['x0'], 3.1 + 0.5 / Config.raster_width / 2)
+        self.assertNotEqual(full['data'][0]['x0'], zoomed['data'][0]['x0'])
+
+    def _append(self, rows):
+        with open(self.data_path, 'a') as f:
+            f.write(rows)
+
+    def test_refresh_extends_traces_with_new_rows(self):
+        state = web_app.tail_state(self.data_path, 'scatter')
+        self.assertTrue(state['incremental'])
+        self.assertEqual(state['traces'], ['Setosa', 'Virginica'])
+        self.assertEqual(web_app.refresh_tail(state), (None, state, None))
+
+        self._append('6.0,3.1,1.1,Virginica\n6.2,3.3,1.2,Virginica\n')
+        extend, new_state, figure = web_app.refresh_tail(state)
+        self.assertIsNone(figure)
+        self.assertEqual(extend[0], {'x': [[3.1, 3.3]], 'y': [[6.0, 6.2]]})
+        self.assertEqual(extend[1], [1])
+        self.assertEqual(new_state['offset'], os.path.getsize(self.data_path))
+
+    def test_refresh_rebuilds_for_new_color_or_truncated_file(self):
+        state = web_app.tail_state(self.data_path, 'scatter')
+        self._append('6.0,3.1,1.1,Versicolor\n')
+        extend, new_state, figure = web_app.refresh_tail(state)
+        self.assertIsNone(extend)
+        self.assertEqual(len(figure['data']), 3)
+        self.assertEqual(new_state['offset'], os.path.getsize(self.data_path))
+
+        pd.DataFrame({'sepal_length': [5.1], 'sepal_width': [3.5], 'species': ['Setosa']}).to_csv(self.data_path, index=False)
+        extend, new_state, figure = web_app.refresh_tail(new_state)
+        self.assertIsNone(extend)
+        self.assertEqual(len(figure['data']), 1)
+
+    def test_modified_source_is_rebuilt(self):
+        first = json.loads(web_app.build_figure_json(self.data_path, 'scatter'))
+        pd.DataFrame({
+            'sepal_length': [5.1],
+            'sepal_width': [3.5],
+            'species': ['Setosa']
+        }).to_csv(self.data_path, index=False)
+        os.utime(self.data_path, ns=(0, os.stat(self.data_path).st_mtime_ns + 10 ** 9))
+        second = json.loads(web_app.build_figure_json(self.data_path, 'scatter'))
+        self.assertNotEqual(len(first['data']), len(second['data']))
+
+    def test_animation_frames_are_sent_on_demand(self):
+        pd.DataFrame({
+            'sepal_length': [5.1, 4.9, 4.7, 6.0],
+            'sepal_width': [3.5, 3.0, 3.2, 3.1],
+            'species': ['Setosa', 'Setosa', 'Virginica', 'Virginica'],
+            'animation_frame': [2001, 2001, 2002, 2002]
+        }).to_csv(self.data_path, index=False)
+        figure, state, job, poll_disabled, status = web_app.update_graph('animated_scatter', self.data_path)
+        self.assertNotIn('frames', figure)
+        self.assertEqual(state['frames'], ['2001', '2002'])
+        self.assertEqual(figure['data'][0]['name'], 'Setosa')
+
+        style, last, marks, value, paused, label = web_app.setup_animation(state)
+        self.assertEqual((style['display'], last, value, paused), ('block', 1, 0, True))
+        self.assertEqual(web_app.advance_animation(1, 0, state), 1)
+        self.assertEqual(web_app.advance_animation(2, 1, state), 0)
+        self.assertEqual(web_app.animation_frame_points(self.data_path, 1),
+                         [{'x': [], 'y': []}, {'x': [3.2, 3.1], 'y': [4.7, 6.0]}])
+        patch_update = web_app.show_frame(1, state).to_plotly_json()
+        self.assertEqual(len(patch_update['operations']), 4)
+        self.assertEqual(web_app.setup_animation(web_app.tail_state(self.data_path, 'scatter'))[0],
+                         {'display': 'none'})
+
+    def test_memory_cache_evicts_least_recently_used(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.put('a', '12345')
+        cache.put('b', '12345')
+        cache.get('a')
+        cache.put('c', '12345')
+        self.assertEqual(cache.get('a'), '12345')
+        self.assertIsNone(cache.get('b'))
+        cache.put('d', '12345678901')
+        self.assertIsNone(cache.get('d'))
+
+if __name__ == '__main__':
+    unittest.main()